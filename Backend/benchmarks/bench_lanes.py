@@ -0,0 +1,102 @@
+"""Interactive latency while background traffic saturates upstream.
+
+Starts the local fake upstream (benchmarks/fake_ecourts.py) with a limited
+``--capacity`` and, from one scraper, runs a steady stream of interactive
+district lookups while background threads hit upstream as fast as they can.
+Reports interactive p50/p99 and background throughput three ways: with no
+background load, under load with the priority gate disabled, and under load
+with the gate (see lanes.py).
+
+Run from Backend/:  python benchmarks/bench_lanes.py [--latency-ms 100] [--capacity 6] [--background 16]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+
+def pct(vals, p):
+    vals = sorted(vals)
+    return vals[min(len(vals) - 1, int(round(p / 100.0 * (len(vals) - 1))))]
+
+
+def run(scraper, lanes, background: int, lookups: int):
+    stop = threading.Event()
+    done = [0]
+    lock = threading.Lock()
+
+    def flood():
+        with lanes.background():
+            while not stop.is_set():
+                scraper.session.get(scraper.base_url + 'ecourtindia_v6/?p=casestatus/index', timeout=30)
+                with lock:
+                    done[0] += 1
+
+    threads = [threading.Thread(target=flood, daemon=True) for _ in range(background)]
+    for t in threads:
+        t.start()
+    time.sleep(0.5 if background else 0)
+    lat = []
+    started = time.perf_counter()
+    before = done[0]
+    for i in range(lookups):
+        scraper.caches['districts'].clear()
+        t0 = time.perf_counter()
+        scraper.get_districts('3')
+        lat.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for t in threads:
+        t.join()
+    return lat, (done[0] - before) / elapsed
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--latency-ms', type=float, default=100.0)
+    ap.add_argument('--capacity', type=int, default=6)
+    ap.add_argument('--background', type=int, default=16)
+    ap.add_argument('--lookups', type=int, default=60)
+    ap.add_argument('--port', type=int, default=8772)
+    args = ap.parse_args()
+
+    fake = subprocess.Popen([sys.executable, os.path.join(HERE, 'fake_ecourts.py'), '--port', str(args.port),
+                             '--latency-ms', str(args.latency_ms), '--capacity', str(args.capacity)],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ['ECOURTS_BASE_URL'] = f"http://127.0.0.1:{args.port}/"
+    try:
+        for _ in range(50):
+            try:
+                requests.get(f"http://127.0.0.1:{args.port}/_stats", timeout=1)
+                break
+            except Exception:
+                time.sleep(0.2)
+        import lanes
+        from scraper import ECourtScraper
+
+        scraper = ECourtScraper()
+        scraper._initialize_session()
+        gated = lanes.gate
+        print(f"upstream latency {args.latency_ms:.0f} ms, capacity {args.capacity}, "
+              f"{args.background} background threads, gate {gated.slots} slots "
+              f"(background {gated.background_min}..{gated.background_max})")
+        print(f"{'mode':<14}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}{'bg req/s':>10}")
+        for mode, gate, background in (('idle', gated, 0), ('load, no gate', lanes.PriorityGate(slots=0), args.background),
+                                       ('load, gate', gated, args.background)):
+            lanes.gate = gate
+            lat, bg_rate = run(scraper, lanes, background, args.lookups)
+            print(f"{mode:<14}{pct(lat, 50) * 1000:>10.1f}{pct(lat, 99) * 1000:>10.1f}"
+                  f"{max(lat) * 1000:>10.1f}{bg_rate:>10.1f}")
+    finally:
+        fake.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""Parity and speed check for the one-pass option tokenizer.
+
+Compares ``scraper.iter_options`` / ``ECourtScraper._parse_options`` with the
+previous implementation (BeautifulSoup tree for value/text plus a regex loop
+re-parsing every option's text with BeautifulSoup for the '@' metadata) on
+synthetic fillcomplex / fillDistrict / fillCaseType payloads, including
+entities, nested markup, quoting variants and placeholder options. Exits
+non-zero on any mismatch.
+
+Run from Backend/:  python benchmarks/bench_options.py [--options 3000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from typing import Dict, List
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from scraper import ECourtScraper, iter_options  # noqa: E402
+
+
+# --- previous implementation (reference) -----------------------------------
+
+def legacy_parse_options(option_data: str) -> List[Dict[str, str]]:
+    options = []
+    soup = BeautifulSoup(option_data, 'html.parser')
+    for option in soup.find_all('option'):
+        value = option.get('value', '').strip()
+        text = option.get_text().strip()
+        if value and value != '' and value != '0' and not text.lower().startswith('select'):
+            options.append({'value': value.split('@')[0] if '@' in value else value, 'text': text})
+    return options
+
+
+def legacy_complexes(complex_list: str) -> List[Dict[str, str]]:
+    complexes = legacy_parse_options(complex_list)
+    value_map: Dict[str, Dict[str, str]] = {}
+    for m in re.finditer(r"<option[^>]*value=([\"']?)([^ >\"']+?)\1[^>]*>(.*?)</option>", complex_list, re.IGNORECASE):
+        raw_val = m.group(2).strip()
+        BeautifulSoup(m.group(3), 'html.parser').get_text(strip=True)
+        parts = raw_val.split('@')
+        value_map[parts[0]] = {'raw_value': raw_val, 'est_list': parts[1] if len(parts) > 1 else '',
+                               'flag': parts[2] if len(parts) > 2 else ''}
+    return [{'value': c['value'], 'text': c['text'],
+             'raw_value': value_map.get(c['value'], {}).get('raw_value', c['value']),
+             'est_list': value_map.get(c['value'], {}).get('est_list', ''),
+             'flag': value_map.get(c['value'], {}).get('flag', '')} for c in complexes]
+
+
+# --- payloads ----------------------------------------------------------------
+
+NAMES = ['Civil Court', 'Sessions &amp; District Court', 'Family Court <b>(New)</b>', 'JMFC &#8211; II',
+         'Small Causes&nbsp;Court', "Magistrate's Court", 'Court &quot;A&quot;']
+
+
+def complex_html(n: int) -> str:
+    rows = ['<option value="">Select Court Complex</option>', "<option value='0'>--Select--</option>"]
+    for i in range(1, n + 1):
+        ests = ','.join(str(random.randint(1, 40)) for _ in range(random.randint(1, 4)))
+        value = f"{1000000 + i}@{ests}@{random.choice('YN')}"
+        # the legacy metadata regex mis-parses unquoted values, so parity uses quoted ones
+        quote = random.choice(['"', "'"])
+        rows.append(f'<option value={quote}{value}{quote}>  {random.choice(NAMES)} {i}  </option>')
+    return '\n'.join(rows)
+
+
+def simple_html(n: int, label: str) -> str:
+    rows = [f'<option value="">Select {label}</option>']
+    rows += [f'<option value="{i}">{random.choice(NAMES)} {label} {i}</option>' for i in range(1, n + 1)]
+    return ''.join(rows)
+
+
+def best_of(fn, arg, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--options', type=int, default=3000)
+    ap.add_argument('--repeat', type=int, default=5)
+    args = ap.parse_args()
+    random.seed(7)
+    scraper = ECourtScraper()
+
+    failures = 0
+    cases = {
+        'fillcomplex': (complex_html(args.options), legacy_complexes, lambda h: list(iter_options(h))),
+        'fillDistrict': (simple_html(args.options, 'District'), legacy_parse_options, scraper._parse_options),
+        'fillCaseType': (simple_html(args.options, 'Type'), legacy_parse_options, scraper._parse_options),
+    }
+    print(f"{'payload':<14}{'options':>8}{'legacy ms':>12}{'new ms':>10}{'speedup':>10}  parity")
+    for name, (html, old, new) in cases.items():
+        expected, got = old(html), new(html)
+        ok = expected == got
+        if not ok:
+            failures += 1
+            for a, b in zip(expected, got):
+                if a != b:
+                    print(f"  mismatch in {name}: legacy={a} new={b}")
+                    break
+            if len(expected) != len(got):
+                print(f"  length mismatch in {name}: legacy={len(expected)} new={len(got)}")
+        t_old, t_new = best_of(old, html, args.repeat), best_of(new, html, args.repeat)
+        print(f"{name:<14}{len(got):>8}{t_old * 1000:>12.1f}{t_new * 1000:>10.1f}{t_old / t_new:>9.1f}x  "
+              f"{'ok' if ok else 'MISMATCH'}")
+
+    # unquoted values: the legacy regex lost the '@' metadata here; the tokenizer must not
+    unquoted = list(iter_options('<option value=1010001@3,7@N>Civil &amp; Sessions</option>'))
+    expected = [{'value': '1010001', 'text': 'Civil & Sessions', 'raw_value': '1010001@3,7@N',
+                 'est_list': '3,7', 'flag': 'N'}]
+    if unquoted != expected:
+        failures += 1
+        print(f"  unquoted value mismatch: {unquoted}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Bulk interim-order download: one click per order vs the streaming ZIP.
+
+Starts the local fake upstream with N orders per case and compares fetching
+every order one after another (what N clicks on /api/get-order-pdf amount to)
+with ``order_zip.stream_orders_zip``, reporting time to the first archive
+bytes, total time and peak bytes buffered between yields. The archive is
+checked with ``zipfile.testzip`` and its manifest.
+
+Run from Backend/:  python benchmarks/bench_order_zip.py [--orders 40] [--latency-ms 150]
+"""
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+import zipfile
+
+import requests
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+
+def order(i: int) -> dict:
+    return {'order_number': str(i), 'order_date': f"{i % 28 + 1:02d}-01-2022",
+            'display_pdf_arg': f"home/display_pdf&normal_v=1&case_val=O.S./0000133/2020&cCode=1&appFlag="
+                               f"&filename=/orders/2022/KAGD010000012020_{i}.pdf&court_code=1"}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--orders', type=int, default=40)
+    ap.add_argument('--latency-ms', type=float, default=150.0)
+    ap.add_argument('--port', type=int, default=8768)
+    args = ap.parse_args()
+
+    fake = subprocess.Popen([sys.executable, os.path.join(HERE, 'fake_ecourts.py'), '--port', str(args.port),
+                             '--latency-ms', str(args.latency_ms)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ['ECOURTS_BASE_URL'] = f"http://127.0.0.1:{args.port}/"
+    try:
+        for _ in range(50):
+            try:
+                requests.get(f"http://127.0.0.1:{args.port}/_stats", timeout=1)
+                break
+            except Exception:
+                time.sleep(0.2)
+        import order_zip
+        from scraper import ECourtScraper
+        scraper = ECourtScraper()
+        scraper._initialize_session()
+        orders = [order(i) for i in range(1, args.orders + 1)]
+        orders.append({'order_number': 'x', 'order_date': '', 'display_pdf_arg': ''})  # lands in the manifest
+
+        t0 = time.perf_counter()
+        for o in orders[:-1]:
+            scraper.fetch_order_pdf(o['display_pdf_arg'])
+        sequential = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        first, peak, buf = None, 0, bytearray()
+        for chunk in order_zip.stream_orders_zip(scraper.fetch_order_pdf, orders, 'bench'):
+            first = first if first is not None else time.perf_counter() - t0
+            peak = max(peak, len(chunk))
+            buf += chunk
+        streamed = time.perf_counter() - t0
+
+        zf = zipfile.ZipFile(io.BytesIO(bytes(buf)))
+        manifest = json.loads(zf.read('manifest.json'))
+        print(f"{args.orders} orders, upstream latency {args.latency_ms:.0f} ms, "
+              f"concurrency {order_zip.CONCURRENCY}, rate {order_zip.RATE_PER_MINUTE:.0f}/min")
+        print(f"sequential clicks   total {sequential:6.2f}s")
+        print(f"streaming zip       total {streamed:6.2f}s  first bytes {first:5.2f}s  "
+              f"archive {len(buf) / 1024:.0f} KiB  largest chunk {peak / 1024:.1f} KiB")
+        print(f"testzip={zf.testzip()} ok={manifest['ok']} failed={manifest['failed']}")
+        sys.exit(0 if zf.testzip() is None and manifest['ok'] == args.orders and manifest['failed'] == 1 else 1)
+    finally:
+        fake.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Effect of the parse process pool on concurrent request latency.
+
+A few threads keep parsing a large viewHistory page (like big cases being
+fetched) while a probe thread parses small pages (like ordinary requests in
+the same worker). With inline parsing the big parses hold the GIL and the
+probe's latency balloons; with the pool they run in other processes.
+
+Run from Backend/:  python benchmarks/bench_parse_pool.py [--hearings 4000] [--heavy 2] [--seconds 8]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+import parsing  # noqa: E402
+from fake_ecourts import details_html  # noqa: E402
+from scraper import ECourtScraper  # noqa: E402
+
+
+def pct(vals, p):
+    vals = sorted(vals)
+    return vals[min(len(vals) - 1, int(round(p / 100.0 * (len(vals) - 1))))] if vals else 0.0
+
+
+def run(mode: str, big: str, small: str, heavy: int, seconds: float):
+    parsing.THRESHOLD_BYTES = len(big) if mode == 'pool' else len(big) + 1
+    scraper = ECourtScraper()
+    stop = threading.Event()
+    big_done = [0]
+    probe = []
+
+    def heavy_loop():
+        while not stop.is_set():
+            scraper._parse_case_details_html(big)
+            big_done[0] += 1
+
+    def probe_loop():
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            scraper._parse_case_details_html(small)
+            probe.append(time.perf_counter() - t0)
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=heavy_loop) for _ in range(heavy)] + [threading.Thread(target=probe_loop)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    return big_done[0], probe
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--hearings', type=int, default=4000)
+    ap.add_argument('--orders', type=int, default=500)
+    ap.add_argument('--heavy', type=int, default=2, help='threads parsing the large page')
+    ap.add_argument('--seconds', type=float, default=8.0)
+    args = ap.parse_args()
+
+    big = details_html('KAGD010000012020', args.hearings, args.orders)
+    small = details_html('KAGD010000022020', 5, 2)
+    parsing.POOL_SIZE = max(parsing.POOL_SIZE, args.heavy)
+    parsing.warm()
+    time.sleep(1.0)
+
+    print(f"large page {len(big) / 1024:.0f} KiB, small page {len(small) / 1024:.1f} KiB, "
+          f"{args.heavy} heavy threads, {args.seconds:.0f}s per mode")
+    print(f"{'mode':<8}{'big parses':>12}{'probe p50 ms':>14}{'probe p99 ms':>14}{'probe max ms':>14}")
+    for mode in ('inline', 'pool'):
+        n_big, probe = run(mode, big, small, args.heavy, args.seconds)
+        print(f"{mode:<8}{n_big:>12}{pct(probe, 50) * 1000:>14.1f}{pct(probe, 99) * 1000:>14.1f}"
+              f"{max(probe or [0]) * 1000:>14.1f}")
+    parsing.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Round trips and latency of fetch_order_pdf against the local fake upstream.
+
+Runs the scraper against benchmarks/fake_ecourts.py in two deployments: one
+that serves orders/ PDFs directly and one (``--reports-only``) where only the
+display_pdf POST leads to a PDF. For each it fetches N interim orders and
+reports upstream requests per fetch and mean/p95 fetch time; the first fetch
+per deployment is the cold one (nothing learned yet). Run it from a checkout
+of an older revision to compare fixed-order fetching.
+
+Run from Backend/:  python benchmarks/bench_pdf_strategy.py [--fetches 20] [--latency-ms 100]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import requests
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+
+def pct(vals, p):
+    vals = sorted(vals)
+    return vals[min(len(vals) - 1, int(round(p / 100.0 * (len(vals) - 1))))]
+
+
+def pdf_request(i: int) -> str:
+    return (f"home/display_pdf&normal_v=1&case_val=O.S./0000133/2020&cCode=1&appFlag="
+            f"&filename=/orders/2022/KAGD010000012020_{i}.pdf&court_code=1")
+
+
+def run(deployment: str, fetches: int, latency_ms: float, port: int):
+    cmd = [sys.executable, os.path.join(HERE, 'fake_ecourts.py'), '--port', str(port), '--latency-ms', str(latency_ms)]
+    if deployment == 'reports-only':
+        cmd.append('--reports-only')
+    fake = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ['ECOURTS_BASE_URL'] = f"http://127.0.0.1:{port}/"
+    stats_url = f"http://127.0.0.1:{port}/_stats"
+    try:
+        for _ in range(50):
+            try:
+                requests.get(stats_url, timeout=1)
+                break
+            except Exception:
+                time.sleep(0.2)
+        from scraper import ECourtScraper
+        scraper = ECourtScraper()
+        scraper._initialize_session()
+        per_fetch, lat = [], []
+        for i in range(fetches):
+            before = requests.get(stats_url).json()['requests']
+            t0 = time.perf_counter()
+            pdf, _, _ = scraper.fetch_order_pdf(pdf_request(i + 1))
+            lat.append(time.perf_counter() - t0)
+            assert pdf and pdf.startswith(b'%PDF'), f"fetch {i} failed"
+            time.sleep(0.05)  # let raced losers finish before reading the counter
+            per_fetch.append(requests.get(stats_url).json()['requests'] - before)
+        warm = lat[1:] or lat
+        print(f"{deployment:<14}{per_fetch[0]:>10}{sum(per_fetch[1:]) / max(1, len(per_fetch) - 1):>12.1f}"
+              f"{lat[0] * 1000:>10.0f}{sum(warm) / len(warm) * 1000:>11.0f}{pct(warm, 95) * 1000:>10.0f}")
+    finally:
+        fake.terminate()
+        fake.wait()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--fetches', type=int, default=20)
+    ap.add_argument('--latency-ms', type=float, default=100.0)
+    ap.add_argument('--port', type=int, default=8767)
+    args = ap.parse_args()
+    print(f"{args.fetches} fetch_order_pdf calls per deployment, upstream latency {args.latency_ms:.0f} ms")
+    print(f"{'deployment':<14}{'cold reqs':>10}{'warm reqs':>12}{'cold ms':>10}{'warm mean':>11}{'warm p95':>10}")
+    for deployment in ('orders', 'reports-only'):
+        run(deployment, args.fetches, args.latency_ms, args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark the submit-case serialization path on a 500-hearing case.
+
+Compares the previous path (response_model validation of an untyped dict,
+stdlib JSON render, second json.dumps for the query log) with the current one
+(single ``serialization.dumps`` reused for body and log).
+
+Run from Backend/:  python benchmarks/bench_serialization.py [--hearings 500]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pydantic import BaseModel  # noqa: E402
+
+from serialization import dumps, FastJSONResponse, orjson  # noqa: E402
+
+
+class LegacySubmissionResponse(BaseModel):
+    success: bool
+    message: str
+    case_status_data: Optional[dict] = None
+    raw_html: Optional[str] = None
+    captcha_html: Optional[str] = None
+    app_token: Optional[str] = None
+
+
+def build_case(hearings: int, orders: int) -> dict:
+    history = [{
+        'judge': f'Principal District Judge Court No {i % 7}',
+        'business_date': f'{(i % 28) + 1:02d}-{(i % 12) + 1:02d}-20{10 + i % 15}',
+        'hearing_date': f'{(i % 28) + 1:02d}-{(i % 12) + 1:02d}-20{10 + i % 15}',
+        'purpose_of_hearing': 'Evidence / Arguments – adjourned at request of counsel',
+    } for i in range(hearings)]
+    interim = [{
+        'order_number': str(i + 1),
+        'order_date': f'{(i % 28) + 1:02d}-{(i % 12) + 1:02d}-2024',
+        'order_details': 'Interim Order',
+        'pdf_url': f'home/display_pdf&normal_v=1&case_val=OS/0000{i}/2020&cCode=1&filename=/orders/2020/{i}_1.pdf&court_code=1',
+        'display_pdf_arg': f'home/display_pdf&normal_v=1&case_val=OS/0000{i}/2020&cCode=1&filename=/orders/2020/{i}_1.pdf&court_code=1',
+    } for i in range(orders)]
+    return {
+        'case_number': '133/2020', 'case_type': 'O.S.', 'filing_number': '1234/2020',
+        'filing_date': '01-01-2020', 'registration_number': '133/2020', 'registration_date': '02-01-2020',
+        'cnr_number': 'KAGD010012342020', 'court_name': 'District and Sessions Court', 'judge': '1-Principal Judge',
+        'stage': 'Evidence', 'next_date': '15th November 2025', 'first_hearing_date': '10th January 2020',
+        'petitioners': [{'name': f'Petitioner {i}', 'advocate': f'Adv {i}'} for i in range(5)],
+        'respondents': [{'name': f'Respondent {i}', 'advocate': f'Adv {i}'} for i in range(5)],
+        'acts': [{'act_name': 'Code of Civil Procedure', 'sections': '9'}],
+        'processes': [], 'case_history': history, 'interim_orders': interim,
+    }
+
+
+def legacy_path(payload: dict) -> int:
+    resp = LegacySubmissionResponse(**payload)
+    body = json.dumps(resp.model_dump(), ensure_ascii=False, allow_nan=False, indent=None, separators=(',', ':')).encode('utf-8')
+    log = json.dumps(payload)[:65000]
+    return len(body) + len(log)
+
+
+def fast_path(payload: dict) -> int:
+    body = dumps(payload)
+    log = body.decode('utf-8')[:65000]
+    FastJSONResponse(content=body)
+    return len(body) + len(log)
+
+
+def timeit(fn, payload, rounds: int) -> float:
+    fn(payload)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(payload)
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--hearings', type=int, default=500)
+    ap.add_argument('--orders', type=int, default=60)
+    ap.add_argument('--rounds', type=int, default=200)
+    args = ap.parse_args()
+
+    payload = {
+        'success': True, 'message': 'Case found',
+        'case_status_data': build_case(args.hearings, args.orders),
+        'raw_html': '<table>' + '<tr><td>x</td></tr>' * 200 + '</table>',
+        'captcha_html': '', 'app_token': 'a' * 64,
+    }
+    legacy_ms = timeit(legacy_path, payload, args.rounds)
+    fast_ms = timeit(fast_path, payload, args.rounds)
+    print(f"payload: {len(dumps(payload)) / 1024:.1f} KiB, {args.hearings} hearings, {args.orders} orders")
+    print(f"encoder: {'orjson' if orjson is not None else 'stdlib json (orjson not installed)'}")
+    print(f"legacy (validate + json x2): {legacy_ms:8.3f} ms/op")
+    print(f"fast   (dumps once)        : {fast_ms:8.3f} ms/op")
+    print(f"speedup: {legacy_ms / fast_ms:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Burst benchmark for single-flight coalescing of scraper lookups.
+
+Starts the local fake upstream (benchmarks/fake_ecourts.py) and fires N
+identical concurrent ``get_court_complexes`` calls at a cold scraper, once with
+coalescing and once with it disabled, reporting upstream requests and
+p50/p99/max caller latency for each.
+
+Run from Backend/:  python benchmarks/bench_singleflight.py [--burst 50] [--latency-ms 300]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+
+class NoFlight:
+    """Stand-in SingleFlight that never coalesces (the pre-change behaviour)."""
+
+    def do(self, key, fn, *args, **kwargs):
+        return fn(*args, **kwargs)
+
+
+def pct(vals, p):
+    vals = sorted(vals)
+    return vals[min(len(vals) - 1, int(round(p / 100.0 * (len(vals) - 1))))]
+
+
+def burst(scraper, n: int, stats_url: str):
+    scraper._initialize_session()
+    before = requests.get(stats_url).json()['requests']
+    start = threading.Barrier(n)
+    lat = []
+    lock = threading.Lock()
+
+    def call():
+        start.wait()
+        t0 = time.perf_counter()
+        scraper.get_court_complexes('3', '1')
+        with lock:
+            lat.append(time.perf_counter() - t0)
+
+    threads = [threading.Thread(target=call) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    upstream = requests.get(stats_url).json()['requests'] - before
+    return upstream, lat
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--burst', type=int, default=50)
+    ap.add_argument('--latency-ms', type=float, default=300.0)
+    ap.add_argument('--port', type=int, default=8766)
+    args = ap.parse_args()
+
+    fake = subprocess.Popen([sys.executable, os.path.join(HERE, 'fake_ecourts.py'), '--port', str(args.port),
+                             '--latency-ms', str(args.latency_ms)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ['ECOURTS_BASE_URL'] = f"http://127.0.0.1:{args.port}/"
+    stats_url = f"http://127.0.0.1:{args.port}/_stats"
+    try:
+        for _ in range(50):
+            try:
+                requests.get(stats_url, timeout=1)
+                break
+            except Exception:
+                time.sleep(0.2)
+        from scraper import ECourtScraper
+
+        print(f"burst={args.burst} identical get_court_complexes, upstream latency {args.latency_ms:.0f} ms")
+        print(f"{'mode':<12}{'upstream':>10}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        for mode in ('no-flight', 'singleflight'):
+            scraper = ECourtScraper()
+            if mode == 'no-flight':
+                scraper.flights = NoFlight()
+            upstream, lat = burst(scraper, args.burst, stats_url)
+            print(f"{mode:<12}{upstream:>10}{pct(lat, 50) * 1000:>10.1f}{pct(lat, 99) * 1000:>10.1f}"
+                  f"{max(lat) * 1000:>10.1f}")
+    finally:
+        fake.terminate()
+
+
+if __name__ == '__main__':
+    main()
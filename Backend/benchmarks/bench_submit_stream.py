@@ -0,0 +1,75 @@
+"""Time to first useful content for submit-case, blocking vs streamed.
+
+Starts the local fake upstream (benchmarks/fake_ecourts.py) and runs the
+submitCaseNo -> viewHistory chain N times through ``submit_case_status``
+(what /api/submit-case waits for) and through ``iter_case_status`` (what
+/api/submit-case/stream sends), reporting when each streamed event arrived.
+
+Run from Backend/:  python benchmarks/bench_submit_stream.py [--runs 10] [--latency-ms 300]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import requests
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+CASE = dict(state_code='3', dist_code='1', court_complex_code='1010001', case_type='1',
+            case_no='133', rgyear='2020', captcha_code='abcde')
+
+
+def pct(vals, p):
+    vals = sorted(vals)
+    return vals[min(len(vals) - 1, int(round(p / 100.0 * (len(vals) - 1))))]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--runs', type=int, default=10)
+    ap.add_argument('--latency-ms', type=float, default=300.0)
+    ap.add_argument('--port', type=int, default=8773)
+    args = ap.parse_args()
+
+    fake = subprocess.Popen([sys.executable, os.path.join(HERE, 'fake_ecourts.py'), '--port', str(args.port),
+                             '--latency-ms', str(args.latency_ms)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ['ECOURTS_BASE_URL'] = f"http://127.0.0.1:{args.port}/"
+    try:
+        for _ in range(50):
+            try:
+                requests.get(f"http://127.0.0.1:{args.port}/_stats", timeout=1)
+                break
+            except Exception:
+                time.sleep(0.2)
+        from scraper import ECourtScraper
+
+        scraper = ECourtScraper()
+        scraper._initialize_session()
+        blocking = []
+        streamed = defaultdict(list)
+        for _ in range(args.runs):
+            t0 = time.perf_counter()
+            result, _ = scraper.submit_case_status(**CASE)
+            assert result.get('success'), result
+            blocking.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            for event, _ in scraper.iter_case_status(**CASE):
+                streamed[event].append(time.perf_counter() - t0)
+
+        print(f"{args.runs} submit-case lookups, upstream latency {args.latency_ms:.0f} ms")
+        print(f"{'mode':<26}{'p50 ms':>10}{'p99 ms':>10}")
+        print(f"{'blocking response':<26}{pct(blocking, 50) * 1000:>10.1f}{pct(blocking, 99) * 1000:>10.1f}")
+        for event in ('listing', 'details', 'history', 'orders', 'result'):
+            if streamed[event]:
+                lat = streamed[event]
+                print(f"{'stream: ' + event:<26}{pct(lat, 50) * 1000:>10.1f}{pct(lat, 99) * 1000:>10.1f}")
+    finally:
+        fake.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,332 @@
+"""Local stand-in for the eCourts endpoints used by ECourtScraper.
+
+Serves synthetic (or recorded) responses for casestatus/index, fillDistrict,
+fillcomplex, fillCaseType, submitCaseNo, home/viewHistory, home/display_pdf,
+the securimage CAPTCHA and the orders/reports PDF paths, with configurable
+latency, error injection and app_token expiry.
+
+Like eCourts, the CAPTCHA code lives in the PHP session (``PHPSESSID`` cookie,
+issued on first contact); with ``--check-captcha`` submitCaseNo only accepts the
+code last shown to that session, readable from ``/_captcha/<PHPSESSID>``.
+
+Run from Backend/:
+    python benchmarks/fake_ecourts.py --port 8765 --latency-ms 120 --error-rate 0.01
+    ECOURTS_BASE_URL=http://127.0.0.1:8765/ uvicorn main:app --port 8001
+
+Recorded responses: ``--recordings DIR`` makes ``p=casestatus/fillDistrict``
+return ``DIR/casestatus_fillDistrict.json`` verbatim (app_token is refreshed).
+``--cassette FILE`` does the same from a cassette captured with
+ECOURTS_TRANSPORT=record (last recorded JSON body per endpoint).
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import parse_qs
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, Response
+
+# 1x1 transparent PNG
+CAPTCHA_PNG = base64.b64decode(
+    'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII=')
+
+
+def order_pdf(label: str) -> bytes:
+    """A well-formed one-page PDF whose text names ``label`` (distinct orders get distinct bytes)."""
+    line = f"Interim order {label} - fake".replace('\\', '').replace('(', '').replace(')', '')
+    stream = f"BT /F1 12 Tf 20 100 Td ({line}) Tj ET".encode('latin-1', 'replace')
+    objects = [
+        b"<</Type/Catalog/Pages 2 0 R>>",
+        b"<</Type/Pages/Kids[3 0 R]/Count 1>>",
+        b"<</Type/Page/Parent 2 0 R/MediaBox[0 0 300 144]/Contents 4 0 R/Resources<</Font<</F1 5 0 R>>>>>>",
+        f"<</Length {len(stream)}>>stream\n".encode() + stream + b"\nendstream",
+        b"<</Type/Font/Subtype/Type1/BaseFont/Helvetica>>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj".encode() + body + b"endobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{o:010d} 00000 n \n".encode() for o in offsets)
+    out += f"trailer<</Size {len(objects) + 1}/Root 1 0 R>>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+STATES = {'1': 'Maharashtra', '3': 'Karnataka', '4': 'Kerala', '10': 'Tamil Nadu', '26': 'Delhi'}
+
+
+@dataclass
+class FakeConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    token_ttl: float = 600.0
+    hearings: int = 40
+    orders: int = 8
+    districts: int = 30
+    complexes: int = 12
+    case_types: int = 60
+    recordings: Optional[str] = None
+    cassette: Optional[str] = None
+    # serve PDFs only under reports/ (the display_pdf result), as deployments that refuse direct orders/ GETs do
+    reports_only: bool = False
+    # requests served at once (0 = unlimited); the rest queue, like a busy upstream
+    capacity: int = 0
+    # submitCaseNo rejects a code other than the session's current CAPTCHA
+    check_captcha: bool = False
+
+
+class TokenStore:
+    """Issued app_tokens with expiry; an expired token yields an error payload."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._tokens: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def issue(self) -> str:
+        tok = secrets.token_hex(32)
+        now = time.time()
+        with self._lock:
+            self._tokens[tok] = now + self.ttl
+            if len(self._tokens) > 50000:
+                self._tokens = {t: exp for t, exp in self._tokens.items() if exp > now}
+        return tok
+
+    def valid(self, tok: str) -> bool:
+        with self._lock:
+            exp = self._tokens.get(tok)
+        return bool(exp and exp > time.time())
+
+
+def _options(prefix: str, n: int, value_fmt=str) -> str:
+    opts = [f'<option value="">Select {prefix}</option>']
+    for i in range(1, n + 1):
+        opts.append(f'<option value="{value_fmt(i)}">{prefix} {i} &amp; Co</option>')
+    return ''.join(opts)
+
+
+def index_html(token: str) -> str:
+    opts = ''.join(f'<option value="{v}">{t}</option>' for v, t in STATES.items())
+    return (
+        '<html><body><form>'
+        f'<input type="hidden" name="app_token" value="{token}">'
+        f'<select id="sess_state_code" name="state_code"><option value="0">Select state</option>{opts}</select>'
+        '</form></body></html>'
+    )
+
+
+def listing_html(case_type: str, case_no: str, rgyear: str, court_code: str) -> str:
+    cino = f"KAGD01{int(case_no or 0):06d}{rgyear or '2020'}"
+    return (
+        '<a class="noToken" href="#">Principal District and Sessions Court : Fake</a>'
+        '<table><tr><th>Sr No</th><th>Case Type/Case Number/Case Year</th>'
+        '<th>Petitioner Name versus Respondent Name</th><th>View</th></tr>'
+        f'<tr><td>1</td><td>{case_type}/{case_no}/{rgyear}</td><td>Ramesh Kumar<br>Vs<br>Suresh Rao</td>'
+        f"<td><a href=\"#\" onclick=\"viewHistory(2001{case_no}{rgyear},'{cino}',{court_code},'','CScaseNumber',3,1,1010001,'CScaseNumber')\">View</a></td></tr>"
+        '</table>'
+    )
+
+
+def details_html(cino: str, hearings: int, orders: int) -> str:
+    history = ''.join(
+        f'<tr><td>Principal Judge {i % 3}</td><td>{(i % 28) + 1:02d}-{(i % 12) + 1:02d}-2021</td>'
+        f'<td>{(i % 28) + 1:02d}-{(i % 12) + 1:02d}-2021</td><td>Evidence</td></tr>'
+        for i in range(hearings))
+    order_rows = ''.join(
+        f'<tr><td>{i + 1}</td><td>{(i % 28) + 1:02d}-01-2022</td>'
+        f"<td><a onclick=\"displayPdf('home/display_pdf&normal_v=1&case_val=O.S./0000133/2020&cCode=1&appFlag=&filename=/orders/2022/{cino}_{i + 1}.pdf&court_code=1')\">Interim Order</a></td></tr>"
+        for i in range(orders))
+    return (
+        '<h2 id="chHeading">Principal District and Sessions Court, Fake</h2>'
+        '<table class="case_details_table">'
+        '<tr><td>Case Type</td><td>O.S. - Original Suit</td><td>Filing Number</td><td>1234/2020</td></tr>'
+        '<tr><td>Filing Date</td><td>01-01-2020</td><td>Registration Number</td><td>133/2020</td></tr>'
+        f'<tr><td>Registration Date</td><td>02-01-2020</td><td>CNR Number</td><td>{cino} (Note the CNR number)</td></tr>'
+        '</table>'
+        '<table class="case_status_table">'
+        '<tr><td>First Hearing Date</td><td>10th January 2020</td></tr>'
+        '<tr><td>Next Hearing Date</td><td>15th November 2025</td></tr>'
+        '<tr><td>Case Stage</td><td>Evidence</td></tr>'
+        '<tr><td>Court Number and Judge</td><td>1-Principal District Judge</td></tr>'
+        '</table>'
+        '<table class="Petitioner_Advocate_table"><tr><td>1) Ramesh Kumar<br/>Advocate- A. Sharma</td></tr></table>'
+        '<table class="Respondent_Advocate_table"><tr><td>1) Suresh Rao</td></tr></table>'
+        '<table class="acts_table"><tr><th>Under Act(s)</th><th>Under Section(s)</th></tr>'
+        '<tr><td>Code of Civil Procedure</td><td>9</td></tr></table>'
+        '<table class="history_table"><tr><th>Judge</th><th>Business on Date</th><th>Hearing Date</th>'
+        f'<th>Purpose of hearing</th></tr>{history}</table>'
+        '<table class="order_table"><tr><td>Order Number</td><td>Order on</td><td>Order Details</td></tr>'
+        f'{order_rows}</table>'
+    )
+
+
+def create_app(cfg: FakeConfig) -> FastAPI:
+    app = FastAPI(title="Fake eCourts")
+    tokens = TokenStore(cfg.token_ttl)
+    stats = {'requests': 0, 'injected_errors': 0, 'expired_tokens': 0}
+
+    cassette_bodies: Dict[str, dict] = {}
+    if cfg.cassette:
+        with open(cfg.cassette, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                ep = parse_qs(entry['request']['url'].split('?', 1)[-1]).get('p', [''])[0]
+                try:
+                    cassette_bodies[ep] = json.loads(base64.b64decode(entry['response']['body_b64']))
+                except ValueError:
+                    pass  # HTML/PDF bodies are served by the synthetic handlers
+
+    def recorded(p: str) -> Optional[dict]:
+        if p in cassette_bodies:
+            return cassette_bodies[p]
+        if not cfg.recordings:
+            return None
+        path = os.path.join(cfg.recordings, p.replace('/', '_') + '.json')
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        return None
+
+    capacity = asyncio.Semaphore(cfg.capacity) if cfg.capacity > 0 else None
+    captchas: Dict[str, str] = {}  # PHPSESSID -> code last shown
+
+    async def delay():
+        if cfg.latency_ms or cfg.jitter_ms:
+            ms = max(0.0, random.gauss(cfg.latency_ms, cfg.jitter_ms)) if cfg.jitter_ms else cfg.latency_ms
+            await asyncio.sleep(ms / 1000)
+
+    @app.middleware("http")
+    async def chaos(request: Request, call_next):
+        if request.url.path.startswith('/_'):
+            return await call_next(request)
+        stats['requests'] += 1
+        if capacity is None:
+            return await serve(request, call_next)
+        async with capacity:
+            return await serve(request, call_next)
+
+    async def serve(request: Request, call_next):
+        await delay()
+        if cfg.error_rate and random.random() < cfg.error_rate:
+            stats['injected_errors'] += 1
+            return Response(status_code=random.choice([500, 502, 503]), content=b'injected error')
+        sid = request.cookies.get('PHPSESSID')
+        if sid:
+            return await call_next(request)
+        request.scope['fake_sid'] = secrets.token_hex(13)
+        response = await call_next(request)
+        response.set_cookie('PHPSESSID', request.scope['fake_sid'], path='/')
+        return response
+
+    def session_id(request: Request) -> str:
+        return request.cookies.get('PHPSESSID') or request.scope.get('fake_sid', '')
+
+    @app.get('/_stats')
+    async def fake_stats():
+        return stats
+
+    @app.get('/_captcha/{sid}')
+    async def fake_captcha_code(sid: str):
+        return {'code': captchas.get(sid)}
+
+    @app.api_route('/ecourtindia_v6/', methods=['GET', 'POST'])
+    async def dispatch(request: Request, p: str = ''):
+        p = p.split('&')[0]
+        form = {}
+        if request.method == 'POST':
+            # parse by hand so the fake needs no python-multipart
+            form = {k: v[0] for k, v in parse_qs((await request.body()).decode('utf-8', 'replace')).items()}
+        if request.method == 'GET' or p in ('', 'casestatus/index'):
+            return HTMLResponse(index_html(tokens.issue()))
+
+        if p != 'casestatus/getStates' and not tokens.valid(form.get('app_token', '')):
+            stats['expired_tokens'] += 1
+            msg = 'Session Timeout' if p == 'home/display_pdf' else 'Invalid Request'
+            return JSONResponse({'status': 0, 'errormsg': msg, 'app_token': tokens.issue()})
+
+        body = recorded(p)
+        if body is not None:
+            body = dict(body, app_token=tokens.issue())
+            return JSONResponse(body)
+
+        tok = tokens.issue()
+        if p == 'casestatus/getStates':
+            opts = ''.join(f'<option value="{v}">{t}</option>' for v, t in STATES.items())
+            return JSONResponse({'status': 1, 'state_list': opts, 'app_token': tok})
+        if p == 'casestatus/fillDistrict':
+            return JSONResponse({'status': 1, 'dist_list': _options('District', cfg.districts), 'app_token': tok})
+        if p == 'casestatus/fillcomplex':
+            html = _options('Court Complex', cfg.complexes, lambda i: f'10100{i:02d}@{i},{i + 1}@N')
+            return JSONResponse({'status': 1, 'complex_list': html, 'app_token': tok})
+        if p == 'casestatus/fillCaseType':
+            html = _options('Case Type', cfg.case_types, lambda i: f'{i}^{i}')
+            return JSONResponse({'status': 1, 'casetype_list': html, 'app_token': tok})
+        if p == 'casestatus/submitCaseNo':
+            if cfg.check_captcha and form.get('case_captcha_code') != captchas.pop(session_id(request), None):
+                return JSONResponse({'status': 0, 'errormsg': 'Invalid Captcha', 'div_captcha': '<img>', 'app_token': tok})
+            if form.get('search_case_no') == '0':
+                return JSONResponse({'case_data': '<div id="nodata">Record not found</div>', 'div_captcha': '', 'app_token': tok})
+            html = listing_html(form.get('case_type', 'O.S.'), form.get('search_case_no', '133'), form.get('rgyear', '2020'), '1')
+            return JSONResponse({'case_data': html, 'div_captcha': '', 'app_token': tok})
+        if p == 'home/viewHistory':
+            return JSONResponse({'data_list': details_html(form.get('cino', 'KAGD010000012020'), cfg.hearings, cfg.orders), 'app_token': tok})
+        if p == 'home/display_pdf':
+            return JSONResponse({'order': f'reports/{secrets.token_hex(8)}.pdf', 'app_token': tok})
+        return JSONResponse({'status': 0, 'errormsg': f'unknown endpoint {p}'}, status_code=404)
+
+    @app.get('/ecourtindia_v6/vendor/securimage/securimage_show.php')
+    async def captcha(request: Request):
+        captchas[session_id(request)] = secrets.token_hex(3)
+        return Response(content=CAPTCHA_PNG, media_type='image/png')
+
+    @app.get('/{prefix:path}.pdf')
+    async def pdf(prefix: str):
+        allowed = ('reports/', 'ecourtindia_v6/reports/') if cfg.reports_only else ('orders/', 'reports/', 'ecourtindia_v6/reports/')
+        if not prefix.startswith(allowed):
+            return Response(status_code=404)
+        return Response(content=order_pdf(prefix.rsplit('/', 1)[-1]), media_type='application/pdf')
+
+    return app
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    ap.add_argument('--host', default='127.0.0.1')
+    ap.add_argument('--port', type=int, default=8765)
+    ap.add_argument('--latency-ms', type=float, default=0.0, help='mean added latency per request')
+    ap.add_argument('--jitter-ms', type=float, default=0.0, help='stddev of added latency')
+    ap.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with 5xx')
+    ap.add_argument('--token-ttl', type=float, default=600.0, help='seconds an issued app_token stays valid')
+    ap.add_argument('--hearings', type=int, default=40)
+    ap.add_argument('--orders', type=int, default=8)
+    ap.add_argument('--recordings', default=None, help='directory of recorded JSON bodies')
+    ap.add_argument('--cassette', default=None, help='cassette .jsonl recorded by transport.py')
+    ap.add_argument('--reports-only', action='store_true', help='404 direct orders/ PDF paths')
+    ap.add_argument('--capacity', type=int, default=0, help='requests served at once (0 = unlimited)')
+    ap.add_argument('--check-captcha', action='store_true', help="reject submits not answering the session's CAPTCHA")
+    args = ap.parse_args()
+    cfg = FakeConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        token_ttl=args.token_ttl, hearings=args.hearings, orders=args.orders, recordings=args.recordings,
+        cassette=args.cassette, reports_only=args.reports_only, capacity=args.capacity,
+        check_captcha=args.check_captcha)
+
+    import uvicorn
+    uvicorn.run(create_app(cfg), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""Closed-loop load test for the FastAPI app (RPS, p50/p90/p99, error rate).
+
+Point the API at the local fake (benchmarks/fake_ecourts.py) so no traffic
+reaches the real eCourts site. ``--spawn`` starts both for you with a
+throw-away SQLite database:
+
+    python benchmarks/loadtest.py --spawn --concurrency 16 --duration 30
+    python benchmarks/loadtest.py --api http://127.0.0.1:8001 --json results.json
+
+Scenario mix (weights via --mix) covers the dropdown cascade, the
+CAPTCHA + submit-case flow and CNR detail lookups.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Tuple
+
+import requests
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BACKEND = os.path.dirname(HERE)
+
+DEFAULT_MIX = 'districts=3,complexes=3,case_types=2,details=1,submit=1'
+
+
+def percentile(sorted_vals: List[float], pct: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    k = min(len(sorted_vals) - 1, max(0, int(round(pct / 100.0 * (len(sorted_vals) - 1)))))
+    return sorted_vals[k]
+
+
+def _ok(resp: requests.Response) -> bool:
+    if resp.status_code != 200:
+        return False
+    if resp.headers.get('content-type', '').startswith('application/json'):
+        body = resp.json()
+        if isinstance(body, dict) and body.get('success') is False:
+            return False
+        for key in ('districts', 'complexes', 'case_types'):
+            if key in body and not body[key]:
+                return False
+    return True
+
+
+def build_scenarios(api: str) -> Dict[str, Callable[[requests.Session], bool]]:
+    state, dist, cplx = '3', '1', '1010001'
+
+    def districts(s):
+        return _ok(s.post(f"{api}/api/get-districts", json={'state_code': state}, timeout=60))
+
+    def complexes(s):
+        return _ok(s.post(f"{api}/api/get-court-complexes", json={'state_code': state, 'dist_code': str(random.randint(1, 5))}, timeout=60))
+
+    def case_types(s):
+        return _ok(s.post(f"{api}/api/get-case-types", json={
+            'state_code': state, 'dist_code': dist, 'court_complex_code': cplx}, timeout=60))
+
+    def details(s):
+        return _ok(s.post(f"{api}/api/get-case-details", json={
+            'court_code': '1', 'state_code': state, 'dist_code': dist, 'court_complex_code': cplx,
+            'case_no': '200113320', 'cino': f"KAGD01{random.randint(1, 999999):06d}2020"}, timeout=60))
+
+    def submit(s):
+        if s.get(f"{api}/api/captcha-image", timeout=60).status_code != 200:
+            return False
+        return _ok(s.post(f"{api}/api/submit-case", json={
+            'state_code': state, 'dist_code': dist, 'court_complex_code': cplx, 'case_type': '1',
+            'case_no': str(random.randint(1, 9999)), 'rgyear': '2020', 'captcha_code': 'abcde'}, timeout=60))
+
+    return {'districts': districts, 'complexes': complexes, 'case_types': case_types,
+            'details': details, 'submit': submit}
+
+
+def run(api: str, concurrency: int, duration: float, mix: Dict[str, int], warmup: float) -> Dict:
+    scenarios = build_scenarios(api)
+    names = [n for n in mix if n in scenarios for _ in range(mix[n])]
+    results: List[Tuple[str, float, bool, float]] = []
+    lock = threading.Lock()
+    start_at = time.perf_counter() + warmup
+    stop_at = start_at + duration
+
+    def worker():
+        s = requests.Session()
+        local = []
+        while True:
+            now = time.perf_counter()
+            if now >= stop_at:
+                break
+            name = random.choice(names)
+            t0 = time.perf_counter()
+            try:
+                ok = scenarios[name](s)
+            except Exception:
+                ok = False
+            t1 = time.perf_counter()
+            if t0 >= start_at:
+                local.append((name, t1 - t0, ok, t1))
+        with lock:
+            results.extend(local)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    def summarize(rows):
+        lat = sorted(r[1] for r in rows)
+        errors = sum(1 for r in rows if not r[2])
+        return {
+            'requests': len(rows),
+            'rps': round(len(rows) / duration, 2),
+            'error_rate': round(errors / len(rows), 4) if rows else 0.0,
+            'p50_ms': round(percentile(lat, 50) * 1000, 1),
+            'p90_ms': round(percentile(lat, 90) * 1000, 1),
+            'p99_ms': round(percentile(lat, 99) * 1000, 1),
+            'max_ms': round((lat[-1] if lat else 0) * 1000, 1),
+        }
+
+    by_name = defaultdict(list)
+    for r in results:
+        by_name[r[0]].append(r)
+    return {
+        'config': {'api': api, 'concurrency': concurrency, 'duration_s': duration, 'mix': mix},
+        'overall': summarize(results),
+        'by_scenario': {n: summarize(rows) for n, rows in sorted(by_name.items())},
+    }
+
+
+def _wait_http(url: str, timeout: float = 20.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            requests.get(url, timeout=1)
+            return
+        except Exception:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up")
+
+
+def spawn(fake_args: List[str], api_port: int, fake_port: int) -> List[subprocess.Popen]:
+    tmpdir = tempfile.mkdtemp(prefix='ecourts-load-')
+    fake = subprocess.Popen(
+        [sys.executable, os.path.join(HERE, 'fake_ecourts.py'), '--port', str(fake_port), *fake_args],
+        cwd=BACKEND)
+    env = dict(os.environ,
+               ECOURTS_BASE_URL=f"http://127.0.0.1:{fake_port}/",
+               DATABASE_URL=f"sqlite:///{os.path.join(tmpdir, 'load.db')}")
+    api = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--port', str(api_port), '--log-level', 'warning'],
+        cwd=BACKEND, env=env)
+    procs = [fake, api]
+    try:
+        _wait_http(f"http://127.0.0.1:{fake_port}/_stats")
+        _wait_http(f"http://127.0.0.1:{api_port}/")
+    except Exception:
+        for p in procs:
+            p.terminate()
+        raise
+    return procs
+
+
+def print_report(report: Dict):
+    cfg = report['config']
+    print(f"\nconcurrency={cfg['concurrency']} duration={cfg['duration_s']}s api={cfg['api']}")
+    header = f"{'scenario':<12}{'reqs':>8}{'rps':>9}{'err%':>8}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}"
+    print(header)
+    print('-' * len(header))
+    rows = list(report['by_scenario'].items()) + [('TOTAL', report['overall'])]
+    for name, s in rows:
+        print(f"{name:<12}{s['requests']:>8}{s['rps']:>9}{s['error_rate'] * 100:>7.2f}%"
+              f"{s['p50_ms']:>9}{s['p90_ms']:>9}{s['p99_ms']:>9}{s['max_ms']:>9}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Load test the eCourts scraper API")
+    ap.add_argument('--api', default='http://127.0.0.1:8001')
+    ap.add_argument('--concurrency', type=int, default=8)
+    ap.add_argument('--duration', type=float, default=20.0)
+    ap.add_argument('--warmup', type=float, default=2.0, help='seconds excluded from stats')
+    ap.add_argument('--mix', default=DEFAULT_MIX, help='scenario=weight,...')
+    ap.add_argument('--json', dest='json_out', default=None, help='write the report to this file')
+    ap.add_argument('--spawn', action='store_true', help='start fake_ecourts + the API locally')
+    ap.add_argument('--fake-latency-ms', type=float, default=80.0)
+    ap.add_argument('--fake-error-rate', type=float, default=0.0)
+    ap.add_argument('--fake-token-ttl', type=float, default=600.0)
+    args = ap.parse_args()
+
+    mix = {k: int(v) for k, v in (item.split('=') for item in args.mix.split(',') if item)}
+    procs = []
+    if args.spawn:
+        api_port, fake_port = 8011, 8765
+        procs = spawn(['--latency-ms', str(args.fake_latency_ms), '--error-rate', str(args.fake_error_rate),
+                       '--token-ttl', str(args.fake_token_ttl)], api_port, fake_port)
+        args.api = f"http://127.0.0.1:{api_port}"
+    try:
+        report = run(args.api, args.concurrency, args.duration, mix, args.warmup)
+    finally:
+        for p in procs:
+            p.terminate()
+    print_report(report)
+    if args.json_out:
+        with open(args.json_out, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
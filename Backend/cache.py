@@ -0,0 +1,116 @@
+"""In-process TTL caches for the scraper's dropdown catalog.
+
+``TTLCache`` is a small thread-safe LRU with per-entry expiry and hit/miss
+counters. ``cached_options`` wraps an ``ECourtScraper`` method returning
+``(options, app_token)``: non-empty option lists are cached per argument set,
+empty ones (upstream hiccups) are not, so a failure is retried next time.
+"""
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Dict, Hashable, List, Optional
+
+
+class TTLCache:
+    def __init__(self, name: str, ttl: float, maxsize: int = 4096):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Like ``get`` but without touching LRU order or hit/miss counters."""
+        with self._lock:
+            entry = self._data.get(key)
+            return entry[1] if entry is not None and entry[0] > time.monotonic() else None
+
+    def remaining(self, key: Hashable) -> float:
+        """Seconds until ``key`` expires (0 when absent); does not count as a hit or miss."""
+        with self._lock:
+            entry = self._data.get(key)
+            return max(0.0, entry[0] - time.monotonic()) if entry else 0.0
+
+    def invalidate(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def invalidate_prefix(self, prefix: tuple) -> int:
+        """Remove every key (a tuple) starting with ``prefix``; an empty prefix clears all."""
+        n = len(prefix)
+        with self._lock:
+            doomed = [k for k in self._data if k[:n] == prefix]
+            for k in doomed:
+                del self._data[k]
+            return len(doomed)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def keys(self) -> List[Hashable]:
+        now = time.monotonic()
+        with self._lock:
+            return [k for k, (expires, _) in self._data.items() if expires > now]
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data)}
+
+
+def cached_options(cache_name: str):
+    """Cache a scraper method's non-empty option list in ``self.caches[cache_name]``.
+
+    The cache key is the method's bound arguments with defaults applied, so
+    positional and keyword calls share entries. ``method.cache_key(...)``
+    returns that key for callers that manage entries directly (the warmer).
+    """
+    def decorator(fn):
+        sig = inspect.signature(fn)
+
+        def cache_key(*args, **kwargs) -> tuple:
+            bound = sig.bind(None, *args, **kwargs)
+            bound.apply_defaults()
+            return tuple(bound.arguments.values())[1:]
+
+        @wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            cache: TTLCache = self.caches[cache_name]
+            key = cache_key(*args, **kwargs)
+            options = cache.get(key)
+            if options is not None:
+                return options, self.app_token
+            options, token = fn(self, *args, **kwargs)
+            if options:
+                cache.set(key, options)
+            return options, token
+
+        wrapper.cache_key = cache_key
+        wrapper.cache_name = cache_name
+        return wrapper
+    return decorator
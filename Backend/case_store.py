@@ -0,0 +1,107 @@
+"""Upserts parsed case details into the normalized case tables.
+
+``cases`` holds one row per CNR; parties, acts, hearings (case_history),
+interim orders and processes are replaced wholesale on every upsert, which is
+simpler than row matching and cheap at per-case sizes. Date strings are also
+stored as ISO dates so hearings and next dates can be range-queried.
+"""
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from dates import parse_case_date
+from models import Case, CaseParty, CaseAct, CaseHearing, CaseOrder, CaseProcess
+
+CASE_FIELDS = (
+    'case_number', 'case_type', 'filing_number', 'filing_date', 'registration_number',
+    'registration_date', 'court_name', 'judge', 'stage', 'next_date', 'first_hearing_date',
+)
+CONTEXT_FIELDS = ('state_code', 'dist_code', 'court_complex_code', 'court_code')
+CHILD_MODELS = (CaseParty, CaseAct, CaseHearing, CaseOrder, CaseProcess)
+
+
+def upsert_case(db: Session, cnr: str, details: Dict, context: Optional[Dict] = None) -> Case:
+    """Insert or update ``cnr`` and replace its child rows. Caller commits."""
+    context = context or {}
+    case = db.get(Case, cnr)
+    if case is None:
+        case = Case(cnr=cnr)
+        db.add(case)
+    for f in CASE_FIELDS:
+        setattr(case, f, details.get(f) or '')
+    for f in CONTEXT_FIELDS:
+        # keep known location codes when this lookup didn't carry them
+        if context.get(f):
+            setattr(case, f, str(context[f]))
+    case.next_date_iso = parse_case_date(case.next_date)
+    case.updated_at = datetime.utcnow()
+    db.flush()
+
+    for model in CHILD_MODELS:
+        db.query(model).filter(model.cnr == cnr).delete(synchronize_session=False)
+
+    parties: List[Dict] = []
+    for role, key in (('petitioner', 'petitioners'), ('respondent', 'respondents')):
+        for pos, p in enumerate(details.get(key) or [], start=1):
+            parties.append({'cnr': cnr, 'role': role, 'position': pos,
+                            'name': p.get('name', ''), 'advocate': p.get('advocate', '')})
+    acts = [{'cnr': cnr, 'act_name': a.get('act_name', ''), 'sections': a.get('sections', '')}
+            for a in details.get('acts') or []]
+    hearings = [{
+        'cnr': cnr, 'court_complex_code': case.court_complex_code,
+        'judge': h.get('judge', ''), 'business_date': h.get('business_date', ''),
+        'hearing_date': h.get('hearing_date', ''), 'hearing_date_iso': parse_case_date(h.get('hearing_date')),
+        'purpose_of_hearing': h.get('purpose_of_hearing', ''),
+    } for h in details.get('case_history') or []]
+    orders = [{
+        'cnr': cnr, 'order_number': o.get('order_number', ''), 'order_date': o.get('order_date', ''),
+        'order_date_iso': parse_case_date(o.get('order_date')), 'order_details': o.get('order_details', ''),
+        'display_pdf_arg': o.get('display_pdf_arg') or o.get('pdf_url', ''),
+    } for o in details.get('interim_orders') or []]
+    processes = [{'cnr': cnr, 'process_id': p.get('process_id', ''), 'process_title': p.get('process_title', ''),
+                  'process_date': p.get('process_date', '')} for p in details.get('processes') or []]
+
+    for model, rows in ((CaseParty, parties), (CaseAct, acts), (CaseHearing, hearings),
+                        (CaseOrder, orders), (CaseProcess, processes)):
+        if rows:
+            db.execute(insert(model), rows)
+    return case
+
+
+def hearings_on(db: Session, court_complex_code: str, day: date) -> List[Dict]:
+    """Hearings recorded in case_history on ``day`` plus cases listed for that day (next_date)."""
+    rows = (
+        db.query(CaseHearing, Case)
+        .join(Case, Case.cnr == CaseHearing.cnr)
+        .filter(CaseHearing.court_complex_code == court_complex_code, CaseHearing.hearing_date_iso == day)
+        .order_by(CaseHearing.judge, Case.case_number)
+        .all()
+    )
+    out = [{
+        'cnr': c.cnr, 'case_number': c.case_number, 'case_type': c.case_type, 'court_name': c.court_name,
+        'judge': h.judge, 'hearing_date': h.hearing_date, 'purpose_of_hearing': h.purpose_of_hearing,
+        'source': 'case_history',
+    } for h, c in rows]
+    seen = {r['cnr'] for r in out}
+    listed = (
+        db.query(Case)
+        .filter(Case.court_complex_code == court_complex_code, Case.next_date_iso == day)
+        .order_by(Case.judge, Case.case_number)
+        .all()
+    )
+    out.extend({
+        'cnr': c.cnr, 'case_number': c.case_number, 'case_type': c.case_type, 'court_name': c.court_name,
+        'judge': c.judge, 'hearing_date': c.next_date, 'purpose_of_hearing': c.stage, 'source': 'next_date',
+    } for c in listed if c.cnr not in seen)
+    return out
+
+
+def upcoming_cases(db: Session, days: int = 7, court_complex_code: Optional[str] = None,
+                   start: Optional[date] = None) -> List[Case]:
+    start = start or date.today()
+    q = db.query(Case).filter(Case.next_date_iso >= start, Case.next_date_iso <= start + timedelta(days=days))
+    if court_complex_code:
+        q = q.filter(Case.court_complex_code == court_complex_code)
+    return q.order_by(Case.next_date_iso, Case.court_complex_code, Case.case_number).all()
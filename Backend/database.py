@@ -1,16 +1,34 @@
-from sqlalchemy import create_engine
+import os
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-DATABASE_URL = "sqlite:///./scraper.db"
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./scraper.db")
 
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+if DATABASE_URL.startswith("sqlite"):
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _record):
+        # WAL + busy timeout let several worker processes share the file
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA busy_timeout=5000")
+        cur.close()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
 def create_tables():
-    Base.metadata.create_all(bind=engine)
+    for attempt in range(5):
+        try:
+            Base.metadata.create_all(bind=engine)
+            return
+        except OperationalError:
+            # another worker process created a table/index between the existence check and CREATE
+            if attempt == 4:
+                raise
 
 def get_db():
     db = SessionLocal()
@@ -0,0 +1,22 @@
+"""Parsing of the date strings eCourts renders ("15-11-2025", "15th November 2025")."""
+import re
+from datetime import date, datetime
+from typing import Optional
+
+_ORDINAL_RE = re.compile(r'^(\d{1,2})(st|nd|rd|th)\s+([A-Za-z]+)\s+(\d{4})$')
+
+
+def parse_case_date(value: Optional[str]) -> Optional[date]:
+    """Return a date for the formats used across viewHistory pages, else None."""
+    if not value:
+        return None
+    v = value.replace('\xa0', ' ').strip()
+    m = _ORDINAL_RE.match(v)
+    if m:
+        v = f"{m.group(1)} {m.group(3)} {m.group(4)}"
+    for fmt in ('%d-%m-%Y', '%d/%m/%Y', '%d %B %Y', '%d %b %Y', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(v, fmt).date()
+        except ValueError:
+            continue
+    return None
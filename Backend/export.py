@@ -0,0 +1,125 @@
+"""Streaming CSV / NDJSON export of query logs and stored cases.
+
+Rows are read in batches (``yield_per``) from a session owned by the generator
+and encoded chunk by chunk, so memory stays flat regardless of export size.
+Optional gzip wraps the same byte stream with an incremental compressor.
+"""
+import csv
+import io
+import zlib
+from datetime import date, datetime
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence
+
+from sqlalchemy.orm import Query
+
+from database import SessionLocal
+from models import QueryLog, Case
+from serialization import dumps
+
+BATCH_ROWS = 1000
+FORMATS = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+
+LOG_COLUMNS = ['id', 'timestamp', 'state', 'district', 'case_number', 'status']
+CASE_COLUMNS = [
+    'cnr', 'case_number', 'case_type', 'filing_number', 'filing_date', 'registration_number',
+    'registration_date', 'court_name', 'judge', 'stage', 'next_date', 'next_date_iso',
+    'first_hearing_date', 'state_code', 'dist_code', 'court_complex_code', 'court_code', 'updated_at',
+]
+
+
+def filter_query_logs(query: Query, state: Optional[str] = None, district: Optional[str] = None,
+                      status: Optional[str] = None, case_number: Optional[str] = None,
+                      since: Optional[datetime] = None, until: Optional[datetime] = None) -> Query:
+    """Filters shared by /api/query-logs and /api/export/query-logs."""
+    if state:
+        query = query.filter(QueryLog.state == state)
+    if district:
+        query = query.filter(QueryLog.district == district)
+    if status:
+        query = query.filter(QueryLog.status == status)
+    if case_number:
+        query = query.filter(QueryLog.case_number == case_number)
+    if since:
+        query = query.filter(QueryLog.timestamp >= since)
+    if until:
+        query = query.filter(QueryLog.timestamp < until)
+    return query
+
+
+def filter_cases(query: Query, state_code: Optional[str] = None, dist_code: Optional[str] = None,
+                 court_complex_code: Optional[str] = None, since: Optional[datetime] = None,
+                 until: Optional[datetime] = None) -> Query:
+    if state_code:
+        query = query.filter(Case.state_code == state_code)
+    if dist_code:
+        query = query.filter(Case.dist_code == dist_code)
+    if court_complex_code:
+        query = query.filter(Case.court_complex_code == court_complex_code)
+    if since:
+        query = query.filter(Case.updated_at >= since)
+    if until:
+        query = query.filter(Case.updated_at < until)
+    return query
+
+
+def _cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def iter_rows(build_query: Callable, columns: Sequence[str]) -> Iterator[List[tuple]]:
+    """Yield batches of column tuples from a query built on a private session."""
+    db = SessionLocal()
+    try:
+        query = build_query(db).execution_options(stream_results=True).yield_per(BATCH_ROWS)
+        batch = []
+        for row in query:
+            batch.append(tuple(_cell(v) for v in row))
+            if len(batch) >= BATCH_ROWS:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        db.close()
+
+
+def encode_csv(batches: Iterable[List[tuple]], columns: Sequence[str]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(columns)
+    for batch in batches:
+        writer.writerows(batch)
+        yield buf.getvalue().encode('utf-8')
+        buf.seek(0)
+        buf.truncate()
+    tail = buf.getvalue()
+    if tail:
+        yield tail.encode('utf-8')
+
+
+def encode_ndjson(batches: Iterable[List[tuple]], columns: Sequence[str]) -> Iterator[bytes]:
+    for batch in batches:
+        yield b''.join(dumps(dict(zip(columns, row))) + b'\n' for row in batch)
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    comp = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for chunk in chunks:
+        out = comp.compress(chunk)
+        if out:
+            yield out
+    yield comp.flush()
+
+
+def stream(build_query: Callable, columns: Sequence[str], fmt: str, gzip: bool = False) -> Iterator[bytes]:
+    encoder = encode_csv if fmt == 'csv' else encode_ndjson
+    chunks = encoder(iter_rows(build_query, columns), columns)
+    return gzip_stream(chunks) if gzip else chunks
+
+
+def log_columns(include_raw: bool) -> List[str]:
+    return LOG_COLUMNS + (['raw_json_response'] if include_raw else [])
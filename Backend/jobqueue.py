@@ -0,0 +1,390 @@
+"""Durable background job queue in the app's SQLite database.
+
+Jobs live in the ``jobs`` table, so queued work survives restarts. Each job
+type is registered with a handler ``fn(payload) -> result`` and its own limits.
+The ``JobQueue`` runner thread claims due jobs with a conditional UPDATE (the
+same claim-by-update pattern as the watchlist scheduler), which also enforces
+the type's concurrency across every worker process sharing the database. It
+runs the handlers on a thread pool and keeps their leases alive while they
+run.
+
+Failures are retried with exponential backoff and jitter until
+``max_attempts``; ``PermanentError`` fails a job at once. A process that dies
+mid-job stops renewing its lease, and once the lease expires the job is
+queued again (or failed, if it has no attempts left). ``dedup_key`` makes
+enqueueing idempotent: while a job of that type and key is queued or running,
+enqueueing it again returns the existing job.
+
+Environment:
+  JOBS_ENABLED                 0 disables the runner thread (default 1)
+  JOBS_POLL_SECONDS            idle poll interval (default 1)
+  JOBS_RETENTION_DAYS          days finished jobs are kept (default 7)
+  JOBS_<TYPE>_CONCURRENCY      running jobs of TYPE across all workers
+  JOBS_<TYPE>_RATE_PER_MINUTE  job starts of TYPE per minute, per process
+  JOBS_<TYPE>_MAX_ATTEMPTS     attempts before a job of TYPE fails for good
+"""
+import json
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import Job
+import metrics
+import lanes
+
+logger = logging.getLogger(__name__)
+
+POLL_SECONDS = float(os.getenv('JOBS_POLL_SECONDS', '1'))
+RETENTION_DAYS = float(os.getenv('JOBS_RETENTION_DAYS', '7'))
+MAINTENANCE_SECONDS = 30.0
+
+ACTIVE = ('queued', 'running')
+FINISHED = ('succeeded', 'failed', 'cancelled')
+
+JOBS = metrics.counter(
+    'ecourts_jobs_total',
+    'Background jobs by type and event (enqueued, deduplicated, started, succeeded, retried, failed, recovered).')
+
+
+class PermanentError(Exception):
+    """Raise from a handler to fail the job without further attempts."""
+
+
+def _env(name: str, key: str, default):
+    value = os.getenv(f"JOBS_{name.upper()}_{key}")
+    return type(default)(value) if value not in (None, '') else default
+
+
+@dataclass
+class JobType:
+    name: str
+    handler: Callable[[Dict], Any]
+    concurrency: int = 1
+    rate_per_minute: float = 60.0
+    max_attempts: int = 5
+    lease_seconds: float = 300.0
+    backoff_seconds: float = 30.0
+    max_backoff_seconds: float = 3600.0
+    last_start: float = field(default=0.0, repr=False)
+
+    def __post_init__(self):
+        self.concurrency = _env(self.name, 'CONCURRENCY', self.concurrency)
+        self.rate_per_minute = _env(self.name, 'RATE_PER_MINUTE', float(self.rate_per_minute))
+        self.max_attempts = _env(self.name, 'MAX_ATTEMPTS', self.max_attempts)
+
+    def backoff(self, attempts: int) -> timedelta:
+        seconds = min(self.max_backoff_seconds, self.backoff_seconds * 2 ** max(attempts - 1, 0))
+        return timedelta(seconds=seconds * random.uniform(0.8, 1.2))
+
+    def config(self) -> dict:
+        return {'concurrency': self.concurrency, 'rate_per_minute': self.rate_per_minute,
+                'max_attempts': self.max_attempts, 'lease_seconds': self.lease_seconds}
+
+
+def job_dict(job: Job) -> dict:
+    return {
+        'id': job.id, 'type': job.type, 'dedup_key': job.dedup_key, 'status': job.status,
+        'priority': job.priority, 'attempts': job.attempts, 'max_attempts': job.max_attempts,
+        'payload': json.loads(job.payload) if job.payload else {},
+        'result': json.loads(job.result) if job.result else None,
+        'last_error': job.last_error, 'run_at': job.run_at, 'lease_owner': job.lease_owner,
+        'lease_expires_at': job.lease_expires_at, 'created_at': job.created_at,
+        'started_at': job.started_at, 'finished_at': job.finished_at,
+    }
+
+
+class JobQueue:
+    def __init__(self, poll_seconds: float = POLL_SECONDS, retention_days: float = RETENTION_DAYS):
+        self.types: Dict[str, JobType] = {}
+        self.poll_seconds = poll_seconds
+        self.retention = timedelta(days=retention_days)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._running: Dict[int, str] = {}  # job id -> type, claimed by this process
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._last_maintenance = 0.0
+        self._last_heartbeat = 0.0
+
+    # --- registration / enqueueing -------------------------------------------------
+
+    def register(self, name: str, handler: Callable[[Dict], Any], **limits) -> JobType:
+        jt = self.types[name] = JobType(name, handler, **limits)
+        return jt
+
+    def _active(self, db: Session, type_: str, dedup_key: str) -> Optional[Job]:
+        return (db.query(Job).filter(Job.type == type_, Job.dedup_key == dedup_key, Job.status.in_(ACTIVE))
+                .order_by(Job.id.desc()).first())
+
+    def enqueue(self, db: Session, type_: str, payload: Optional[Dict] = None, dedup_key: Optional[str] = None,
+                priority: int = 0, delay_seconds: float = 0, max_attempts: Optional[int] = None) -> Tuple[Job, bool]:
+        """Queue a job (commits). Returns (job, created); an active job with the same key is returned as-is."""
+        jt = self.types.get(type_)
+        if jt is None:
+            raise ValueError(f"unknown job type: {type_}")
+        if dedup_key:
+            existing = self._active(db, type_, dedup_key)
+            if existing is not None:
+                JOBS.inc(type=type_, event='deduplicated')
+                return existing, False
+        job = Job(type=type_, dedup_key=dedup_key or None, payload=json.dumps(payload or {}), status='queued',
+                  priority=priority, attempts=0, max_attempts=max_attempts or jt.max_attempts,
+                  run_at=datetime.utcnow() + timedelta(seconds=max(0.0, delay_seconds)))
+        db.add(job)
+        try:
+            db.commit()
+        except IntegrityError:
+            # the same key was enqueued concurrently (partial unique index on active jobs)
+            db.rollback()
+            JOBS.inc(type=type_, event='deduplicated')
+            return self._active(db, type_, dedup_key), False
+        JOBS.inc(type=type_, event='enqueued')
+        self._wake.set()
+        return job, True
+
+    def cancel(self, db: Session, job_id: int) -> bool:
+        """Cancel a queued or running job. A running handler finishes, but its outcome is discarded."""
+        n = db.execute(update(Job).where(Job.id == job_id, Job.status.in_(ACTIVE))
+                       .values(status='cancelled', finished_at=datetime.utcnow(), lease_owner=None)).rowcount
+        db.commit()
+        return bool(n)
+
+    def retry(self, db: Session, job_id: int) -> bool:
+        """Queue a failed or cancelled job again with a fresh attempt budget."""
+        n = db.execute(update(Job).where(Job.id == job_id, Job.status.in_(('failed', 'cancelled')))
+                       .values(status='queued', attempts=0, run_at=datetime.utcnow(), finished_at=None,
+                               lease_owner=None, lease_expires_at=None)).rowcount
+        db.commit()
+        if n:
+            self._wake.set()
+        return bool(n)
+
+    def stats(self, db: Session) -> dict:
+        counts: Dict[str, Dict[str, int]] = {name: {} for name in self.types}
+        for type_, status, n in db.query(Job.type, Job.status, func.count(Job.id)).group_by(Job.type, Job.status):
+            counts.setdefault(type_, {})[status] = n
+        with self._lock:
+            local = len(self._running)
+        return {
+            'owner': self.owner,
+            'running_here': local,
+            'runner_alive': bool(self._thread and self._thread.is_alive()),
+            'types': {name: {'counts': by_status, **(self.types[name].config() if name in self.types else {})}
+                      for name, by_status in counts.items()},
+        }
+
+    # --- runner ------------------------------------------------------------------
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, sum(jt.concurrency for jt in self.types.values())),
+                                            thread_name_prefix='job')
+        self._thread = threading.Thread(target=self._run, name='job-runner', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = False
+            try:
+                now = time.monotonic()
+                if now - self._last_maintenance >= MAINTENANCE_SECONDS:
+                    self._last_maintenance = now
+                    self.recover_expired()
+                    self.prune()
+                self._heartbeat()
+                started = self.run_once()
+            except Exception as e:
+                logger.warning(f"job runner error: {e}")
+            self._wake.wait(0 if started else self.poll_seconds)
+            self._wake.clear()
+
+    def _local_running(self, type_: str) -> int:
+        with self._lock:
+            return sum(1 for t in self._running.values() if t == type_)
+
+    def run_once(self) -> bool:
+        """Claim and start at most one due job per type. Returns True if any started."""
+        started = False
+        for jt in list(self.types.values()):
+            if self._stop.is_set() or self._executor is None:
+                break
+            if self._local_running(jt.name) >= jt.concurrency:
+                continue
+            if time.monotonic() < jt.last_start + 60.0 / max(jt.rate_per_minute, 0.01):
+                continue
+            job_id = self.claim(jt)
+            if job_id is None:
+                continue
+            jt.last_start = time.monotonic()
+            with self._lock:
+                self._running[job_id] = jt.name
+            self._executor.submit(self._execute, jt, job_id)
+            started = True
+        return started
+
+    def claim(self, jt: JobType) -> Optional[int]:
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            candidate = (
+                db.query(Job.id)
+                .filter(Job.type == jt.name, Job.status == 'queued', Job.run_at <= now)
+                .order_by(Job.priority.desc(), Job.run_at.asc(), Job.id.asc())
+                .first()
+            )
+            if candidate is None:
+                return None
+            # Claim it only if it is still queued and the type is under its concurrency
+            # limit across all workers; SQLite serializes the check with the write.
+            others = Job.__table__.alias('running_jobs')
+            running = (select(func.count()).select_from(others)
+                       .where(others.c.type == jt.name, others.c.status == 'running',
+                              others.c.lease_expires_at > now)
+                       .scalar_subquery())
+            claimed = db.execute(
+                update(Job)
+                .where(Job.id == candidate.id, Job.status == 'queued', running < jt.concurrency)
+                .values(status='running', lease_owner=self.owner, attempts=Job.attempts + 1, started_at=now,
+                        lease_expires_at=now + timedelta(seconds=jt.lease_seconds))
+            ).rowcount
+            db.commit()
+            return candidate.id if claimed else None
+        finally:
+            db.close()
+
+    def _execute(self, jt: JobType, job_id: int):
+        JOBS.inc(type=jt.name, event='started')
+        try:
+            db = SessionLocal()
+            try:
+                job = db.get(Job, job_id)
+                payload = json.loads(job.payload) if job and job.payload else {}
+            finally:
+                db.close()
+            try:
+                with lanes.background():
+                    result = jt.handler(payload)
+            except PermanentError as e:
+                self._finish(jt, job_id, error=str(e) or type(e).__name__, permanent=True)
+            except Exception as e:
+                self._finish(jt, job_id, error=f"{type(e).__name__}: {e}")
+            else:
+                self._finish(jt, job_id, result=result)
+        finally:
+            with self._lock:
+                self._running.pop(job_id, None)
+            self._wake.set()
+
+    def _finish(self, jt: JobType, job_id: int, result: Any = None, error: Optional[str] = None,
+                permanent: bool = False):
+        db = SessionLocal()
+        try:
+            job = db.get(Job, job_id)
+            # a lease lost to recovery, or a cancelled job, is no longer ours to finish
+            if job is None or job.status != 'running' or job.lease_owner != self.owner:
+                return
+            now = datetime.utcnow()
+            mine = (Job.id == job_id, Job.status == 'running', Job.lease_owner == self.owner)
+            if error is None:
+                values = dict(status='succeeded', result=json.dumps(result, default=str), last_error=None,
+                              finished_at=now, lease_owner=None, lease_expires_at=None)
+                event = 'succeeded'
+            elif permanent or job.attempts >= job.max_attempts:
+                values = dict(status='failed', last_error=error[:2000], finished_at=now,
+                              lease_owner=None, lease_expires_at=None)
+                event = 'failed'
+            else:
+                values = dict(status='queued', last_error=error[:2000], run_at=now + jt.backoff(job.attempts),
+                              lease_owner=None, lease_expires_at=None)
+                event = 'retried'
+            if db.execute(update(Job).where(*mine).values(**values)).rowcount:
+                JOBS.inc(type=jt.name, event=event)
+            db.commit()
+            if error is not None:
+                logger.warning(f"job {job_id} ({jt.name}) attempt {job.attempts} {event}: {error}")
+        finally:
+            db.close()
+
+    def _heartbeat(self):
+        """Extend the leases of jobs this process is running (every third of the shortest lease)."""
+        with self._lock:
+            running = dict(self._running)
+        if not running:
+            return
+        shortest = min(self.types[t].lease_seconds for t in running.values())
+        if time.monotonic() - self._last_heartbeat < shortest / 3:
+            return
+        self._last_heartbeat = time.monotonic()
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            for type_ in set(running.values()):
+                ids = [i for i, t in running.items() if t == type_]
+                db.execute(update(Job).where(Job.id.in_(ids), Job.status == 'running', Job.lease_owner == self.owner)
+                           .values(lease_expires_at=now + timedelta(seconds=self.types[type_].lease_seconds)))
+            db.commit()
+        finally:
+            db.close()
+
+    def recover_expired(self) -> int:
+        """Requeue (or fail, when out of attempts) running jobs whose lease expired, e.g. after a crash."""
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            expired = (Job.status == 'running', Job.lease_expires_at < now)
+            failed = db.execute(update(Job).where(*expired, Job.attempts >= Job.max_attempts)
+                                .values(status='failed', last_error='lease expired', finished_at=now,
+                                        lease_owner=None, lease_expires_at=None)).rowcount
+            requeued = db.execute(update(Job).where(*expired)
+                                  .values(status='queued', run_at=now, last_error='lease expired',
+                                          lease_owner=None, lease_expires_at=None)).rowcount
+            db.commit()
+            if failed or requeued:
+                JOBS.inc(failed + requeued, type='*', event='recovered')
+                logger.info(f"job recovery: {requeued} requeued, {failed} failed after lease expiry")
+            return failed + requeued
+        finally:
+            db.close()
+
+    def prune(self) -> int:
+        db = SessionLocal()
+        try:
+            n = (db.query(Job).filter(Job.status.in_(FINISHED), Job.finished_at < datetime.utcnow() - self.retention)
+                 .delete(synchronize_session=False))
+            db.commit()
+            return n
+        finally:
+            db.close()
+
+    def list(self, db: Session, type_: Optional[str] = None, status: Optional[str] = None,
+             limit: int = 50, offset: int = 0) -> List[Job]:
+        query = db.query(Job)
+        if type_:
+            query = query.filter(Job.type == type_)
+        if status:
+            query = query.filter(Job.status == status)
+        return query.order_by(Job.id.desc()).offset(offset).limit(limit).all()
@@ -0,0 +1,193 @@
+"""Priority lanes in front of every upstream eCourts request.
+
+All scraper traffic goes through one ``requests`` session and its pool of 20
+connections, and eCourts answers only so many requests at a time. The
+``PriorityGate`` lets at most UPSTREAM_CONCURRENCY requests be in flight and
+splits them between two lanes:
+
+- ``interactive`` (the default): API requests an operator is waiting on.
+- ``background``: the cache warmer, watchlist refreshes and queued jobs.
+
+A waiting interactive request is admitted before any waiting background one.
+Background requests never hold more than UPSTREAM_BACKGROUND_MAX slots, so
+interactive requests find a free slot without waiting for background work to
+drain. Up to UPSTREAM_BACKGROUND_MIN slots stay available to background work
+even while interactive requests queue, so it is never starved.
+
+The lane is a context variable. Background threads wrap their work in
+``with lanes.background():``, and nothing else needs to pass it along.
+
+Background work that an interactive request ends up waiting on (a coalesced
+call it joined, see singleflight.py) is promoted: its waits for a slot are
+admitted as interactive from then on, so the operator does not wait behind
+the background lane.
+
+Environment:
+  UPSTREAM_CONCURRENCY     upstream requests in flight per process (default 8, 0 disables the gate)
+  UPSTREAM_BACKGROUND_MIN  slots background work always gets when it has requests waiting (default 1)
+  UPSTREAM_BACKGROUND_MAX  most slots background work may hold (default half of UPSTREAM_CONCURRENCY)
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Dict, Optional, Tuple
+
+import metrics
+
+INTERACTIVE = 'interactive'
+BACKGROUND = 'background'
+
+CONCURRENCY = int(os.getenv('UPSTREAM_CONCURRENCY', '8'))
+BACKGROUND_MIN = int(os.getenv('UPSTREAM_BACKGROUND_MIN', '1'))
+BACKGROUND_MAX = int(os.getenv('UPSTREAM_BACKGROUND_MAX', str(max(1, CONCURRENCY // 2))))
+
+GATE_WAIT = metrics.histogram(
+    'ecourts_upstream_gate_wait_seconds',
+    'Time upstream requests waited for a slot, by lane.')
+
+current_lane: ContextVar[str] = ContextVar('upstream_lane', default=INTERACTIVE)
+# promotion events of the background calls enclosing the current one; any set -> interactive
+current_promotions: ContextVar[Tuple[threading.Event, ...]] = ContextVar('upstream_lane_promotions', default=())
+
+
+@contextmanager
+def background():
+    """Run the enclosed upstream calls in the background lane."""
+    token = current_lane.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        current_lane.reset(token)
+
+
+def in_background(fn: Callable) -> Callable:
+    """Wrap ``fn`` so it always runs in the background lane."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        with background():
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def promotable(event: threading.Event):
+    """Run the enclosed background calls in the interactive lane once ``event`` is set (see ``promote``)."""
+    token = current_promotions.set(current_promotions.get() + (event,))
+    try:
+        yield
+    finally:
+        current_promotions.reset(token)
+
+
+def promote(event: threading.Event):
+    """Promote the background work running under ``promotable(event)``, including waits already queued."""
+    if not event.is_set():
+        event.set()
+        gate.wake()
+
+
+class PriorityGate:
+    def __init__(self, slots: int = CONCURRENCY, background_min: int = BACKGROUND_MIN,
+                 background_max: int = BACKGROUND_MAX):
+        self.slots = slots
+        self.background_max = max(1, min(background_max, slots)) if slots > 0 else 0
+        self.background_min = max(0, min(background_min, self.background_max))
+        self._cond = threading.Condition()
+        self._running: Dict[str, int] = {INTERACTIVE: 0, BACKGROUND: 0}
+        self._waiting: Dict[str, int] = {INTERACTIVE: 0, BACKGROUND: 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.slots > 0
+
+    def _admit(self, lane: str) -> bool:
+        if sum(self._running.values()) >= self.slots:
+            return False
+        bg = self._running[BACKGROUND]
+        if lane == BACKGROUND:
+            if bg >= self.background_max:
+                return False
+            # interactive requests go first, except for background's guaranteed slots
+            return not self._waiting[INTERACTIVE] or bg < self.background_min
+        # keep background's guaranteed slots free for it while it has requests waiting
+        reserved = max(0, self.background_min - bg) if self._waiting[BACKGROUND] else 0
+        return self._running[INTERACTIVE] < self.slots - bg - reserved
+
+    def acquire(self, lane: str, timeout: Optional[float] = None,
+                promotions: Tuple[threading.Event, ...] = ()) -> Optional[str]:
+        """Wait for a slot; return the lane it was granted in, or None after ``timeout``.
+
+        A background wait is moved to the interactive lane as soon as one of
+        ``promotions`` is set.
+        """
+        start = time.perf_counter()
+        with self._cond:
+            self._waiting[lane] += 1
+
+            def ready() -> bool:
+                nonlocal lane
+                if lane == BACKGROUND and any(e.is_set() for e in promotions):
+                    self._waiting[lane] -= 1
+                    lane = INTERACTIVE
+                    self._waiting[lane] += 1
+                return self._admit(lane)
+
+            try:
+                if not self._cond.wait_for(ready, timeout):
+                    return None
+            finally:
+                self._waiting[lane] -= 1
+                # one fewer waiter in this lane may admit a waiter in the other
+                self._cond.notify_all()
+            self._running[lane] += 1
+        GATE_WAIT.observe(time.perf_counter() - start, lane=lane)
+        return lane
+
+    def release(self, lane: str):
+        with self._cond:
+            self._running[lane] -= 1
+            self._cond.notify_all()
+
+    def wake(self):
+        """Re-check waiting requests (a promotion changed their lane)."""
+        with self._cond:
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, lane: Optional[str] = None, timeout: Optional[float] = None):
+        """Hold one upstream slot in ``lane`` (default: the caller's current lane).
+
+        Raises TimeoutError when no slot frees up within ``timeout`` seconds.
+        """
+        if not self.enabled:
+            yield
+            return
+        lane = lane or current_lane.get()
+        granted = self.acquire(lane, timeout, current_promotions.get())
+        if granted is None:
+            raise TimeoutError(f"no upstream slot in the {lane} lane within {timeout}s")
+        try:
+            yield
+        finally:
+            self.release(granted)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {'slots': self.slots, 'background_min': self.background_min,
+                    'background_max': self.background_max,
+                    'running': dict(self._running), 'waiting': dict(self._waiting)}
+
+
+gate = PriorityGate()
+
+
+@metrics.register_collector
+def _gate_metrics():
+    stats = gate.stats()
+    yield ('ecourts_upstream_in_flight', 'gauge', 'Upstream requests holding a gate slot, by lane.',
+           [({'lane': k}, v) for k, v in stats['running'].items()])
+    yield ('ecourts_upstream_waiting', 'gauge', 'Upstream requests waiting for a gate slot, by lane.',
+           [({'lane': k}, v) for k, v in stats['waiting'].items()])
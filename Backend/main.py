@@ -1,23 +1,53 @@
-from fastapi import FastAPI, Depends, HTTPException, Response
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc
-from typing import List
+from sqlalchemy.exc import IntegrityError
+from pydantic import ValidationError
+from typing import List, Optional
 import json
 from datetime import datetime, timezone, timedelta
+import os
 import random
 import logging
 from contextlib import asynccontextmanager
+from functools import partial
+import asyncio
+import re
+import uuid
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
 
-from database import get_db, create_tables
-from models import QueryLog
+from database import get_db, create_tables, SessionLocal, engine
+from models import QueryLog, WatchedCase, Case, CaseOrder, OrderText, Job
 from schemas import (
     StateRequest, DistrictRequest, CaseTypeRequest, CaseSubmissionRequest,
     CaseDetailsRequest, QueryLogResponse, StatsResponse, DistrictResponse, 
     CourtComplexResponse, CaseTypeResponse, CaseSubmissionResponse, 
-    CaseDetailsResponse, StateResponse, OrderPdfRequest
+    CaseDetailsResponse, StateResponse, OrderPdfRequest, WatchCaseRequest,
+    WatchedCaseResponse, CaseChangesResponse, SearchResponse, HearingListing,
+    CaseSummaryResponse, CascadeRequest, CascadeResponse, OrderSearchResponse,
+    OrderTextResponse, OrdersZipRequest, JobRequest, JobBulkRequest, JobResponse
 )
-from scraper import ECourtScraper
+from scraper import ECourtScraper, current_client, CLIENT_SESSIONS_MAX, CLIENT_SESSION_IDLE_SECONDS
+from dates import parse_case_date
+from serialization import dumps, FastJSONResponse
+import metrics
+import tracing
+import session_store
+import watchlist
+import snapshots
+import search_index
+import case_store
+import export
+import warmer
+import parsing
+import pdf_strategy
+import order_text
+import order_zip
+import startup
+import jobqueue
+import lanes
 logger = logging.getLogger(__name__)
 
 # --- IST Logging Setup -----------------------------------------------------
@@ -64,7 +94,9 @@ district_name_cache = {}
 
 def get_state_name(code: str):
     if code in state_name_cache:
+        metrics.NAME_CACHE.inc(cache='state_names', result='hit')
         return state_name_cache[code]
+    metrics.NAME_CACHE.inc(cache='state_names', result='miss')
     states, _ = scraper.get_states()
     for s in states:
         state_name_cache[s['value']] = s['text']
@@ -73,33 +105,304 @@ def get_state_name(code: str):
 def get_district_name(state_code: str, dist_code: str):
     key = (state_code, dist_code)
     if key in district_name_cache:
+        metrics.NAME_CACHE.inc(cache='district_names', result='hit')
         return district_name_cache[key]
+    metrics.NAME_CACHE.inc(cache='district_names', result='miss')
     dists, _ = scraper.get_districts(state_code)
     for d in dists:
         district_name_cache[(state_code, d['value'])] = d['text']
     return district_name_cache.get(key, dist_code)
 
 
-create_tables()
+def setup_database():
+    create_tables()
+    search_index.ensure_index(engine)
+    order_text.ensure_index(engine)
+
 scraper = ECourtScraper()
+readiness = startup.Readiness()
+
+# Multi-worker mode (serve.py): mirror each client's upstream session + name caches across processes
+scraper_states = session_store.MirrorSet(
+    'scraper_session', scraper.export_state, scraper.load_state,
+    maxsize=CLIENT_SESSIONS_MAX, max_age=CLIENT_SESSION_IDLE_SECONDS)
+name_cache_state = session_store.SharedMirror(
+    'name_caches',
+    lambda: session_store.export_name_caches(state_name_cache, district_name_cache),
+    lambda data: session_store.load_name_caches(data, state_name_cache, district_name_cache))
+
+@metrics.register_collector
+def _scraper_cache_metrics():
+    stats = scraper.cache_stats()
+    yield ('ecourts_cache_hits_total', 'counter', 'Scraper cache hits by cache.',
+           [({'cache': k}, v['hits']) for k, v in stats.items()])
+    yield ('ecourts_cache_misses_total', 'counter', 'Scraper cache misses by cache.',
+           [({'cache': k}, v['misses']) for k, v in stats.items()])
+    yield ('ecourts_cache_entries', 'gauge', 'Current number of entries per cache.',
+           [({'cache': k}, v['size']) for k, v in stats.items()]
+           + [({'cache': 'state_names'}, len(state_name_cache)),
+              ({'cache': 'district_names'}, len(district_name_cache))])
+
+def ingest_case_details(db: Session, case_details: Optional[dict], context: dict):
+    """Store parsed viewHistory output (snapshot + delta, search index, normalized tables). Caller commits."""
+    if not case_details or case_details.get('error'):
+        return
+    cnr = case_details.get('cnr_number') or context.get('cino')
+    if not cnr:
+        return
+    with tracing.span('ingest_case'):
+        snapshots.record_snapshot(db, cnr, case_details)
+        search_index.index_case(db, cnr, case_details)
+        case_store.upsert_case(db, cnr, case_details, context)
+
+
+def fetch_case_details(fields: dict) -> dict:
+    """viewHistory lookup outside a request (no CAPTCHA needed), ingested like /api/get-case-details.
+
+    ``fields`` are the CaseDetailsRequest fields. Used by the watchlist scheduler and
+    the case_lookup job.
+    """
+    if session_store.enabled():
+        scraper_states.get('').pull()
+    details, _ = scraper.get_case_details(
+        court_code=fields['court_code'],
+        state_code=fields['state_code'],
+        dist_code=fields['dist_code'],
+        court_complex_code=fields['court_complex_code'],
+        case_no=fields['case_no'],
+        cino=fields['cino'],
+        search_flag=fields.get('search_flag') or 'CScaseNumber',
+        search_by=fields.get('search_by') or 'CScaseNumber'
+    )
+    if session_store.enabled():
+        scraper_states.get('').push()
+    db = SessionLocal()
+    try:
+        ingest_case_details(db, details.get('case_details'), {
+            k: fields[k] for k in ('cino', 'court_code', 'state_code', 'dist_code', 'court_complex_code')
+        })
+        db.commit()
+    except Exception as e:
+        logger.warning(f"case ingest failed: {e}")
+    finally:
+        db.close()
+    return details
+
+
+def refresh_watched_case(case: WatchedCase):
+    """viewHistory refresh used by the watchlist scheduler."""
+    return fetch_case_details({
+        'cino': case.cino, 'court_code': case.court_code, 'state_code': case.state_code,
+        'dist_code': case.dist_code, 'court_complex_code': case.court_complex_code, 'case_no': case.case_no,
+    })
+
+watch_scheduler = watchlist.WatchlistScheduler(refresh_watched_case)
+cache_warmer = warmer.PopularityWarmer(lambda: scraper)
+order_extractor = order_text.OrderTextExtractor()
+worker_metrics = session_store.WorkerMetrics(metrics.snapshot)
+
+
+# --- Background jobs (jobqueue.py) --------------------------------------------
+
+def _job_watch_refresh(payload: dict) -> dict:
+    db = SessionLocal()
+    try:
+        case = db.get(WatchedCase, payload.get('case_id'))
+        if case is None:
+            raise jobqueue.PermanentError("Watched case not found")
+        case = watch_scheduler.refresh_case(db, case)
+        return {'cino': case.cino, 'last_status': case.last_status, 'next_date': case.next_date}
+    finally:
+        db.close()
+
+
+def _job_case_lookup(payload: dict) -> dict:
+    try:
+        fields = CaseDetailsRequest(**payload).model_dump()
+    except ValidationError as e:
+        raise jobqueue.PermanentError("Invalid payload: " + ', '.join(
+            f"{'.'.join(map(str, err['loc']))} {err['msg'].lower()}" for err in e.errors()))
+    details = fetch_case_details(fields)
+    if not details.get('success'):
+        raise RuntimeError(details.get('message') or 'case lookup failed')
+    case_details = details.get('case_details') or {}
+    return {'cnr': case_details.get('cnr_number') or fields['cino'],
+            'stage': case_details.get('stage'), 'next_date': case_details.get('next_date')}
+
+
+def _job_pdf_prefetch(payload: dict) -> dict:
+    pdf_request = (payload.get('pdf_request') or '').strip()
+    if not pdf_request:
+        raise jobqueue.PermanentError("pdf_request is required")
+    pdf_bytes, filename, _ = scraper.fetch_order_pdf(pdf_request, payload.get('state_code') or '',
+                                                     payload.get('dist_code') or '', payload.get('cino') or '')
+    if not pdf_bytes:
+        raise RuntimeError("PDF not available")
+    queued = order_extractor.submit(pdf_bytes, pdf_request)
+    return {'filename': filename, 'bytes': len(pdf_bytes), 'text_queued': queued}
+
+
+def _job_catalog_crawl(payload: dict) -> dict:
+    """Warm the state -> district -> court complex option caches (one state or all)."""
+    states, _ = scraper.get_states()
+    codes = [payload['state_code']] if payload.get('state_code') else [s['value'] for s in states]
+    districts = complexes = 0
+    for state_code in codes:
+        dists, _ = scraper.get_districts(state_code)
+        districts += len(dists)
+        for d in dists:
+            complexes += len(scraper.get_court_complexes(state_code, d['value'])[0])
+    return {'states': len(codes), 'districts': districts, 'complexes': complexes}
+
+
+job_queue = jobqueue.JobQueue()
+job_queue.register('watch_refresh', _job_watch_refresh, concurrency=1, rate_per_minute=watchlist.RATE_PER_MINUTE)
+job_queue.register('case_lookup', _job_case_lookup, concurrency=2, rate_per_minute=30)
+job_queue.register('pdf_prefetch', _job_pdf_prefetch, concurrency=2, rate_per_minute=60)
+job_queue.register('catalog_crawl', _job_catalog_crawl, concurrency=1, rate_per_minute=2,
+                   max_attempts=3, lease_seconds=1800)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    scraper.warm_session()
+    # Only local work happens before serving; network warm-up runs in the background
+    # and is reported by /api/ready.
+    readiness.run_now('database', setup_database)
+    readiness.add('upstream_session', lanes.in_background(scraper.warm_session), retry=True,
+                  required=os.getenv('READY_REQUIRE_UPSTREAM', '1') != '0')
+    readiness.add('parse_pool', parsing.warm, required=False)
+    readiness.start()
+    if os.getenv('WATCHLIST_ENABLED', '1') != '0':
+        watch_scheduler.start()
+    if os.getenv('WARM_ENABLED', '1') != '0':
+        cache_warmer.start()
+    if os.getenv('ORDER_TEXT_ENABLED', '1') != '0':
+        order_extractor.start()
+    if os.getenv('JOBS_ENABLED', '1') != '0':
+        job_queue.start()
+    if session_store.enabled():
+        worker_metrics.start()
     yield
+    if session_store.enabled():
+        worker_metrics.stop()
+    job_queue.stop()
+    readiness.stop()
+    watch_scheduler.stop()
+    cache_warmer.stop()
+    order_extractor.stop()
+    parsing.shutdown()
+    pdf_strategy.shutdown()
 
-app = FastAPI(title="eCourts Scraper API - Optimized", version="1.0.0", lifespan=lifespan)
+app = FastAPI(
+    title="eCourts Scraper API - Optimized",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
 
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    # echo the caller's origin: credentialed requests (the client cookie) may not use '*'
+    allow_origin_regex=".*",
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
 
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    """Trace each request and expose its span waterfall as a Server-Timing header.
+
+    Streaming responses (no Content-Length: SSE, ZIPs, exports) do their work while the
+    body is sent, after the headers; they get no header and are exported once the body ends.
+    """
+    trace = tracing.start_trace(f"{request.method} {request.url.path}")
+    trace.root.attributes.update({'http.method': request.method, 'http.route': request.url.path})
+    response = await call_next(request)
+    trace.root.attributes['http.status_code'] = response.status_code
+    if 'content-length' not in response.headers:
+        response.body_iterator = _export_after_body(response.body_iterator, trace)
+        return response
+    trace.finish()
+    response.headers['Server-Timing'] = tracing.server_timing_header(trace)
+    response.headers['Timing-Allow-Origin'] = '*'
+    tracing.export(trace)
+    return response
+
+
+async def _export_after_body(body, trace: tracing.Trace):
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        trace.finish()
+        tracing.export(trace)
+
+
+@app.middleware("http")
+async def shared_session_state(request: Request, call_next):
+    """Adopt/publish the shared upstream session around each API call (multi-worker only).
+
+    Publishing happens before the response is returned, so a client that fetched a
+    CAPTCHA from one worker can submit it to any other. The SQLite reads and writes
+    run on the threadpool; pushes are skipped when nothing changed (see SharedMirror).
+    """
+    if not (session_store.enabled() and request.url.path.startswith('/api/')):
+        return await call_next(request)
+    client = current_client.get()
+    # a session this worker has not seen (or has evicted) adopts the published one
+    mirror = scraper_states.get(client, reset=not scraper.has_session(client))
+    await run_in_threadpool(_pull_shared_state, mirror)
+    response = await call_next(request)
+    await run_in_threadpool(_push_shared_state, mirror)
+    return response
+
+
+def _pull_shared_state(mirror: session_store.SharedMirror):
+    mirror.pull()
+    name_cache_state.pull()
+    sync_cache_invalidations()
+
+
+def _push_shared_state(mirror: session_store.SharedMirror):
+    mirror.push()
+    name_cache_state.push()
+    scraper_states.prune()
+
+
+CLIENT_COOKIE = 'ecourts_client'
+CLIENT_ID_RE = re.compile(r'[0-9a-f]{32}')
+# a CAPTCHA is where a client's own upstream session starts
+CLIENT_ISSUING_PATHS = ('/api/captcha-url', '/api/captcha-image')
+
+
+@app.middleware("http")
+async def client_session(request: Request, call_next):
+    """Bind the request to its client's upstream session (``ecourts_client`` cookie).
+
+    The CAPTCHA endpoints issue the cookie, so the CAPTCHA image and the submit that
+    answers it use the same upstream cookies however many users are active. Requests
+    without the cookie use the default session. Registered last, so it runs first.
+    """
+    client = request.cookies.get(CLIENT_COOKIE, '')
+    if not CLIENT_ID_RE.fullmatch(client):
+        client = ''
+    issue = not client and request.url.path in CLIENT_ISSUING_PATHS
+    if issue:
+        client = uuid.uuid4().hex
+    token = current_client.set(client)
+    try:
+        response = await call_next(request)
+    finally:
+        current_client.reset(token)
+    if issue:
+        response.set_cookie(CLIENT_COOKIE, client, max_age=int(CLIENT_SESSION_IDLE_SECONDS),
+                            httponly=True, samesite='lax')
+    return response
+
+
  
 
 @app.get("/")
@@ -110,7 +413,7 @@ async def root():
 async def get_states():
     """Get list of available states with performance monitoring"""
     try:
-        states, app_token = scraper.get_states()
+        states, app_token = await run_in_threadpool(scraper.get_states)
         return StateResponse(states=states, app_token=app_token)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching states: {str(e)}")
@@ -119,7 +422,7 @@ async def get_states():
 async def get_districts(request: StateRequest):
     """Get districts for a state with performance monitoring"""
     try:
-        districts, app_token = scraper.get_districts(request.state_code)
+        districts, app_token = await run_in_threadpool(scraper.get_districts, request.state_code)
         return DistrictResponse(districts=districts, app_token=app_token)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching districts: {str(e)}")
@@ -128,11 +431,74 @@ async def get_districts(request: StateRequest):
 async def get_court_complexes(request: DistrictRequest):
     """Get court complexes for a district with performance monitoring"""
     try:
-        complexes, app_token = scraper.get_court_complexes(request.state_code, request.dist_code)
+        complexes, app_token = await run_in_threadpool(scraper.get_court_complexes, request.state_code, request.dist_code)
         return CourtComplexResponse(complexes=complexes, app_token=app_token)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching court complexes: {str(e)}")
 
+@app.post("/api/cascade", response_model=CascadeResponse)
+async def get_cascade(request: CascadeRequest):
+    """Every dropdown list needed to render the form for a (partial) selection, in one call.
+
+    Levels whose parents are already selected are fetched upstream concurrently.
+    With ``expand_first`` an unselected district/complex defaults to the first
+    option so its children can be returned too.
+    """
+    state, dist, cplx = request.state_code, request.dist_code, request.court_complex_code
+    result = {'states': None, 'districts': [], 'complexes': [], 'case_types': []}
+
+    def fetch_states():
+        return scraper.get_states()
+
+    def fetch_districts():
+        return scraper.get_districts(state)
+
+    def fetch_complexes():
+        return scraper.get_court_complexes(state, dist)
+
+    def fetch_case_types():
+        return scraper.get_case_types(state_code=state, dist_code=dist, court_complex_code=cplx,
+                                      est_code=request.est_code or "", search_type=request.search_type or "c_no")
+
+    tasks = {}
+    if request.include_states or not state:
+        tasks['states'] = fetch_states
+    if state:
+        tasks['districts'] = fetch_districts
+    if state and dist:
+        tasks['complexes'] = fetch_complexes
+    if state and dist and cplx:
+        tasks['case_types'] = fetch_case_types
+    try:
+        with tracing.span('cascade_fetch'):
+            done = await asyncio.gather(*(run_in_threadpool(fn) for fn in tasks.values()))
+        for key, (options, _) in zip(tasks, done):
+            result[key] = options
+        # Levels below an unselected parent depend on its first option, so they follow sequentially.
+        if request.expand_first and state and not dist and result['districts']:
+            dist = result['districts'][0]['value']
+            result['complexes'], _ = await run_in_threadpool(fetch_complexes)
+        if request.expand_first and state and dist and not cplx and result['complexes']:
+            cplx = result['complexes'][0]['value']
+            result['case_types'], _ = await run_in_threadpool(fetch_case_types)
+    except Exception as e:
+        logger.warning(f"cascade error: {e}")
+        raise HTTPException(status_code=500, detail=f"Error fetching dropdown cascade: {str(e)}")
+    return CascadeResponse(state_code=state, dist_code=dist, court_complex_code=cplx,
+                           app_token=scraper.app_token or "", **result)
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus scrape endpoint (upstream latency, caches, parsers, PDF fallbacks).
+
+    With several workers the samples of all of them are summed, whichever one serves the scrape.
+    """
+    if session_store.enabled():
+        body = await run_in_threadpool(lambda: metrics.render(metrics.merge(worker_metrics.gather())))
+    else:
+        body = metrics.render()
+    return Response(content=body, media_type=metrics.CONTENT_TYPE)
+
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint"""
@@ -140,14 +506,34 @@ async def health_check():
         "status": "healthy",
         "session_initialized": scraper._session_initialized,
         "app_token_available": bool(scraper.app_token),
+        "ready": readiness.ready,
+        "cache_warm": cache_warmer.last_run,
+        "order_text": order_extractor.stats(),
+        "upstream_gate": lanes.gate.stats(),
         "timestamp": datetime.now().isoformat()
     }
 
+@app.get("/api/live")
+async def liveness():
+    """Liveness probe: the process is up and serving (no upstream or database access)."""
+    return {"status": "alive", "uptime_seconds": readiness.snapshot()['uptime_seconds']}
+
+@app.get("/api/ready")
+async def readiness_check():
+    """Readiness probe: 200 once every required startup step is done, else 503.
+
+    The body lists each step (database, parse_pool, upstream_session) with its
+    status, attempts, duration and last error, so warm-up progress is visible.
+    """
+    snap = readiness.snapshot()
+    return FastJSONResponse(content=snap, status_code=200 if snap['ready'] else 503)
+
 @app.post("/api/get-case-types", response_model=CaseTypeResponse)
 async def get_case_types(request: CaseTypeRequest):
     """Get case types for the selected state/district/court complex."""
     try:
-        case_types, app_token = scraper.get_case_types(
+        case_types, app_token = await run_in_threadpool(
+            scraper.get_case_types,
             state_code=request.state_code,
             dist_code=request.dist_code,
             court_complex_code=request.court_complex_code,
@@ -169,9 +555,7 @@ async def get_captcha_url():
 async def get_captcha_image(rand: str = ""):
     """Proxy the CAPTCHA image through the backend to retain session cookies."""
     try:
-        
-        url = scraper.get_captcha_image_url()
-        img_resp = scraper.session.get(url, timeout=15)
+        img_resp = await run_in_threadpool(scraper.fetch_captcha_image)
         if img_resp.status_code != 200:
             raise HTTPException(status_code=502, detail=f"Upstream CAPTCHA HTTP {img_resp.status_code}")
         content_type = img_resp.headers.get('Content-Type', 'image/png')
@@ -181,11 +565,57 @@ async def get_captcha_image(rand: str = ""):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching CAPTCHA: {e}")
 
+def _submit_case_body(result_dict: dict, app_token: str) -> bytes:
+    # Serialize once: the same bytes are the HTTP body and the log payload.
+    with tracing.span('serialize'):
+        return dumps({
+            'success': bool(result_dict.get('success')),
+            'message': result_dict.get('message', ''),
+            'case_status_data': result_dict.get('case_status_data'),
+            'raw_html': result_dict.get('raw_html'),
+            'captcha_html': result_dict.get('captcha_html'),
+            'app_token': app_token or scraper.app_token
+        })
+
+def _record_submit_case(db: Session, request: CaseSubmissionRequest, result_dict: dict, body: bytes):
+    """Query log entry plus case ingest for a submit-case result."""
+    try:
+        status = 'Success' if result_dict.get('success') else 'Failed'
+        case_number_log = (result_dict.get('case_status_data') or {}).get('case_number') or f"{request.case_type} {request.case_no}/{request.rgyear}" 
+        with tracing.span('resolve_names'):
+            state_name = get_state_name(request.state_code)
+            district_name = get_district_name(request.state_code, request.dist_code)
+        log_entry = QueryLog(
+            state=state_name,
+            district=district_name,
+            case_number=case_number_log,
+            status=status,
+            raw_json_response=body.decode('utf-8')[:65000]
+        )
+        with tracing.span('db_commit'):
+            db.add(log_entry)
+            db.commit()
+    except Exception as e:
+        logger.warning(f"query log persist failed: {e}")
+
+    try:
+        if result_dict.get('case_details'):
+            vh = result_dict.get('view_history') or {}
+            ingest_case_details(db, result_dict['case_details'], {
+                'cino': vh.get('cino'), 'court_code': vh.get('court_code'), 'case_no': vh.get('case_no'),
+                'state_code': request.state_code, 'dist_code': request.dist_code,
+                'court_complex_code': request.court_complex_code,
+            })
+            db.commit()
+    except Exception as e:
+        logger.warning(f"case ingest failed: {e}")
+
 @app.post("/api/submit-case", response_model=CaseSubmissionResponse)
 async def submit_case(request: CaseSubmissionRequest, db: Session = Depends(get_db)):
     """Submit case details (with CAPTCHA) and return structured case status/details."""
     try:
-        result_dict, app_token = scraper.submit_case_status(
+        result_dict, app_token = await run_in_threadpool(
+            scraper.submit_case_status,
             state_code=request.state_code,
             dist_code=request.dist_code,
             court_complex_code=request.court_complex_code,
@@ -195,44 +625,85 @@ async def submit_case(request: CaseSubmissionRequest, db: Session = Depends(get_
             captcha_code=request.captcha_code,
             est_code=request.est_code or "null"
         )
-
-        
-        try:
-            status = 'Success' if result_dict.get('success') else 'Failed'
-            case_number_log = result_dict.get('case_status_data', {}).get('case_number') or f"{request.case_type} {request.case_no}/{request.rgyear}" 
-            state_name = get_state_name(request.state_code)
-            district_name = get_district_name(request.state_code, request.dist_code)
-            log_entry = QueryLog(
-                state=state_name,
-                district=district_name,
-                case_number=case_number_log,
-                status=status,
-                raw_json_response=json.dumps(result_dict)[:65000]
-            )
-            db.add(log_entry)
-            db.commit()
-        except Exception as e:
-            logger.warning(f"query log persist failed: {e}")
-
-        return CaseSubmissionResponse(
-            success=bool(result_dict.get('success')),
-            message=result_dict.get('message', ''),
-            case_status_data=result_dict.get('case_status_data'),
-            raw_html=result_dict.get('raw_html'),
-            captcha_html=result_dict.get('captcha_html'),
-            app_token=app_token or scraper.app_token
-        )
+        # Returning a Response skips response_model re-validation of the large case dict.
+        body = _submit_case_body(result_dict, app_token)
+        # name lookups may hit the network and the commits block: keep them off the event loop
+        await run_in_threadpool(_record_submit_case, db, request, result_dict, body)
+        return FastJSONResponse(content=body)
     except HTTPException:
         raise
     except Exception as e:
         logger.warning(f"submit_case error: {e}")
         raise HTTPException(status_code=500, detail="Error submitting case")
 
+def _sse(event: str, data) -> bytes:
+    payload = data if isinstance(data, bytes) else dumps(data)
+    return b'event: ' + event.encode() + b'\ndata: ' + payload + b'\n\n'
+
+@app.post("/api/submit-case/stream")
+async def submit_case_stream(request: CaseSubmissionRequest):
+    """submit-case as Server-Sent Events, so results show while the lookup continues.
+
+    ``listing`` (case found, parties, court) is sent as soon as the submitCaseNo listing
+    is parsed; ``details``, ``history`` and ``orders`` follow once viewHistory is parsed.
+    The last event is ``result``, whose data is the /api/submit-case body (or ``error``).
+    """
+    def record(result_dict: dict, body: bytes):
+        db = SessionLocal()
+        try:
+            _record_submit_case(db, request, result_dict, body)
+        finally:
+            db.close()
+        # the middleware published the session before this body ran; publish the new token
+        if session_store.enabled():
+            scraper_states.get(current_client.get()).push()
+
+    async def events():
+        try:
+            async for event, data in iterate_in_threadpool(scraper.iter_case_status(
+                state_code=request.state_code,
+                dist_code=request.dist_code,
+                court_complex_code=request.court_complex_code,
+                case_type=request.case_type,
+                case_no=request.case_no,
+                rgyear=request.rgyear,
+                captcha_code=request.captcha_code,
+                est_code=request.est_code or "null"
+            )):
+                if event != 'result':
+                    yield _sse(event, data)
+                    continue
+                result_dict, app_token = data
+                body = _submit_case_body(result_dict, app_token)
+                await run_in_threadpool(record, result_dict, body)
+                yield _sse('result', body)
+        except Exception as e:
+            logger.warning(f"submit_case_stream error: {e}")
+            yield _sse('error', {'success': False, 'message': 'Error submitting case'})
+
+    return StreamingResponse(
+        events(),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+def _record_case_details(db: Session, request: CaseDetailsRequest, details_dict: dict):
+    """Case ingest for a get-case-details result."""
+    try:
+        ingest_case_details(db, details_dict.get('case_details'), {
+            'cino': request.cino, 'court_code': request.court_code, 'state_code': request.state_code,
+            'dist_code': request.dist_code, 'court_complex_code': request.court_complex_code,
+        })
+        db.commit()
+    except Exception as e:
+        logger.warning(f"case ingest failed: {e}")
+
 @app.post("/api/get-case-details", response_model=CaseDetailsResponse)
-async def get_case_details(request: CaseDetailsRequest):
+async def get_case_details(request: CaseDetailsRequest, db: Session = Depends(get_db)):
     """Get detailed case info (invokes viewHistory equivalent)."""
     try:
-        details_dict, app_token = scraper.get_case_details(
+        details_dict, app_token = await run_in_threadpool(
+            scraper.get_case_details,
             court_code=request.court_code,
             state_code=request.state_code,
             dist_code=request.dist_code,
@@ -242,13 +713,15 @@ async def get_case_details(request: CaseDetailsRequest):
             search_flag=request.search_flag or 'CScaseNumber',
             search_by=request.search_by or 'CScaseNumber'
         )
-        return CaseDetailsResponse(
-            success=bool(details_dict.get('success')),
-            message=details_dict.get('message', ''),
-            case_details=details_dict.get('case_details'),
-            raw_html=details_dict.get('raw_html'),
-            app_token=app_token or scraper.app_token
-        )
+        if details_dict.get('success'):
+            await run_in_threadpool(_record_case_details, db, request, details_dict)
+        return FastJSONResponse(content={
+            'success': bool(details_dict.get('success')),
+            'message': details_dict.get('message', ''),
+            'case_details': details_dict.get('case_details'),
+            'raw_html': details_dict.get('raw_html'),
+            'app_token': app_token or scraper.app_token
+        })
     except Exception as e:
         logger.warning(f"get_case_details error: {e}")
         raise HTTPException(status_code=500, detail="Error fetching case details")
@@ -259,10 +732,12 @@ async def get_order_pdf(req: OrderPdfRequest):
     Returns PDF bytes streamed to client. Frontend can either trigger a download or open a new tab.
     """
     try:
-        pdf_bytes, filename, _ = scraper.fetch_order_pdf(req.pdf_request)
+        pdf_bytes, filename, _ = await run_in_threadpool(
+            scraper.fetch_order_pdf, req.pdf_request, req.state_code or '', req.dist_code or '', req.cino or '')
         if not pdf_bytes:
             snippet = (req.pdf_request[:120] + '...') if len(req.pdf_request) > 120 else req.pdf_request
             raise HTTPException(status_code=404, detail=f"PDF not available for request fragment: {snippet}")
+        order_extractor.submit(pdf_bytes, req.pdf_request)
         safe_filename = filename or 'order.pdf'
         return Response(
             content=pdf_bytes,
@@ -277,13 +752,226 @@ async def get_order_pdf(req: OrderPdfRequest):
         logger.warning(f"get_order_pdf error: {e}")
         raise HTTPException(status_code=500, detail="Error fetching PDF")
 
+def _orders_zip_response(orders: List[dict], label: str) -> StreamingResponse:
+    if not orders:
+        raise HTTPException(status_code=404, detail="No interim orders to download")
+    if len(orders) > order_zip.MAX_ORDERS:
+        raise HTTPException(status_code=400, detail=f"At most {order_zip.MAX_ORDERS} orders per archive")
+    fetch = partial(scraper.fetch_order_pdf, cino=label)  # label is the CNR when known
+    chunks = order_zip.stream_orders_zip(fetch, orders, label, on_pdf=order_extractor.submit)
+    filename = f"{order_zip.safe_name(label) or 'case'}_orders.zip"
+    return StreamingResponse(
+        chunks,
+        media_type='application/zip',
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+    )
+
+def _stored_orders(db: Session, cnr: str) -> List[dict]:
+    rows = db.query(CaseOrder).filter(CaseOrder.cnr == cnr).order_by(CaseOrder.id).all()
+    return [{'order_number': r.order_number, 'order_date': r.order_date, 'display_pdf_arg': r.display_pdf_arg}
+            for r in rows]
+
+@app.post("/api/orders/zip")
+async def download_orders_zip(req: OrdersZipRequest, db: Session = Depends(get_db)):
+    """Stream a ZIP of a case's interim order PDFs as they are fetched.
+
+    Takes either the ``interim_orders`` list from case details or the ``cnr`` of a
+    stored case. PDFs are fetched concurrently within the shared upstream budget;
+    ``manifest.json`` in the archive lists failed orders.
+    """
+    orders = req.interim_orders if req.interim_orders is not None else (
+        _stored_orders(db, req.cnr) if req.cnr else None)
+    if orders is None:
+        raise HTTPException(status_code=400, detail="Provide cnr or interim_orders")
+    return _orders_zip_response(orders, req.cnr or '')
+
+@app.get("/api/cases/{cnr}/orders.zip")
+async def download_case_orders_zip(cnr: str, db: Session = Depends(get_db)):
+    """ZIP of all stored interim orders of a case (link-friendly form of /api/orders/zip)."""
+    return _orders_zip_response(_stored_orders(db, cnr), cnr)
+
+def _enqueue(db: Session, req: JobRequest) -> dict:
+    try:
+        job, created = job_queue.enqueue(db, req.type, req.payload, dedup_key=req.dedup_key, priority=req.priority,
+                                         delay_seconds=req.delay_seconds, max_attempts=req.max_attempts)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {**jobqueue.job_dict(job), 'created': created}
+
+@app.post("/api/jobs", response_model=JobResponse)
+async def enqueue_job(req: JobRequest, db: Session = Depends(get_db)):
+    """Queue a background job. With ``dedup_key``, an active job of the same type and key is returned instead."""
+    return _enqueue(db, req)
+
+@app.post("/api/jobs/bulk", response_model=List[JobResponse])
+async def enqueue_jobs(req: JobBulkRequest, db: Session = Depends(get_db)):
+    unknown = sorted({j.type for j in req.jobs} - set(job_queue.types))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"unknown job type: {', '.join(unknown)}")
+    return [_enqueue(db, j) for j in req.jobs]
+
+@app.get("/api/jobs", response_model=List[JobResponse])
+async def list_jobs(type: Optional[str] = None, status: Optional[str] = None, limit: int = 50, offset: int = 0,
+                    db: Session = Depends(get_db)):
+    """Jobs, newest first, optionally filtered by type and status."""
+    limit = max(1, min(limit, 500))
+    return [jobqueue.job_dict(j) for j in job_queue.list(db, type, status, limit, max(0, offset))]
+
+@app.get("/api/jobs/stats")
+async def job_stats(db: Session = Depends(get_db)):
+    """Job counts by type and status, with each type's limits."""
+    return job_queue.stats(db)
+
+@app.get("/api/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: int, db: Session = Depends(get_db)):
+    job = db.get(Job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return jobqueue.job_dict(job)
+
+@app.delete("/api/jobs/{job_id}")
+async def cancel_job(job_id: int, db: Session = Depends(get_db)):
+    """Cancel a queued or running job."""
+    if not job_queue.cancel(db, job_id):
+        raise HTTPException(status_code=404, detail="No queued or running job with that id")
+    return {"success": True}
+
+@app.post("/api/jobs/{job_id}/retry", response_model=JobResponse)
+async def retry_job(job_id: int, db: Session = Depends(get_db)):
+    """Queue a failed or cancelled job again."""
+    try:
+        ok = job_queue.retry(db, job_id)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="An active job with the same dedup key exists")
+    if not ok:
+        raise HTTPException(status_code=404, detail="No failed or cancelled job with that id")
+    return jobqueue.job_dict(db.get(Job, job_id))
+
+# Clients cache dropdown options (states/districts/complexes/case types) keyed by
+# this version. CATALOG_SCHEMA changes when option payloads change shape; the
+# generation is the version of the shared 'catalog_version' row, bumped by every
+# cache invalidation so clients and all workers notice it.
+CATALOG_SCHEMA = 1
+CACHE_EVENT_HISTORY = 50
+NAME_CACHE_LEVEL = 'names'
+catalog_seen = {'version': -1}
+
+def catalog_version() -> str:
+    # only the version number is needed; a huge newer_than skips loading the blob
+    generation, _ = session_store.read('catalog_version', newer_than=1 << 62)
+    return f"{CATALOG_SCHEMA}.{max(generation, 0)}"
+
+def apply_cache_invalidation(level: str, key: tuple) -> int:
+    """Invalidate this worker's caches; ``level`` 'all' clears everything."""
+    removed = 0
+    if level in ('all', NAME_CACHE_LEVEL):
+        if key:
+            state_code = key[0]
+            if len(key) == 1:
+                removed += state_name_cache.pop(state_code, None) is not None
+            for k in [k for k in district_name_cache if k[:len(key)] == tuple(key)]:
+                del district_name_cache[k]
+                removed += 1
+        else:
+            removed += len(state_name_cache) + len(district_name_cache)
+            state_name_cache.clear()
+            district_name_cache.clear()
+    if level == 'all':
+        for name in scraper.caches:
+            removed += scraper.invalidate_cache(name, key)
+    elif level != NAME_CACHE_LEVEL:
+        removed += scraper.invalidate_cache(level, key)
+    return removed
+
+def publish_cache_invalidation(level: str, key: tuple):
+    """Record an invalidation in shared_state (bumps the catalog version for clients and workers)."""
+    try:
+        version, data = session_store.read('catalog_version')
+        events = ((data or {}).get('events') or [])[-(CACHE_EVENT_HISTORY - 1):]
+        events.append({'seq': max(version, 0) + 1, 'level': level, 'key': list(key),
+                       'at': datetime.now(timezone.utc).isoformat()})
+        catalog_seen['version'] = session_store.write('catalog_version', {'events': events})
+    except Exception as e:
+        logger.warning(f"cache invalidation publish failed: {e}")
+
+def sync_cache_invalidations():
+    """Replay invalidations published by other workers since the last sync."""
+    try:
+        seen = catalog_seen['version']
+        version, data = session_store.read('catalog_version', newer_than=seen)
+        if seen < 0:
+            catalog_seen['version'] = version  # first sync: nothing to replay
+            return
+        if data is None:
+            return
+        events = [e for e in data.get('events') or [] if e.get('seq', 0) > seen]
+        if not events or events[0]['seq'] > seen + 1:
+            apply_cache_invalidation('all', ())  # history rolled past us; start clean
+        else:
+            for e in events:
+                apply_cache_invalidation(e['level'], tuple(e.get('key') or ()))
+        catalog_seen['version'] = version
+    except Exception as e:
+        logger.warning(f"cache invalidation sync failed: {e}")
+
+@app.get("/api/catalog-version")
+async def get_catalog_version():
+    """Version tag for client-side dropdown caches; changes when server caches are invalidated."""
+    try:
+        return {"version": await run_in_threadpool(catalog_version)}
+    except Exception as e:
+        logger.warning(f"catalog version error: {e}")
+        raise HTTPException(status_code=500, detail="Error reading catalog version")
+
+@app.get("/api/cache")
+async def list_caches(keys: bool = False):
+    """Cache levels with size, hit/miss counts and hit rate (``keys=true`` lists cached keys)."""
+    caches = []
+    for name, cache in scraper.caches.items():
+        st = cache.stats()
+        lookups = st['hits'] + st['misses']
+        entry = {'name': name, **st, 'hit_rate': round(st['hits'] / lookups, 4) if lookups else None,
+                 'ttl_seconds': cache.ttl, 'maxsize': cache.maxsize}
+        if keys:
+            entry['keys'] = [list(k) for k in cache.keys()]
+        caches.append(entry)
+    caches.append({'name': NAME_CACHE_LEVEL, 'size': len(state_name_cache) + len(district_name_cache),
+                   'state_names': len(state_name_cache), 'district_names': len(district_name_cache)})
+    return {'caches': caches, 'catalog_version': await run_in_threadpool(catalog_version)}
+
+def _publish_invalidation_version(level: str, key: tuple) -> str:
+    publish_cache_invalidation(level, key)
+    return catalog_version()
+
+@app.delete("/api/cache/{level}")
+async def invalidate_cache(level: str, state_code: Optional[str] = None, dist_code: Optional[str] = None,
+                           court_complex_code: Optional[str] = None):
+    """Invalidate one cache level (or 'all'), optionally only under a key prefix.
+
+    The prefix follows the cascade: e.g. ``DELETE /api/cache/complexes?state_code=3&dist_code=1``
+    drops one district's complexes. Sessions, cookies and tokens are untouched.
+    """
+    if level not in scraper.caches and level not in ('all', NAME_CACHE_LEVEL):
+        raise HTTPException(status_code=404, detail=f"Unknown cache level: {level}")
+    key = []
+    for part in (state_code, dist_code, court_complex_code):
+        if not part:
+            break
+        key.append(part)
+    key = tuple(key)
+    removed = apply_cache_invalidation(level, key)
+    version = await run_in_threadpool(_publish_invalidation_version, level, key)
+    return {"success": True, "level": level, "key": list(key), "removed": removed,
+            "catalog_version": version}
+
 @app.post("/api/clear-cache")
 async def clear_cache():
-    """Clear any internal cached data (case types etc.)."""
+    """Clear all cached dropdown data and name caches; the upstream session is kept."""
     try:
-        global scraper
-        scraper = ECourtScraper()
-        return {"success": True, "message": "Caches cleared and session reset"}
+        apply_cache_invalidation('all', ())
+        await run_in_threadpool(publish_cache_invalidation, 'all', ())
+        return {"success": True, "message": "Caches cleared"}
     except Exception as e:
         logger.warning(f"clear_cache error: {e}")
         return {"success": False, "message": "Failed to clear cache"}
@@ -291,20 +979,206 @@ async def clear_cache():
 @app.post("/api/warm-session")
 async def warm_session():
     """Explicitly warm the scraper session (refresh tokens/cookies)."""
-    ok = scraper.warm_session()
+    ok = await run_in_threadpool(scraper.warm_session)
     return {"success": ok, "app_token": scraper.app_token}
 
+@app.post("/api/watchlist", response_model=WatchedCaseResponse)
+async def add_watched_case(request: WatchCaseRequest, db: Session = Depends(get_db)):
+    """Track a case by CNR; it is refreshed in the background via viewHistory."""
+    case = db.query(WatchedCase).filter(WatchedCase.cino == request.cino).first()
+    if case is None:
+        case = WatchedCase(cino=request.cino)
+        db.add(case)
+    case.court_code = request.court_code
+    case.state_code = request.state_code
+    case.dist_code = request.dist_code
+    case.court_complex_code = request.court_complex_code
+    case.case_no = request.case_no
+    case.label = request.label
+    case.interval_minutes = request.interval_minutes
+    if case.next_refresh_at is None:
+        case.next_refresh_at = watchlist.initial_refresh_at(case)
+    db.commit()
+    db.refresh(case)
+    return case
+
+@app.get("/api/watchlist", response_model=List[WatchedCaseResponse])
+async def list_watched_cases(db: Session = Depends(get_db)):
+    """Tracked cases, soonest next hearing first."""
+    return (
+        db.query(WatchedCase)
+        .order_by(WatchedCase.next_date_iso.is_(None), WatchedCase.next_date_iso, WatchedCase.id)
+        .all()
+    )
+
+@app.delete("/api/watchlist/{case_id}")
+async def remove_watched_case(case_id: int, db: Session = Depends(get_db)):
+    deleted = db.query(WatchedCase).filter(WatchedCase.id == case_id).delete()
+    db.commit()
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Watched case not found")
+    return {"success": True}
+
+@app.post("/api/watchlist/{case_id}/refresh", response_model=WatchedCaseResponse)
+async def refresh_watched_case_now(case_id: int, db: Session = Depends(get_db)):
+    """Refresh one tracked case immediately (outside the schedule)."""
+    case = db.get(WatchedCase, case_id)
+    if case is None:
+        raise HTTPException(status_code=404, detail="Watched case not found")
+    # upstream HTTP and SQLite work: keep it off the event loop
+    return await run_in_threadpool(watch_scheduler.refresh_case, db, case)
+
+@app.get("/api/case-changes", response_model=CaseChangesResponse)
+async def get_case_changes(
+    since: Optional[datetime] = None,
+    cnr: Optional[List[str]] = Query(None),
+    limit: int = 500,
+    db: Session = Depends(get_db)
+):
+    """Deltas detected after ``since`` (UTC) for one or many CNRs (repeat ``cnr=``).
+
+    Poll with the returned ``next_since`` to receive only newer changes.
+    """
+    limit = max(1, min(limit, 5000))
+    rows = snapshots.changes_since(db, since, cnr, limit)
+    return FastJSONResponse(content={
+        'changes': [
+            {'id': r.id, 'cnr': r.cnr, 'detected_at': r.detected_at.isoformat(), 'kind': r.kind, 'delta': json.loads(r.delta)}
+            for r in rows
+        ],
+        'next_since': rows[-1].detected_at.isoformat() if rows else (since.isoformat() if since else None)
+    })
+
+@app.get("/api/search", response_model=SearchResponse)
+async def search_cases(q: str, field: Optional[str] = None, limit: int = 20, offset: int = 0,
+                       db: Session = Depends(get_db)):
+    """Full-text search over scraped cases (parties, advocates, acts, judge, court, stage, orders).
+
+    ``field`` narrows the match: party, petitioner, respondent, advocate, act, judge,
+    court, stage, order or case. Results are bm25-ranked and paginated.
+    """
+    limit = max(1, min(limit, 100))
+    offset = max(0, offset)
+    try:
+        total, hits = search_index.search(db, q, field, limit, offset)
+    except Exception as e:
+        logger.warning(f"search error: {e}")
+        raise HTTPException(status_code=500, detail="Error searching cases")
+    return FastJSONResponse(content={'query': q, 'total': total, 'limit': limit, 'offset': offset, 'results': hits})
+
+@app.get("/api/orders/search", response_model=OrderSearchResponse)
+async def search_orders(q: str, cnr: Optional[str] = None, limit: int = 20, offset: int = 0,
+                        db: Session = Depends(get_db)):
+    """Full-text search inside fetched interim order PDFs, optionally within one case.
+
+    Orders are indexed in the background after they are first fetched via
+    /api/get-order-pdf; results are bm25-ranked with a highlighted snippet.
+    """
+    limit = max(1, min(limit, 100))
+    offset = max(0, offset)
+    try:
+        total, hits = order_text.search(db, q, cnr, limit, offset)
+    except Exception as e:
+        logger.warning(f"order search error: {e}")
+        raise HTTPException(status_code=500, detail="Error searching orders")
+    return FastJSONResponse(content={'query': q, 'total': total, 'limit': limit, 'offset': offset, 'results': hits})
+
+@app.get("/api/orders/{order_text_id}/text", response_model=OrderTextResponse)
+async def get_order_text(order_text_id: int, db: Session = Depends(get_db)):
+    """Extracted text of one indexed order (id from /api/orders/search)."""
+    row = db.query(OrderText).filter(OrderText.id == order_text_id).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Order text not found")
+    return OrderTextResponse(
+        id=row.id, cnr=row.cnr, order_number=row.order_number, order_date=row.order_date,
+        order_date_iso=row.order_date_iso, pages=row.pages, status=row.status,
+        text=order_text.read_text(row), extracted_at=row.extracted_at)
+
+@app.get("/api/hearings", response_model=List[HearingListing])
+async def get_hearings(court_complex_code: str, date: str, db: Session = Depends(get_db)):
+    """All known hearings in a court complex on a date (dd-mm-yyyy or yyyy-mm-dd).
+
+    Served from stored case data: case_history rows for that day plus cases whose
+    next date falls on it.
+    """
+    day = parse_case_date(date)
+    if day is None:
+        raise HTTPException(status_code=400, detail="Invalid date")
+    try:
+        return FastJSONResponse(content=case_store.hearings_on(db, court_complex_code, day))
+    except Exception as e:
+        logger.warning(f"hearings query error: {e}")
+        raise HTTPException(status_code=500, detail="Error fetching hearings")
+
+@app.get("/api/cases/upcoming", response_model=List[CaseSummaryResponse])
+async def get_upcoming_cases(days: int = 7, court_complex_code: Optional[str] = None,
+                             db: Session = Depends(get_db)):
+    """Stored cases whose next date is within the next ``days`` days (default: this week)."""
+    days = max(0, min(days, 366))
+    try:
+        return case_store.upcoming_cases(db, days, court_complex_code)
+    except Exception as e:
+        logger.warning(f"upcoming cases error: {e}")
+        raise HTTPException(status_code=500, detail="Error fetching upcoming cases")
+
 @app.get("/api/query-logs", response_model=List[QueryLogResponse])
-async def get_query_logs(limit: int = 50, db: Session = Depends(get_db)):
-    """Return recent query logs (default limit=50)."""
+async def get_query_logs(limit: int = 50, state: Optional[str] = None, district: Optional[str] = None,
+                         status: Optional[str] = None, case_number: Optional[str] = None,
+                         since: Optional[datetime] = None, until: Optional[datetime] = None,
+                         db: Session = Depends(get_db)):
+    """Return recent query logs (default limit=50), optionally filtered."""
     try:
         limit = max(1, min(limit, 500))
-        logs = db.query(QueryLog).order_by(QueryLog.timestamp.desc()).limit(limit).all()
+        query = export.filter_query_logs(db.query(QueryLog), state, district, status, case_number, since, until)
+        logs = query.order_by(QueryLog.timestamp.desc()).limit(limit).all()
         return logs
     except Exception as e:
         logger.warning(f"query logs error: {e}")
         raise HTTPException(status_code=500, detail="Error fetching query logs")
 
+def _export_response(chunks, name: str, fmt: str, gzip: bool) -> StreamingResponse:
+    filename = f"{name}.{fmt}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        chunks,
+        media_type='application/gzip' if gzip else export.FORMATS[fmt],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+    )
+
+@app.get("/api/export/query-logs")
+async def export_query_logs(format: str = 'csv', gzip: bool = False, include_raw: bool = False,
+                            state: Optional[str] = None, district: Optional[str] = None,
+                            status: Optional[str] = None, case_number: Optional[str] = None,
+                            since: Optional[datetime] = None, until: Optional[datetime] = None):
+    """Stream all matching query logs (oldest first) as CSV or NDJSON, optionally gzipped.
+
+    Takes the same filters as /api/query-logs but no row cap. ``include_raw`` adds the
+    stored response JSON column.
+    """
+    if format not in export.FORMATS:
+        raise HTTPException(status_code=400, detail="format must be csv or ndjson")
+    columns = export.log_columns(include_raw)
+
+    def build_query(db: Session):
+        query = db.query(*[getattr(QueryLog, c) for c in columns])
+        return export.filter_query_logs(query, state, district, status, case_number, since, until).order_by(QueryLog.id)
+
+    return _export_response(export.stream(build_query, columns, format, gzip), 'query_logs', format, gzip)
+
+@app.get("/api/export/cases")
+async def export_cases(format: str = 'csv', gzip: bool = False, state_code: Optional[str] = None,
+                       dist_code: Optional[str] = None, court_complex_code: Optional[str] = None,
+                       since: Optional[datetime] = None, until: Optional[datetime] = None):
+    """Stream stored cases (normalized ``cases`` table) as CSV or NDJSON; since/until filter on updated_at."""
+    if format not in export.FORMATS:
+        raise HTTPException(status_code=400, detail="format must be csv or ndjson")
+    columns = export.CASE_COLUMNS
+
+    def build_query(db: Session):
+        query = db.query(*[getattr(Case, c) for c in columns])
+        return export.filter_cases(query, state_code, dist_code, court_complex_code, since, until).order_by(Case.cnr)
+
+    return _export_response(export.stream(build_query, columns, format, gzip), 'cases', format, gzip)
+
 @app.get("/api/stats", response_model=StatsResponse)
 async def get_stats(db: Session = Depends(get_db)):
     """Return aggregated usage statistics."""
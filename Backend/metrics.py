@@ -0,0 +1,209 @@
+"""Minimal in-process Prometheus metrics (text exposition format 0.0.4).
+
+Kept dependency-free on purpose: a handful of counters and histograms is all
+the scraper needs, and the exposition format is trivial to render.
+
+Metrics are per process. With several workers each publishes ``snapshot()``
+(see session_store.WorkerMetrics) and /metrics renders ``merge()`` of them:
+samples with the same name and labels are summed, gauges included (requests in
+flight, cache entries, ... become server-wide totals).
+"""
+import threading
+import time
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 30.0)
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+PARSE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+# (name suffix, labels, value), e.g. ('_bucket', (('endpoint', 'x'), ('le', '0.5')), 3)
+Sample = Tuple[str, LabelKey, float]
+# (name, type, doc, samples)
+Family = Tuple[str, str, str, List[Sample]]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _fmt_labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ''
+    body = ','.join('{}="{}"'.format(k, v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for k, v in pairs)
+    return '{' + body + '}'
+
+
+def _fmt_value(v: float) -> str:
+    if v == float('inf'):
+        return '+Inf'
+    if float(v).is_integer():
+        return str(int(v))
+    return repr(float(v))
+
+
+class Counter:
+    def __init__(self, name: str, doc: str):
+        self.name = name
+        self.doc = doc
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def family(self) -> Family:
+        with self._lock:
+            items = list(self._values.items())
+        return self.name, 'counter', self.doc, [('', key, val) for key, val in items]
+
+
+class Histogram:
+    def __init__(self, name: str, doc: str, buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.doc = doc
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._values: Dict[LabelKey, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            # layout: [bucket counts..., sum, count]
+            state = self._values.get(key)
+            if state is None:
+                state = [0.0] * (len(self.buckets) + 2)
+                self._values[key] = state
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def family(self) -> Family:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        samples: List[Sample] = []
+        for key, state in items:
+            for i, bound in enumerate(self.buckets):
+                samples.append(('_bucket', key + (('le', _fmt_value(bound)),), state[i]))
+            samples.append(('_sum', key, state[-2]))
+            samples.append(('_count', key, state[-1]))
+        return self.name, 'histogram', self.doc, samples
+
+
+# Collectors are called at scrape time and return
+# (name, type, doc, [(labels_dict, value), ...]) tuples.
+Collector = Callable[[], Iterable[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]]
+
+_metrics: List = []
+_collectors: List[Collector] = []
+
+
+def counter(name: str, doc: str) -> Counter:
+    m = Counter(name, doc)
+    _metrics.append(m)
+    return m
+
+
+def histogram(name: str, doc: str, buckets: Iterable[float] = LATENCY_BUCKETS) -> Histogram:
+    m = Histogram(name, doc, buckets)
+    _metrics.append(m)
+    return m
+
+
+def register_collector(fn: Collector):
+    _collectors.append(fn)
+    return fn
+
+
+def collect() -> List[Family]:
+    """Every metric family of this process (registered metrics, then collectors)."""
+    families = [m.family() for m in _metrics]
+    for fn in _collectors:
+        try:
+            collected = list(fn())
+        except Exception:
+            continue
+        for name, mtype, doc, samples in collected:
+            families.append((name, mtype, doc, [('', _label_key(labels), val) for labels, val in samples]))
+    return families
+
+
+def snapshot() -> List:
+    """``collect()`` as JSON-serializable lists, for publishing to other workers."""
+    return [[name, mtype, doc, [[suffix, [list(p) for p in key], val] for suffix, key, val in samples]]
+            for name, mtype, doc, samples in collect()]
+
+
+def merge(snapshots: Iterable[List]) -> List[Family]:
+    """Sum ``snapshot()`` outputs of several processes sample by sample."""
+    families: Dict[str, list] = {}
+    totals: Dict[str, Dict[Tuple[str, LabelKey], float]] = {}
+    for snap in snapshots:
+        for name, mtype, doc, samples in snap:
+            if name not in families:
+                families[name] = [mtype, doc]
+                totals[name] = {}
+            acc = totals[name]
+            for suffix, key, val in samples:
+                k = (suffix, tuple(tuple(p) for p in key))
+                acc[k] = acc.get(k, 0) + val
+    return [(name, mtype, doc, [(suffix, key, val) for (suffix, key), val in totals[name].items()])
+            for name, (mtype, doc) in families.items()]
+
+
+def render(families: Optional[List[Family]] = None) -> str:
+    """Text exposition of ``families`` (default: this process's metrics)."""
+    lines: List[str] = []
+    for name, mtype, doc, samples in (collect() if families is None else families):
+        lines.append(f"# HELP {name} {doc}")
+        lines.append(f"# TYPE {name} {mtype}")
+        for suffix, key, val in samples:
+            lines.append(f"{name}{suffix}{_fmt_labels(key)} {_fmt_value(val)}")
+    return '\n'.join(lines) + '\n'
+
+
+# --- Scraper metric families -------------------------------------------------
+
+UPSTREAM_LATENCY = histogram(
+    'ecourts_upstream_request_duration_seconds',
+    'Latency of requests to the eCourts site by endpoint.')
+UPSTREAM_BYTES = histogram(
+    'ecourts_upstream_response_bytes',
+    'Response body size of eCourts requests by endpoint.', BYTES_BUCKETS)
+UPSTREAM_REQUESTS = counter(
+    'ecourts_upstream_requests_total',
+    'eCourts requests by endpoint, method and HTTP status ("error" on transport failure).')
+TOKEN_REFRESHES = counter(
+    'ecourts_token_refresh_total',
+    'Session/app_token refresh attempts by mode and result.')
+PDF_STEPS = counter(
+    'ecourts_pdf_fetch_steps_total',
+    'fetch_order_pdf strategy steps (direct, replay, refresh, fallback...) by outcome.')
+PARSE_SECONDS = histogram(
+    'ecourts_parse_duration_seconds',
+    'Time spent in HTML/option parser functions.', PARSE_BUCKETS)
+NAME_CACHE = counter(
+    'ecourts_name_cache_requests_total',
+    'State/district name lookups served from the API name caches by result.')
+
+
+def timed_parser(fn):
+    """Record the wall time of a parser function in PARSE_SECONDS."""
+    name = fn.__name__
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            PARSE_SECONDS.observe(time.perf_counter() - start, parser=name)
+    return wrapper
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Date, Text, LargeBinary, ForeignKey, Index, text
 from datetime import datetime
 from database import Base
 
@@ -11,4 +11,210 @@ class QueryLog(Base):
     district = Column(String, index=True)
     case_number = Column(String, index=True)
     status = Column(String)
-    raw_json_response = Column(Text)
\ No newline at end of file
+    raw_json_response = Column(Text)
+
+class SharedState(Base):
+    """Cross-worker state blobs (upstream session, name caches) keyed by name."""
+    __tablename__ = "shared_state"
+
+    key = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    data = Column(Text)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class WatchedCase(Base):
+    """A case refreshed in the background through viewHistory (by CNR)."""
+    __tablename__ = "watched_cases"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cino = Column(String, unique=True, index=True, nullable=False)
+    court_code = Column(String, nullable=False)
+    state_code = Column(String, nullable=False)
+    dist_code = Column(String, nullable=False)
+    court_complex_code = Column(String, nullable=False)
+    case_no = Column(String, nullable=False)
+    label = Column(String)
+    interval_minutes = Column(Integer)
+    next_refresh_at = Column(DateTime, index=True)
+    last_refreshed_at = Column(DateTime)
+    next_date = Column(String)
+    next_date_iso = Column(Date, index=True)
+    stage = Column(String)
+    last_status = Column(String)
+    last_error = Column(Text)
+    failures = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class CaseSnapshot(Base):
+    """Latest normalized case details per CNR (full copy, overwritten in place)."""
+    __tablename__ = "case_snapshots"
+
+    cnr = Column(String, primary_key=True)
+    fingerprint = Column(String, nullable=False)
+    snapshot = Column(Text, nullable=False)
+    fetched_at = Column(DateTime, default=datetime.utcnow)
+    changed_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+class CaseChange(Base):
+    """Delta between two consecutive snapshots of a case."""
+    __tablename__ = "case_changes"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cnr = Column(String, index=True, nullable=False)
+    detected_at = Column(DateTime, default=datetime.utcnow, index=True)
+    kind = Column(String, nullable=False)  # "initial" | "update"
+    delta = Column(Text, nullable=False)
+
+
+class CaseSearchDoc(Base):
+    """Maps a CNR to its rowid in the case_search FTS5 table (see search_index.py)."""
+    __tablename__ = "case_search_docs"
+
+    id = Column(Integer, primary_key=True)
+    cnr = Column(String, unique=True, index=True, nullable=False)
+    indexed_at = Column(DateTime, default=datetime.utcnow)
+
+
+# --- Normalized case data (populated from parsed viewHistory, see case_store.py) ---
+
+class Case(Base):
+    __tablename__ = "cases"
+    __table_args__ = (
+        Index("ix_cases_complex_next_date", "court_complex_code", "next_date_iso"),
+    )
+
+    cnr = Column(String, primary_key=True)
+    case_number = Column(String, index=True)
+    case_type = Column(String)
+    filing_number = Column(String)
+    filing_date = Column(String)
+    registration_number = Column(String)
+    registration_date = Column(String)
+    court_name = Column(String)
+    judge = Column(String)
+    stage = Column(String)
+    next_date = Column(String)
+    next_date_iso = Column(Date, index=True)
+    first_hearing_date = Column(String)
+    state_code = Column(String)
+    dist_code = Column(String)
+    court_complex_code = Column(String)
+    court_code = Column(String)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class CaseParty(Base):
+    __tablename__ = "case_parties"
+
+    id = Column(Integer, primary_key=True)
+    cnr = Column(String, ForeignKey("cases.cnr", ondelete="CASCADE"), index=True, nullable=False)
+    role = Column(String, nullable=False)  # "petitioner" | "respondent"
+    position = Column(Integer)
+    name = Column(String, index=True)
+    advocate = Column(String, index=True)
+
+
+class CaseAct(Base):
+    __tablename__ = "case_acts"
+
+    id = Column(Integer, primary_key=True)
+    cnr = Column(String, ForeignKey("cases.cnr", ondelete="CASCADE"), index=True, nullable=False)
+    act_name = Column(String, index=True)
+    sections = Column(String)
+
+
+class CaseHearing(Base):
+    __tablename__ = "case_hearings"
+    __table_args__ = (
+        Index("ix_case_hearings_complex_date", "court_complex_code", "hearing_date_iso"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    cnr = Column(String, ForeignKey("cases.cnr", ondelete="CASCADE"), index=True, nullable=False)
+    court_complex_code = Column(String)
+    judge = Column(String)
+    business_date = Column(String)
+    hearing_date = Column(String)
+    hearing_date_iso = Column(Date, index=True)
+    purpose_of_hearing = Column(String)
+
+
+class CaseOrder(Base):
+    __tablename__ = "case_orders"
+
+    id = Column(Integer, primary_key=True)
+    cnr = Column(String, ForeignKey("cases.cnr", ondelete="CASCADE"), index=True, nullable=False)
+    order_number = Column(String)
+    order_date = Column(String)
+    order_date_iso = Column(Date, index=True)
+    order_details = Column(String)
+    display_pdf_arg = Column(Text)
+
+
+class CaseProcess(Base):
+    __tablename__ = "case_processes"
+
+    id = Column(Integer, primary_key=True)
+    cnr = Column(String, ForeignKey("cases.cnr", ondelete="CASCADE"), index=True, nullable=False)
+    process_id = Column(String)
+    process_title = Column(String)
+    process_date = Column(String)
+
+
+class OrderText(Base):
+    """Text extracted from a fetched interim order PDF, one row per distinct PDF (see order_text.py).
+
+    ``id`` is also the rowid of the order's document in the order_search FTS5 table.
+    """
+    __tablename__ = "order_texts"
+    __table_args__ = (
+        Index("ix_order_texts_cnr_date", "cnr", "order_date_iso"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    sha256 = Column(String(64), unique=True, index=True, nullable=False)
+    cnr = Column(String, index=True)
+    order_number = Column(String)
+    order_date = Column(String)
+    order_date_iso = Column(Date, index=True)
+    pdf_request = Column(Text)
+    pages = Column(Integer, default=0)
+    chars = Column(Integer, default=0)
+    text_z = Column(LargeBinary)  # zlib-compressed UTF-8 text
+    status = Column(String, default="indexed")  # indexed | empty | failed
+    error = Column(Text)
+    extracted_at = Column(DateTime, default=datetime.utcnow)
+
+
+class Job(Base):
+    """Durable background job (see jobqueue.py).
+
+    ``dedup_key`` is unique per type among queued/running jobs only, so a finished
+    job's key can be enqueued again.
+    """
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_claim", "type", "status", "run_at"),
+        Index("ux_jobs_active_key", "type", "dedup_key", unique=True,
+              sqlite_where=text("status IN ('queued', 'running') AND dedup_key IS NOT NULL")),
+    )
+
+    id = Column(Integer, primary_key=True)
+    type = Column(String, nullable=False)
+    dedup_key = Column(String)
+    payload = Column(Text)  # JSON
+    status = Column(String, nullable=False, default="queued", index=True)  # queued | running | succeeded | failed | cancelled
+    priority = Column(Integer, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    lease_owner = Column(String)
+    lease_expires_at = Column(DateTime, index=True)
+    last_error = Column(Text)
+    result = Column(Text)  # JSON
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime, index=True)
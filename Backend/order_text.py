@@ -0,0 +1,297 @@
+"""Background text extraction and full-text indexing of fetched order PDFs.
+
+Every PDF served by /api/get-order-pdf is handed to ``OrderTextExtractor``,
+which queues it without blocking the request. A single daemon thread takes
+PDFs off the queue at most ORDER_TEXT_RATE_PER_MINUTE times a minute, skips any
+whose sha256 is already in ``order_texts`` (each distinct PDF is processed
+once, failures included), and extracts the text with pypdf in a small process
+pool whose workers run at a lower CPU priority. A PDF whose extraction was cut
+short by a crashed pool goes back on the queue (up to ORDER_TEXT_RETRIES times)
+instead of being recorded as failed. The text is stored
+zlib-compressed, keyed to the case and order date through the matching
+``case_orders`` row, and indexed in the ``order_search`` FTS5 table.
+
+pypdf is optional; without it nothing is queued and search returns no hits.
+
+Environment:
+  ORDER_TEXT_ENABLED          0 disables the extractor thread (default 1)
+  ORDER_TEXT_WORKERS          extraction processes (default 1)
+  ORDER_TEXT_RATE_PER_MINUTE  max PDFs extracted per minute (default 30)
+  ORDER_TEXT_QUEUE            PDFs waiting before new ones are dropped (default 200)
+  ORDER_TEXT_NICE             niceness added to worker processes (default 10)
+  ORDER_TEXT_MAX_PAGES        pages read per PDF (default 200)
+  ORDER_TEXT_TIMEOUT          seconds allowed per extraction (default 120)
+  ORDER_TEXT_RETRIES          requeues of a PDF after the pool crashed (default 2)
+"""
+import hashlib
+import importlib.util
+import io
+import logging
+import os
+import queue
+import threading
+import time
+import zlib
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import CaseOrder, OrderText
+from search_index import build_match
+import metrics
+import parsing
+
+# optional dependency, imported where it is used (in the extraction workers)
+HAVE_PYPDF = importlib.util.find_spec('pypdf') is not None
+
+logger = logging.getLogger(__name__)
+
+WORKERS = int(os.getenv('ORDER_TEXT_WORKERS', '1'))
+RATE_PER_MINUTE = float(os.getenv('ORDER_TEXT_RATE_PER_MINUTE', '30'))
+QUEUE_SIZE = int(os.getenv('ORDER_TEXT_QUEUE', '200'))
+NICE = int(os.getenv('ORDER_TEXT_NICE', '10'))
+MAX_PAGES = int(os.getenv('ORDER_TEXT_MAX_PAGES', '200'))
+TIMEOUT = float(os.getenv('ORDER_TEXT_TIMEOUT', '120'))
+RETRIES = int(os.getenv('ORDER_TEXT_RETRIES', '2'))
+
+ORDER_TEXT = metrics.counter(
+    'ecourts_order_text_total',
+    'Fetched order PDFs by extraction result (queued, dropped, duplicate, indexed, empty, failed, retried).')
+
+
+class ExtractionInterrupted(Exception):
+    """Extraction did not finish (pool crashed or extractor stopping); the PDF was not judged."""
+
+
+def ensure_index(engine):
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS order_search USING fts5("
+            "cnr UNINDEXED, order_date UNINDEXED, body, tokenize='unicode61 remove_diacritics 2')"
+        ))
+
+
+def extract_text(pdf_bytes: bytes, max_pages: int = MAX_PAGES) -> Tuple[str, int]:
+    """(text, page count) of a PDF; runs in the extraction pool."""
+    from pypdf import PdfReader
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    pages = [page.extract_text() or '' for page in reader.pages[:max_pages]]
+    return '\n\f'.join(p.strip() for p in pages).strip(), len(reader.pages)
+
+
+def _lower_priority():
+    try:
+        os.nice(NICE)
+    except (AttributeError, OSError):
+        pass
+
+
+def read_text(row: OrderText) -> str:
+    return zlib.decompress(row.text_z).decode('utf-8') if row.text_z else ''
+
+
+def search(db: Session, q: str, cnr: Optional[str] = None, limit: int = 20, offset: int = 0) -> Tuple[int, List[Dict]]:
+    # same query syntax as the case index: every word must match, prefix match
+    match = build_match(q)
+    if not match:
+        return 0, []
+    where = "order_search MATCH :m" + (" AND order_search.cnr = :cnr" if cnr else "")
+    params = {'m': match, 'cnr': cnr}
+    total = db.execute(text(f"SELECT count(*) FROM order_search WHERE {where}"), params).scalar() or 0
+    rows = db.execute(text(
+        "SELECT t.id, t.cnr, t.order_number, t.order_date, t.pages, "
+        "bm25(order_search) AS score, snippet(order_search, 2, '<b>', '</b>', '…', 16) AS snippet "
+        f"FROM order_search JOIN order_texts t ON t.id = order_search.rowid WHERE {where} "
+        "ORDER BY score LIMIT :limit OFFSET :offset"
+    ), {**params, 'limit': limit, 'offset': offset}).mappings().all()
+    return total, [dict(r) for r in rows]
+
+
+class OrderTextExtractor:
+    def __init__(self, workers: int = WORKERS, rate_per_minute: float = RATE_PER_MINUTE,
+                 queue_size: int = QUEUE_SIZE):
+        self.workers = workers
+        self.min_gap = 60.0 / max(rate_per_minute, 0.01)
+        # (sha256, pdf bytes, pdf_request, attempt)
+        self._queue: 'queue.Queue[Tuple[str, bytes, str, int]]' = queue.Queue(maxsize=queue_size)
+        self._queued: set = set()  # sha256s waiting in the queue
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._last_run = 0.0
+        self.processed = 0
+
+    @property
+    def available(self) -> bool:
+        return HAVE_PYPDF
+
+    def start(self):
+        if not self.available:
+            logger.warning("pypdf not installed; order text extraction disabled")
+            return
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='order-text', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            # an extraction in flight is abandoned within a second (see _extract)
+            self._thread.join(timeout=5)
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, pdf_bytes: bytes, pdf_request: str) -> bool:
+        """Queue a fetched PDF for extraction; never blocks. False if skipped or dropped."""
+        if not self.available or not pdf_bytes:
+            return False
+        sha = hashlib.sha256(pdf_bytes).hexdigest()
+        with self._lock:
+            if sha in self._queued:
+                return False
+            try:
+                self._queue.put_nowait((sha, pdf_bytes, pdf_request or '', 0))
+            except queue.Full:
+                ORDER_TEXT.inc(result='dropped')
+                return False
+            self._queued.add(sha)
+        ORDER_TEXT.inc(result='queued')
+        return True
+
+    def stats(self) -> dict:
+        return {'queued': self._queue.qsize(), 'processed': self.processed,
+                'running': bool(self._thread and self._thread.is_alive())}
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                sha, pdf_bytes, pdf_request, attempt = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            try:
+                self.process(sha, pdf_bytes, pdf_request, last_attempt=attempt >= RETRIES)
+            except ExtractionInterrupted as e:
+                if not self._stop.is_set() and self._requeue(sha, pdf_bytes, pdf_request, attempt + 1):
+                    logger.warning(f"order text extraction of {sha[:12]} interrupted ({e}); retrying later")
+                    continue
+            except Exception as e:
+                logger.warning(f"order text extraction error: {e}")
+            with self._lock:
+                self._queued.discard(sha)
+
+    def _requeue(self, sha: str, pdf_bytes: bytes, pdf_request: str, attempt: int) -> bool:
+        try:
+            self._queue.put_nowait((sha, pdf_bytes, pdf_request, attempt))
+        except queue.Full:
+            ORDER_TEXT.inc(result='dropped')
+            return False
+        ORDER_TEXT.inc(result='retried')
+        return True
+
+    def _throttle(self):
+        wait = self._last_run + self.min_gap - time.monotonic()
+        if wait > 0:
+            self._stop.wait(wait)
+        self._last_run = time.monotonic()
+
+    def _extract(self, pdf_bytes: bytes) -> Tuple[str, int]:
+        if self.workers <= 0:
+            return extract_text(pdf_bytes)
+        if self._stop.is_set():
+            raise ExtractionInterrupted('extractor stopping')
+        pool = self._pool
+        if pool is None:
+            pool = self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=parsing.mp_context(),
+                                                    initializer=_lower_priority)
+        deadline = time.monotonic() + TIMEOUT
+        try:
+            fut = pool.submit(extract_text, pdf_bytes)
+            # wait in short steps so stop() is not held up by a long extraction
+            while True:
+                if self._stop.is_set():
+                    raise ExtractionInterrupted('extractor stopping')
+                try:
+                    return fut.result(timeout=min(1.0, max(deadline - time.monotonic(), 0.0)))
+                except FutureTimeout:
+                    if time.monotonic() >= deadline:
+                        raise
+        except (BrokenProcessPool, FutureTimeout, CancelledError, RuntimeError) as e:
+            # start a fresh pool for the next PDF; a hung extraction counts as a failure,
+            # a crashed (or shut down) pool leaves the PDF to be retried
+            if self._pool is pool:
+                self._pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+            if isinstance(e, FutureTimeout):
+                raise
+            if self._stop.is_set():
+                raise ExtractionInterrupted('extractor stopping') from e
+            raise ExtractionInterrupted(f"extraction pool broke: {type(e).__name__}") from e
+
+    def process(self, sha: str, pdf_bytes: bytes, pdf_request: str, last_attempt: bool = True) -> Optional[int]:
+        """Extract, store and index one PDF unless it was seen before. Returns the order_texts id.
+
+        Raises ExtractionInterrupted, storing nothing, when the extraction was cut short
+        (unless ``last_attempt``, where a crashed pool is recorded as a failure).
+        """
+        db = SessionLocal()
+        try:
+            if db.query(OrderText.id).filter(OrderText.sha256 == sha).first():
+                ORDER_TEXT.inc(result='duplicate')
+                return None
+            self._throttle()
+            order = None
+            if pdf_request:
+                order = (db.query(CaseOrder).filter(CaseOrder.display_pdf_arg == pdf_request)
+                         .order_by(CaseOrder.id.desc()).first())
+            row = OrderText(
+                sha256=sha, pdf_request=pdf_request,
+                cnr=order.cnr if order else None,
+                order_number=order.order_number if order else None,
+                order_date=order.order_date if order else None,
+                order_date_iso=order.order_date_iso if order else None,
+            )
+            body = ''
+            try:
+                body, row.pages = self._extract(pdf_bytes)
+                row.status = 'indexed' if body else 'empty'
+            except ExtractionInterrupted:
+                if not last_attempt or self._stop.is_set():
+                    raise
+                row.status, row.error = 'failed', 'extraction pool broke on every attempt'
+            except Exception as e:
+                row.status, row.error = 'failed', f"{type(e).__name__}: {e}"[:500]
+                logger.warning(f"order text extraction failed for {sha[:12]}: {row.error}")
+            row.chars = len(body)
+            row.text_z = zlib.compress(body.encode('utf-8'), 6)
+            row.extracted_at = datetime.utcnow()
+            db.add(row)
+            db.flush()
+            if body:
+                db.execute(
+                    text("INSERT INTO order_search(rowid, cnr, order_date, body) VALUES (:id, :cnr, :d, :body)"),
+                    {'id': row.id, 'cnr': row.cnr or '', 'd': row.order_date or '', 'body': body}
+                )
+            db.commit()
+            self.processed += 1
+            ORDER_TEXT.inc(result=row.status)
+            return row.id
+        except IntegrityError:
+            # another worker process stored the same PDF first
+            db.rollback()
+            ORDER_TEXT.inc(result='duplicate')
+            return None
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
@@ -0,0 +1,184 @@
+"""Streaming ZIP archive of a case's interim order PDFs.
+
+``stream_orders_zip`` fetches the PDFs concurrently through the scraper and
+yields ZIP bytes as each one arrives, so neither the archive nor the whole set
+of PDFs is held in memory: ``zipfile`` writes to an unseekable sink (entries
+get data descriptors instead of patched headers) that the generator drains
+after every entry. Entries appear in completion order; ``manifest.json`` at
+the end lists every requested order with its entry name or error.
+
+All archives in the process share one upstream budget: at most
+ORDER_ZIP_CONCURRENCY fetches in flight, started no faster than
+ORDER_ZIP_RATE_PER_MINUTE.
+
+Environment:
+  ORDER_ZIP_CONCURRENCY      concurrent PDF fetches across all archives (default 4)
+  ORDER_ZIP_RATE_PER_MINUTE  max PDF fetches started per minute (default 1200)
+  ORDER_ZIP_MAX_ORDERS       orders accepted per archive (default 200)
+"""
+import io
+import json
+import logging
+import os
+import re
+import threading
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+CONCURRENCY = int(os.getenv('ORDER_ZIP_CONCURRENCY', '4'))
+RATE_PER_MINUTE = float(os.getenv('ORDER_ZIP_RATE_PER_MINUTE', '1200'))
+MAX_ORDERS = int(os.getenv('ORDER_ZIP_MAX_ORDERS', '200'))
+
+ORDER_ZIP = metrics.counter(
+    'ecourts_order_zip_entries_total',
+    'Orders requested in ZIP downloads by result (ok, failed).')
+
+_budget = threading.BoundedSemaphore(max(1, CONCURRENCY))
+_rate_lock = threading.Lock()
+_next_start = [0.0]
+
+_UNSAFE_RE = re.compile(r'[^A-Za-z0-9._-]+')
+
+
+class _Sink(io.RawIOBase):
+    """Write-only, unseekable buffer; ``drain`` hands out what has been written so far."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        data = bytes(b)
+        self._chunks.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _acquire_slot():
+    """Block until the shared budget allows another upstream fetch."""
+    _budget.acquire()
+    gap = 60.0 / max(RATE_PER_MINUTE, 0.01)
+    with _rate_lock:
+        start = max(time.monotonic(), _next_start[0])
+        _next_start[0] = start + gap
+    delay = start - time.monotonic()
+    if delay > 0:
+        time.sleep(delay)
+
+
+def order_request(order: Dict) -> str:
+    """The displayPdf() argument of a parsed interim order (either key the parser emits)."""
+    return (order.get('display_pdf_arg') or order.get('pdf_url') or order.get('pdf_request') or '').strip()
+
+
+def safe_name(value: str, sep: str = '_') -> str:
+    return _UNSAFE_RE.sub(sep, value or '').strip(sep)
+
+
+def entry_name(index: int, order: Dict, filename: str) -> str:
+    date = safe_name(order.get('order_date') or '', '-')
+    number = safe_name(str(order.get('order_number') or index), '-')
+    stem = '_'.join(filter(None, [f"{index:03d}", date, f"order-{number}"]))
+    base = safe_name(filename)
+    return f"{stem}.pdf" if not base or base == 'order.pdf' else f"{stem}_{base}"
+
+
+def stream_orders_zip(fetch: Callable[[str], Tuple[Optional[bytes], str, str]], orders: List[Dict],
+                      case_label: str = '', on_pdf: Optional[Callable[[bytes, str], None]] = None,
+                      concurrency: int = CONCURRENCY) -> Iterator[bytes]:
+    """Yield a ZIP of ``fetch(order_request(o))`` for every order, plus manifest.json.
+
+    ``on_pdf(pdf_bytes, pdf_request)`` is called for every PDF fetched (e.g. to queue
+    text extraction). Closing the generator early cancels fetches not yet started.
+    """
+    sink = _Sink()
+    zf = zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=1)
+    manifest: List[Dict] = [None] * len(orders)
+    started = time.monotonic()
+
+    def fetch_one(index: int, order: Dict):
+        req = order_request(order)
+        if not req:
+            return index, None, '', 'no displayPdf argument'
+        _acquire_slot()
+        try:
+            pdf, filename, _ = fetch(req)
+        except Exception as e:
+            return index, None, '', f"{type(e).__name__}: {e}"
+        finally:
+            _budget.release()
+        if not pdf:
+            return index, None, '', 'PDF not available'
+        return index, pdf, filename, ''
+
+    pool = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix='order-zip')
+    pending = set()
+    queued = iter(enumerate(orders, 1))
+    try:
+        # keep at most `concurrency` fetched-or-fetching PDFs around at a time
+        for index, order in queued:
+            pending.add(pool.submit(fetch_one, index, order))
+            if len(pending) >= concurrency:
+                break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                index, pdf, filename, error = fut.result()
+                order = orders[index - 1]
+                entry = {'index': index, 'order_number': order.get('order_number'),
+                         'order_date': order.get('order_date'), 'pdf_request': order_request(order)}
+                if pdf:
+                    name = entry_name(index, order, filename)
+                    info = zipfile.ZipInfo(name, date_time=datetime.now().timetuple()[:6])
+                    zf.writestr(info, pdf, compress_type=zipfile.ZIP_DEFLATED, compresslevel=1)
+                    entry.update(status='ok', file=name, bytes=len(pdf))
+                    ORDER_ZIP.inc(result='ok')
+                    if on_pdf is not None:
+                        try:
+                            on_pdf(pdf, entry['pdf_request'])
+                        except Exception as e:
+                            logger.warning(f"order zip on_pdf hook failed: {e}")
+                else:
+                    entry.update(status='failed', error=error)
+                    ORDER_ZIP.inc(result='failed')
+                manifest[index - 1] = entry
+                nxt = next(queued, None)
+                if nxt is not None:
+                    pending.add(pool.submit(fetch_one, *nxt))
+                out = sink.drain()
+                if out:
+                    yield out
+        summary = {
+            'case': case_label,
+            'generated_at': datetime.utcnow().isoformat(),
+            'requested': len(orders),
+            'ok': sum(1 for m in manifest if m and m['status'] == 'ok'),
+            'failed': sum(1 for m in manifest if m and m['status'] != 'ok'),
+            'seconds': round(time.monotonic() - started, 2),
+            'orders': manifest,
+        }
+        zf.writestr('manifest.json', json.dumps(summary, indent=2, ensure_ascii=False))
+        zf.close()
+        yield sink.drain()
+    finally:
+        for fut in pending:
+            fut.cancel()
+        pool.shutdown(wait=False, cancel_futures=True)
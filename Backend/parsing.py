@@ -0,0 +1,90 @@
+"""Process-pool executor for CPU-heavy HTML parsing.
+
+BeautifulSoup parsing of a large viewHistory page holds the GIL for a long
+time and stalls every other request in the worker. Payloads above
+PARSE_POOL_THRESHOLD_BYTES are handed to a small process pool (module-level
+parse functions, plain dict results); smaller ones are parsed inline, where
+the pickling round trip would cost more than it saves. If the pool breaks or
+times out the payload is parsed inline instead.
+
+Environment:
+  PARSE_POOL_SIZE             worker processes; 0 disables the pool (default 2)
+  PARSE_POOL_THRESHOLD_BYTES  minimum payload size sent to the pool (default 131072)
+  PARSE_POOL_TIMEOUT          seconds to wait for a pooled parse (default 30)
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+POOL_SIZE = int(os.getenv('PARSE_POOL_SIZE', '2'))
+THRESHOLD_BYTES = int(os.getenv('PARSE_POOL_THRESHOLD_BYTES', '131072'))
+TIMEOUT = float(os.getenv('PARSE_POOL_TIMEOUT', '30'))
+
+PARSE_OFFLOAD = metrics.counter(
+    'ecourts_parse_offload_total',
+    'Parser invocations by mode (inline, pool, fallback after a pool failure).')
+
+_pool: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def mp_context():
+    # fork is unsafe with the server's threads running; forkserver/spawn start clean
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def get_pool() -> Optional[ProcessPoolExecutor]:
+    global _pool
+    if POOL_SIZE <= 0:
+        return None
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=POOL_SIZE, mp_context=mp_context())
+    return _pool
+
+
+def run(fn: Callable[[str], dict], payload: str) -> dict:
+    """``fn(payload)`` in the pool when the payload is large, else inline."""
+    pool = get_pool() if payload and len(payload) >= THRESHOLD_BYTES else None
+    if pool is None:
+        PARSE_OFFLOAD.inc(mode='inline')
+        return fn(payload)
+    try:
+        result = pool.submit(fn, payload).result(timeout=TIMEOUT)
+        PARSE_OFFLOAD.inc(mode='pool')
+        return result
+    except (BrokenProcessPool, FutureTimeout, OSError) as e:
+        logger.warning(f"parse pool failed ({type(e).__name__}); parsing inline")
+        shutdown()  # next large parse starts a fresh pool
+        PARSE_OFFLOAD.inc(mode='fallback')
+        return fn(payload)
+
+
+def _noop() -> None:
+    return None
+
+
+def warm():
+    """Start the worker processes ahead of the first large parse."""
+    pool = get_pool()
+    if pool is not None:
+        for _ in range(POOL_SIZE):
+            pool.submit(_noop)
+
+
+def shutdown():
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
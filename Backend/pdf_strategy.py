@@ -0,0 +1,174 @@
+"""Strategy learning and GET racing for ``ECourtScraper.fetch_order_pdf``.
+
+Which way of obtaining an interim order PDF works (a direct ``/orders/`` GET,
+the ``display_pdf`` GET or the ``display_pdf`` POST) depends on the state and
+court deployment. ``winner``/``record``/``forget`` keep the last strategy that
+worked per (state, district, court_code) scope (see ``ECourtScraper._pdf_scope``)
+in a process-wide TTL cache, so the next fetch in that scope tries it first.
+
+``race`` runs up to ``RACE_MAX`` idempotent GETs at once and returns the first
+response that is a PDF (or, failing that, a display_pdf JSON naming the order
+path). Responses are streamed, so losers are closed after their headers and
+first chunk; attempts that have not started yet are cancelled.
+
+Environment:
+  PDF_STRATEGY_TTL   seconds a learned winner is kept (default 86400)
+  PDF_RACE_WORKERS   threads shared by all races in the process (default 8)
+  PDF_RACE_MAX       GETs one race may issue; further attempts are dropped (default 2)
+"""
+import contextvars
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+import requests
+
+from cache import TTLCache
+from metrics import PDF_STEPS
+
+STRATEGY_TTL = float(os.getenv('PDF_STRATEGY_TTL', '86400'))
+RACE_WORKERS = int(os.getenv('PDF_RACE_WORKERS', '8'))
+RACE_MAX = max(1, int(os.getenv('PDF_RACE_MAX', '2')))
+
+# Strategy names, in the order they are tried when nothing has been learned yet.
+DIRECT_FILENAME = 'direct_filename'
+GET_FALLBACK = 'get_fallback'
+DISPLAY_PDF = 'display_pdf'            # bare display_pdf POST, no preflight
+DISPLAY_PDF_FULL = 'display_pdf_full'  # POST after preflight / replay / refresh
+GET_STRATEGIES = (DIRECT_FILENAME, GET_FALLBACK)
+
+winners = TTLCache('pdf_strategies', STRATEGY_TTL, maxsize=2048)
+
+_pool: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def winner(scope: tuple) -> Optional[str]:
+    return winners.get(scope)
+
+
+def record(scope: tuple, strategy: str):
+    if winners.peek(scope) != strategy:
+        winners.set(scope, strategy)
+
+
+def forget(scope: tuple, strategy: str):
+    """Drop the learned winner for ``scope`` if it is ``strategy`` (it just failed)."""
+    if winners.peek(scope) == strategy:
+        winners.invalidate(scope)
+        PDF_STEPS.inc(step='learned', outcome='forgotten')
+
+
+@dataclass
+class RaceResult:
+    strategy: str
+    url: str
+    response: Optional[requests.Response] = None
+    first_chunk: bytes = b''
+    order_path: str = ''
+
+    def content(self) -> bytes:
+        """The full PDF body of a winning response (reads the rest of the stream)."""
+        try:
+            return self.first_chunk + b''.join(self.response.iter_content(65536))
+        finally:
+            self.response.close()
+
+    def close(self):
+        if self.response is not None:
+            self.response.close()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=RACE_WORKERS, thread_name_prefix='pdf-race')
+    return _pool
+
+
+def _attempt(get: Callable, strategy: str, url: str, headers: dict, timeout: float) -> Optional[RaceResult]:
+    resp = get(url, timeout=timeout, headers=headers, stream=True)
+    if resp.status_code != 200:
+        resp.close()
+        return None
+    first = next(resp.iter_content(1024), b'')
+    if first.startswith(b'%PDF') or resp.headers.get('Content-Type', '').lower().startswith('application/pdf'):
+        return RaceResult(strategy, url, resp, first)
+    if first.lstrip().startswith(b'{'):
+        # display_pdf answering a GET with JSON: remember the order path, keep racing
+        body = first + b''.join(resp.iter_content(65536))
+        resp.close()
+        try:
+            path = json.loads(body).get('order') or ''
+        except Exception:
+            path = ''
+        if path.lower().endswith('.pdf'):
+            return RaceResult(strategy, url, order_path=path)
+        return None
+    resp.close()
+    return None
+
+
+def _close_quietly(fut: Future):
+    try:
+        result = fut.result()
+    except BaseException:
+        return
+    if result is not None:
+        result.close()
+
+
+def race(get: Callable, attempts: List[Tuple[str, str, dict]], timeout: float) -> Optional[RaceResult]:
+    """GET the first ``RACE_MAX`` ``(strategy, url, headers)`` concurrently; first PDF wins, the rest are cancelled/closed.
+
+    If no attempt yields a PDF, the first display_pdf JSON carrying an order
+    path is returned instead (``order_path`` set, no response); else None.
+    """
+    if not attempts:
+        return None
+    pool = _get_pool()
+    futures = {
+        pool.submit(contextvars.copy_context().run, _attempt, get, strategy, url, headers, timeout): strategy
+        for strategy, url, headers in attempts[:RACE_MAX]
+    }
+    pending = set(futures)
+    fallback: Optional[RaceResult] = None
+    best: Optional[RaceResult] = None
+    try:
+        while pending and best is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                try:
+                    result = fut.result()
+                except Exception:
+                    result = None
+                strategy = futures[fut]
+                if result is None:
+                    PDF_STEPS.inc(step=strategy, outcome='failure')
+                elif result.response is not None and best is None:
+                    PDF_STEPS.inc(step=strategy, outcome='success')
+                    best = result
+                elif result.response is not None:
+                    result.close()  # finished in the same instant as the winner
+                elif fallback is None:
+                    fallback = result
+        return best or fallback
+    finally:
+        for fut in pending:
+            if fut.cancel():
+                PDF_STEPS.inc(step=futures[fut], outcome='cancelled')
+            else:
+                fut.add_done_callback(_close_quietly)
+
+
+def shutdown():
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional, List
-from datetime import datetime
+from typing import Any, Dict, Optional, List
+from datetime import date, datetime
 
 class StateResponse(BaseModel):
     states: List[dict]
@@ -73,10 +73,96 @@ class CaseTypeResponse(BaseModel):
     case_types: List[CaseTypeOption]
     app_token: str
 
+class CascadeRequest(BaseModel):
+    state_code: Optional[str] = None
+    dist_code: Optional[str] = None
+    court_complex_code: Optional[str] = None
+    est_code: Optional[str] = ""
+    search_type: str = "c_no"
+    expand_first: bool = True  # fill unselected levels with their first option
+    include_states: bool = False
+
+class CascadeResponse(BaseModel):
+    state_code: Optional[str] = None
+    dist_code: Optional[str] = None
+    court_complex_code: Optional[str] = None
+    states: Optional[List[dict]] = None
+    districts: List[DistrictOption] = []
+    complexes: List[CourtComplexOption] = []
+    case_types: List[CaseTypeOption] = []
+    app_token: str = ""
+
+class Party(BaseModel):
+    name: str = ""
+    advocate: str = ""
+
+class Act(BaseModel):
+    act_name: str = ""
+    sections: str = ""
+
+class CaseProcess(BaseModel):
+    process_id: str = ""
+    process_title: str = ""
+    process_date: str = ""
+
+class Hearing(BaseModel):
+    judge: str = ""
+    business_date: str = ""
+    hearing_date: str = ""
+    purpose_of_hearing: str = ""
+
+class InterimOrder(BaseModel):
+    order_number: str = ""
+    order_date: str = ""
+    order_details: str = ""
+    pdf_url: str = ""
+    display_pdf_arg: str = ""
+
+class CaseDetails(BaseModel):
+    """Parsed viewHistory payload (see ECourtScraper._parse_case_details_html)."""
+    case_number: Optional[str] = ""
+    case_type: Optional[str] = ""
+    filing_number: Optional[str] = ""
+    filing_date: Optional[str] = ""
+    registration_number: Optional[str] = ""
+    registration_date: Optional[str] = ""
+    cnr_number: Optional[str] = ""
+    court_name: Optional[str] = ""
+    judge: Optional[str] = ""
+    stage: Optional[str] = ""
+    next_date: Optional[str] = ""
+    first_hearing_date: Optional[str] = ""
+    petitioners: List[Party] = []
+    respondents: List[Party] = []
+    acts: List[Act] = []
+    processes: List[CaseProcess] = []
+    case_history: List[Hearing] = []
+    interim_orders: List[InterimOrder] = []
+    error: Optional[str] = None
+
+class CaseStatusData(CaseDetails):
+    """Case summary returned by submit-case.
+
+    Holds either the full details summary or, when viewHistory failed, the bare
+    listing fields (petitioner/respondent strings), hence the extra keys.
+    """
+    petitioners: Optional[List[Party]] = None
+    respondents: Optional[List[Party]] = None
+    acts: Optional[List[Act]] = None
+    processes: Optional[List[CaseProcess]] = None
+    case_history: Optional[List[Hearing]] = None
+    interim_orders: Optional[List[InterimOrder]] = None
+    petitioner: Optional[str] = None
+    respondent: Optional[str] = None
+    raw_html: Optional[str] = None
+
+    class Config:
+        extra = 'allow'
+
 class CaseSubmissionResponse(BaseModel):
     success: bool
     message: str
-    case_status_data: Optional[dict] = None
+    case_status_data: Optional[CaseStatusData] = None
     raw_html: Optional[str] = None
     captcha_html: Optional[str] = None
     app_token: Optional[str] = None
@@ -94,7 +180,7 @@ class CaseDetailsRequest(BaseModel):
 class CaseDetailsResponse(BaseModel):
     success: bool
     message: str
-    case_details: Optional[dict] = None
+    case_details: Optional[CaseDetails] = None
     raw_html: Optional[str] = None
     app_token: Optional[str] = None
 
@@ -104,5 +190,158 @@ class OrderPdfRequest(BaseModel):
         displayPdf('...') attribute (e.g.:
             "home/display_pdf&normal_v=1&case_val=Hindu~Marriage~Act/0000133/2025&cCode=1&appFlag=&filename=/orders/2025/200100001332025_1.pdf&court_code=1")
         We transform this into a POST to the ecourts endpoint while preserving the active session.
+        ``cino`` or ``state_code``/``dist_code`` of the case scope the learned fetch strategy.
         """
         pdf_request: str
+        cino: Optional[str] = None
+        state_code: Optional[str] = None
+        dist_code: Optional[str] = None
+
+class OrdersZipRequest(BaseModel):
+    """Orders to bundle: a stored case's orders by ``cnr``, or an ``interim_orders`` list
+    as returned in case details (display_pdf_arg / pdf_url, order_number, order_date)."""
+    cnr: Optional[str] = None
+    interim_orders: Optional[List[Dict[str, Any]]] = None
+
+class WatchCaseRequest(BaseModel):
+    cino: str
+    court_code: str
+    state_code: str
+    dist_code: str
+    court_complex_code: str
+    case_no: str
+    label: Optional[str] = None
+    interval_minutes: Optional[int] = None
+
+class WatchedCaseResponse(BaseModel):
+    id: int
+    cino: str
+    court_code: str
+    state_code: str
+    dist_code: str
+    court_complex_code: str
+    case_no: str
+    label: Optional[str] = None
+    interval_minutes: Optional[int] = None
+    next_refresh_at: Optional[datetime] = None
+    last_refreshed_at: Optional[datetime] = None
+    next_date: Optional[str] = None
+    stage: Optional[str] = None
+    last_status: Optional[str] = None
+    last_error: Optional[str] = None
+    failures: Optional[int] = 0
+
+    class Config:
+        from_attributes = True
+
+class CaseChangeResponse(BaseModel):
+    id: int
+    cnr: str
+    detected_at: datetime
+    kind: str
+    delta: dict
+
+class CaseChangesResponse(BaseModel):
+    changes: List[CaseChangeResponse]
+    next_since: Optional[datetime] = None
+
+class SearchHit(BaseModel):
+    cnr: str
+    case_number: str
+    court_name: str
+    stage: str
+    next_date: str
+    judge: str
+    score: float
+    snippet: str
+
+class SearchResponse(BaseModel):
+    query: str
+    total: int
+    limit: int
+    offset: int
+    results: List[SearchHit]
+
+class OrderSearchHit(BaseModel):
+    id: int
+    cnr: Optional[str] = None
+    order_number: Optional[str] = None
+    order_date: Optional[str] = None
+    pages: Optional[int] = None
+    score: float
+    snippet: str
+
+class OrderSearchResponse(BaseModel):
+    query: str
+    total: int
+    limit: int
+    offset: int
+    results: List[OrderSearchHit]
+
+class OrderTextResponse(BaseModel):
+    id: int
+    cnr: Optional[str] = None
+    order_number: Optional[str] = None
+    order_date: Optional[str] = None
+    order_date_iso: Optional[date] = None
+    pages: Optional[int] = None
+    status: str
+    text: str
+    extracted_at: Optional[datetime] = None
+
+class JobRequest(BaseModel):
+    type: str
+    payload: Dict[str, Any] = {}
+    dedup_key: Optional[str] = None
+    priority: int = 0
+    delay_seconds: float = 0
+    max_attempts: Optional[int] = None
+
+class JobBulkRequest(BaseModel):
+    jobs: List[JobRequest]
+
+class JobResponse(BaseModel):
+    id: int
+    type: str
+    dedup_key: Optional[str] = None
+    status: str
+    priority: int
+    attempts: int
+    max_attempts: int
+    payload: Dict[str, Any] = {}
+    result: Optional[Any] = None
+    last_error: Optional[str] = None
+    run_at: Optional[datetime] = None
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    created: Optional[bool] = None  # set on enqueue; False when deduplicated
+
+class HearingListing(BaseModel):
+    cnr: str
+    case_number: Optional[str] = None
+    case_type: Optional[str] = None
+    court_name: Optional[str] = None
+    judge: Optional[str] = None
+    hearing_date: Optional[str] = None
+    purpose_of_hearing: Optional[str] = None
+    source: str
+
+class CaseSummaryResponse(BaseModel):
+    cnr: str
+    case_number: Optional[str] = None
+    case_type: Optional[str] = None
+    court_name: Optional[str] = None
+    judge: Optional[str] = None
+    stage: Optional[str] = None
+    next_date: Optional[str] = None
+    next_date_iso: Optional[date] = None
+    state_code: Optional[str] = None
+    dist_code: Optional[str] = None
+    court_complex_code: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -1,49 +1,255 @@
+import os
 import requests
 import logging
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import json
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
+from html import unescape
 from bs4 import BeautifulSoup
 import time
 import random
+import threading
 import urllib3
-from functools import lru_cache
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from urllib.parse import urlsplit, parse_qs, unquote
+
+from metrics import (
+    UPSTREAM_LATENCY, UPSTREAM_BYTES, UPSTREAM_REQUESTS, TOKEN_REFRESHES,
+    PDF_STEPS, timed_parser
+)
+from tracing import span, traced
+from transport import adapter_from_env
+from cache import TTLCache, cached_options
+from singleflight import SingleFlight, coalesced
+import parsing
+import pdf_strategy
+import lanes
 
 logger = logging.getLogger(__name__)
 
+# Upstream sessions kept per API client (see ECourtScraper.client_session)
+CLIENT_SESSIONS_MAX = int(os.getenv('UPSTREAM_CLIENT_SESSIONS', '512'))
+CLIENT_SESSION_IDLE_SECONDS = float(os.getenv('UPSTREAM_CLIENT_IDLE_SECONDS', '7200'))
+
+# Client id of the API request being served; '' selects the default session used by
+# background work (warmer, watchlist, jobs) and by requests without a client id.
+current_client: ContextVar[str] = ContextVar('upstream_client', default='')
+
+
+def _endpoint_label(url: str) -> str:
+    """Low-cardinality metric label for an upstream URL.
+
+    ecourtindia_v6/?p=casestatus/fillDistrict -> casestatus/fillDistrict;
+    CAPTCHA and PDF paths collapse to a fixed name.
+    """
+    parts = urlsplit(url)
+    p = parse_qs(parts.query).get('p')
+    if p:
+        return p[0].split('&')[0]
+    path = parts.path
+    if 'securimage' in path:
+        return 'captcha'
+    if path.lower().endswith('.pdf'):
+        return 'pdf'
+    return path.strip('/').split('/')[-1] or 'index'
+
+
+OPTION_TAG_RE = re.compile(r'<option\b', re.I)
+# An <option>'s attributes and content, up to its close tag or the next option/select boundary.
+OPTION_RE = re.compile(r'<option\b([^>]*)>(.*?)(?=</option\s*>|<option\b|</select\b|\Z)', re.I | re.S)
+VALUE_ATTR_RE = re.compile(r'(?:^|\s)value\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))', re.I)
+TAG_RE = re.compile(r'<[^>]*>')
+
+
+def iter_options(html: str, with_meta: bool = True) -> Iterator[Dict[str, str]]:
+    """Tokenize ``<option>`` elements in one pass (no DOM).
+
+    Yields value (the part before any '@'), text (tags stripped, entities
+    unescaped), raw_value and the '@'-separated est_list / flag metadata used by
+    fillcomplex (``with_meta=False`` yields just value and text). Placeholder
+    options (empty/'0' value, "Select ..." text) are skipped, matching the
+    previous BeautifulSoup-based parser.
+    """
+    for m in OPTION_RE.finditer(html):
+        vm = VALUE_ATTR_RE.search(m.group(1))
+        raw = ''
+        if vm:
+            raw = next(g for g in vm.groups() if g is not None)
+            if '&' in raw:
+                raw = unescape(raw)
+            raw = raw.strip()
+        text = m.group(2)
+        if '<' in text:
+            text = TAG_RE.sub('', text)
+        if '&' in text:
+            text = unescape(text)
+        text = text.strip()
+        if not raw or raw == '0' or text.lower().startswith('select'):
+            continue
+        parts = raw.split('@')
+        if not with_meta:
+            yield {'value': parts[0], 'text': text}
+            continue
+        yield {
+            'value': parts[0],
+            'text': text,
+            'raw_value': raw,
+            'est_list': parts[1] if len(parts) > 1 else '',
+            'flag': parts[2] if len(parts) > 2 else '',
+        }
+
+
+class ScraperSession(requests.Session):
+    """requests.Session that records per-endpoint latency, status and size.
+
+    Every request first takes a slot in its priority lane (see lanes.py); the
+    recorded latency starts once the slot is held.
+    """
+
+    def request(self, method, url, *args, **kwargs):
+        endpoint = _endpoint_label(url)
+        with lanes.gate.slot():
+            start = time.perf_counter()
+            try:
+                with span(f"upstream {endpoint}", method=method.upper()):
+                    resp = super().request(method, url, *args, **kwargs)
+            except Exception:
+                UPSTREAM_LATENCY.observe(time.perf_counter() - start, endpoint=endpoint)
+                UPSTREAM_REQUESTS.inc(endpoint=endpoint, method=method.upper(), status='error')
+                raise
+        UPSTREAM_LATENCY.observe(time.perf_counter() - start, endpoint=endpoint)
+        UPSTREAM_REQUESTS.inc(endpoint=endpoint, method=method.upper(), status=str(resp.status_code))
+        if not kwargs.get('stream'):
+            UPSTREAM_BYTES.observe(len(resp.content), endpoint=endpoint)
+        return resp
+
+
+class UpstreamSession:
+    """One client's eCourts session: cookies (in its own requests session), app_token
+    and the last submitted case (replayed before order PDF fetches)."""
+
+    def __init__(self, session: requests.Session):
+        self.session = session
+        self.app_token = ""
+        self.initialized = False
+        self.last_case_context: Optional[Dict] = None
+        self.used_at = time.monotonic()
+
+
+# Cached dropdown levels, parent first; keys are the method arguments in order
+# (states: (), districts: (state,), complexes: (state, dist),
+#  case_types: (state, dist, complex, est_code, search_type)).
+CACHE_LEVELS = ('states', 'districts', 'complexes', 'case_types')
+
+
 class ECourtScraper:
+    """eCourts client shared by all API requests.
+
+    The CAPTCHA is bound to the upstream session cookie, so every API client (the
+    ``ecourts_client`` cookie, see main.py) gets its own :class:`UpstreamSession`,
+    selected through the ``current_client`` context variable. ``session``,
+    ``app_token``, ``_session_initialized`` and ``_last_case_context`` resolve to
+    the current client's; all sessions share one pooled transport adapter.
+    """
+
     def __init__(self):
-        self.session = self._create_optimized_session()
-        self.base_url = "https://services.ecourts.gov.in/"
-        self.app_token = ""
+        self._adapter = None
+        self._clients: 'OrderedDict[str, UpstreamSession]' = OrderedDict()
+        self._clients_lock = threading.Lock()
+        self._default = UpstreamSession(self._create_optimized_session())
+        # Overridable so the scraper can run against a local stand-in (benchmarks/fake_ecourts.py)
+        self.base_url = os.getenv('ECOURTS_BASE_URL', "https://services.ecourts.gov.in/").rstrip('/') + '/'
         self.timeout = 15 
         self.max_retries = 3
-        self.cache_timeout = 300  
-        self._session_initialized = False
-        self._last_case_context = None
-        
+        # TTL for cached dropdown lists (districts, complexes, case types)
+        self.cache_timeout = int(os.getenv('SCRAPER_CACHE_TTL', '21600'))
+        self.caches = {
+            name: TTLCache(name, self.cache_timeout)
+            for name in CACHE_LEVELS
+        }
+        # identical concurrent upstream lookups share one in-flight request
+        self.flights = SingleFlight()
+        # whether display_pdf order paths last resolved under ecourtindia_v6/ (tried first next time)
+        self._order_path_prefixed = False
+
+    def _upstream(self, client: Optional[str] = None) -> UpstreamSession:
+        """The upstream session of ``client`` (default: the current request's), created on first use."""
+        client = current_client.get() if client is None else client
+        if not client:
+            return self._default
+        now = time.monotonic()
+        with self._clients_lock:
+            up = self._clients.get(client)
+            if up is None:
+                up = self._clients[client] = UpstreamSession(self._create_optimized_session())
+            self._clients.move_to_end(client)
+            up.used_at = now
+            # least recently used first: drop idle sessions and keep the count bounded
+            while self._clients:
+                oldest, old = next(iter(self._clients.items()))
+                if oldest == client or (len(self._clients) <= CLIENT_SESSIONS_MAX
+                                        and now - old.used_at < CLIENT_SESSION_IDLE_SECONDS):
+                    break
+                del self._clients[oldest]
+            return up
+
+    def has_session(self, client: str) -> bool:
+        """Whether ``client`` already has an upstream session in this process."""
+        with self._clients_lock:
+            return not client or client in self._clients
+
+    @contextmanager
+    def client_session(self, client: str):
+        """Run the enclosed scraper calls in ``client``'s upstream session."""
+        token = current_client.set(client or '')
+        try:
+            yield
+        finally:
+            current_client.reset(token)
+
+    @property
+    def session(self) -> requests.Session:
+        return self._upstream().session
+
+    @session.setter
+    def session(self, value: requests.Session):
+        self._upstream().session = value
+
+    @property
+    def app_token(self) -> str:
+        return self._upstream().app_token
+
+    @app_token.setter
+    def app_token(self, value: str):
+        self._upstream().app_token = value
+
+    @property
+    def _session_initialized(self) -> bool:
+        return self._upstream().initialized
+
+    @_session_initialized.setter
+    def _session_initialized(self, value: bool):
+        self._upstream().initialized = value
+
+    @property
+    def _last_case_context(self) -> Optional[Dict]:
+        return self._upstream().last_case_context
+
+    @_last_case_context.setter
+    def _last_case_context(self, value: Optional[Dict]):
+        self._upstream().last_case_context = value
+
     def _create_optimized_session(self) -> requests.Session:
-        """Create session with pooling and retries."""
-        session = requests.Session()
-        
-        retry_strategy = Retry(
-            total=3,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "POST"],
-            backoff_factor=1
-        )
-        
-        adapter = HTTPAdapter(
-            max_retries=retry_strategy,
-            pool_connections=20,
-            pool_maxsize=20,
-            pool_block=False
-        )
-        
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
+        """Create a session (own cookie jar) on the shared pooled, retrying adapter."""
+        session = ScraperSession()
+        if self._adapter is None:
+            self._adapter = self._create_adapter()
+        session.mount("http://", self._adapter)
+        session.mount("https://", self._adapter)
         
         session.headers.update({
             'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -55,13 +261,31 @@ class ECourtScraper:
             'Upgrade-Insecure-Requests': '1',
             'Cache-Control': 'max-age=0'
         })
-        
-        
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
         session.verify = True 
         
         return session
+        
+    def _create_adapter(self) -> HTTPAdapter:
+        """Connection pool with retries, shared by every upstream session."""
+        retry_strategy = Retry(
+            total=3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["HEAD", "GET", "POST"],
+            backoff_factor=1
+        )
+        
+        adapter_kwargs = dict(
+            max_retries=retry_strategy,
+            pool_connections=20,
+            pool_maxsize=20,
+            pool_block=False
+        )
+        # ECOURTS_TRANSPORT=record|replay swaps in the cassette adapter (see transport.py)
+        adapter = adapter_from_env(**adapter_kwargs) or HTTPAdapter(**adapter_kwargs)
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        return adapter
     
+    @traced()
     def warm_session(self) -> bool:
         """Pre-warm the session for faster subsequent requests"""
         try:
@@ -77,10 +301,58 @@ class ECourtScraper:
             logger.warning(f"warm_session error: {e}")
             return False
     
+    def export_state(self, client: str = '') -> Dict:
+        """Serializable state of ``client``'s upstream session (cookies, token, last case context).
+
+        Used to share client sessions between worker processes so a CAPTCHA
+        fetched through one worker can be submitted through another.
+        """
+        up = self._upstream(client)
+        cookies = [
+            {'name': c.name, 'value': c.value, 'domain': c.domain, 'path': c.path,
+             'secure': c.secure, 'expires': c.expires}
+            for c in list(up.session.cookies)
+        ]
+        return {
+            'cookies': cookies,
+            'app_token': up.app_token,
+            'session_initialized': up.initialized,
+            'last_case_context': up.last_case_context,
+        }
+
+    def load_state(self, state: Dict, client: str = ''):
+        """Adopt state produced by :meth:`export_state` into ``client``'s session.
+
+        Cookies are updated in place (set, then stale ones removed), so a request
+        of the same client already running never sees an empty jar.
+        """
+        up = self._upstream(client)
+        jar = up.session.cookies
+        fresh = set()
+        for c in state.get('cookies') or []:
+            jar.set(c['name'], c['value'], domain=c.get('domain', ''), path=c.get('path', '/'),
+                    secure=c.get('secure', False), expires=c.get('expires'))
+            fresh.add((c.get('domain', ''), c.get('path', '/'), c['name']))
+        for c in list(jar):
+            if (c.domain, c.path, c.name) not in fresh:
+                jar.clear(c.domain, c.path, c.name)
+        up.app_token = state.get('app_token') or ''
+        up.initialized = bool(state.get('session_initialized'))
+        up.last_case_context = state.get('last_case_context')
+
     def clear_cache(self):
-        """Clear LRU caches"""
-        self.get_states.cache_clear()
-        self.get_case_types.cache_clear()
+        """Clear the dropdown caches (session, cookies and token are kept)"""
+        for cache in self.caches.values():
+            cache.clear()
+
+    def invalidate_cache(self, level: str, key_prefix: Tuple = ()) -> int:
+        """Drop entries of one cache level whose key starts with ``key_prefix``
+        (e.g. ``('complexes', ('3', '1'))`` for one district). Returns the count removed."""
+        return self.caches[level].invalidate_prefix(tuple(key_prefix))
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit/miss/size counters for the scraper caches (exported via /metrics)."""
+        return {name: cache.stats() for name, cache in self.caches.items()}
     
     def _get_fallback_districts(self, state_code: str) -> List[Dict[str, str]]:
         return []
@@ -132,6 +404,8 @@ class ECourtScraper:
             {"value": "38", "text": "Daman and Diu"},  
         ]
         
+    @coalesced(lambda: current_client.get())
+    @traced()
     def _initialize_session(self) -> bool:
         """Initialize session and get initial app_token for court order functionality"""
         if self._session_initialized:
@@ -167,6 +441,8 @@ class ECourtScraper:
             logger.warning(f"_initialize_session error: {e}")
             return False
 
+    @coalesced(lambda: current_client.get())
+    @traced()
     def _refresh_session(self) -> bool:
         """Attempt a lightweight session refresh when encountering a timeout.
 
@@ -181,18 +457,25 @@ class ECourtScraper:
                 if token_input and token_input.get('value'):
                     self.app_token = token_input['value']
                     logger.debug("_refresh_session: token refreshed in-place")
+                    TOKEN_REFRESHES.inc(mode='in_place', result='success')
                     return True
             logger.info("_refresh_session: falling back to full _initialize_session")
             # Full re-init path
             self.session = self._create_optimized_session()
             self._session_initialized = False
-            return self._initialize_session()
+            ok = self._initialize_session()
+            TOKEN_REFRESHES.inc(mode='full_reinit', result='success' if ok else 'failure')
+            return ok
         except Exception as e:
             logger.warning(f"_refresh_session error: {e}")
             self.session = self._create_optimized_session()
             self._session_initialized = False
-            return self._initialize_session()
+            ok = self._initialize_session()
+            TOKEN_REFRESHES.inc(mode='full_reinit', result='success' if ok else 'failure')
+            return ok
     
+    @traced()
+    @timed_parser
     def _parse_options(self, option_data) -> List[Dict[str, str]]:
         """Parse HTML option elements or other data structures into list of dictionaries"""
         options = []
@@ -202,24 +485,8 @@ class ECourtScraper:
             
             if isinstance(option_data, str) and option_data.strip():
                 
-                soup = BeautifulSoup(option_data, 'html.parser')
-                option_elements = soup.find_all('option')
-                
-                if option_elements:
-                    for option in option_elements:
-                        value = option.get('value', '').strip()
-                        text = option.get_text().strip()
-                        
-                        if value and value != '' and value != '0' and not text.lower().startswith('select'):
-                            if '@' in value:
-                                clean_value = value.split('@')[0]
-                            else:
-                                clean_value = value
-                            
-                            options.append({
-                                'value': clean_value,
-                                'text': text
-                            })
+                if OPTION_TAG_RE.search(option_data):
+                    options = list(iter_options(option_data, with_meta=False))
                 else:
                     lines = option_data.strip().split('\n')
                     for line in lines:
@@ -254,11 +521,20 @@ class ECourtScraper:
         
         return options
     
-    @lru_cache(maxsize=1)
     def get_states(self) -> Tuple[List[Dict[str, str]], str]:
         """Get list of available states for case status search with caching"""
+        states, token = self._fetch_states()
+        if not states:
+            # fallback list is served but never cached, so the next call retries upstream
+            return self._get_fallback_states(), token
+        return states, token
+
+    @cached_options('states')
+    @coalesced()
+    @traced('get_states')
+    def _fetch_states(self) -> Tuple[List[Dict[str, str]], str]:
         if not self._initialize_session():
-            return self._get_fallback_states(), ""
+            return [], ""
 
         url = f"{self.base_url}ecourtindia_v6/?p=casestatus/index"
 
@@ -337,12 +613,15 @@ class ECourtScraper:
                 except:
                     pass
             
-            return self._get_fallback_states(), self.app_token
+            return [], self.app_token
             
         except Exception as e:
             logger.warning(f"get_states error: {e}")
-            return self._get_fallback_states(), self.app_token
+            return [], self.app_token
     
+    @cached_options('districts')
+    @coalesced()
+    @traced()
     def get_districts(self, state_code: str) -> Tuple[List[Dict[str, str]], str]:
         """Get districts for a given state code using the correct casestatus endpoint"""
         if not self._initialize_session():
@@ -383,6 +662,9 @@ class ECourtScraper:
             logger.warning(f"get_districts error: {e}")
         return [], ''
     
+    @cached_options('complexes')
+    @coalesced()
+    @traced()
     def get_court_complexes(self, state_code: str, dist_code: str) -> Tuple[List[Dict[str, str]], str]:
         """Get court complexes for a given state and district for court order search"""
         if not self._initialize_session():
@@ -414,34 +696,14 @@ class ECourtScraper:
                                       json_response.get('court_complexes') or 
                                       json_response.get('data') or 
                                       json_response.get('result', ''))
-                        complexes = self._parse_options(complex_list)
-                        enriched = []
-                        raw_html = complex_list if isinstance(complex_list, str) else ""
-                        value_map: Dict[str, Dict[str,str]] = {}
-                        if raw_html:
-                            for m in re.finditer(r"<option[^>]*value=([\"']?)([^ >\"']+?)\1[^>]*>(.*?)</option>", raw_html, re.IGNORECASE):
-                                raw_val = m.group(2).strip()
-                                text = BeautifulSoup(m.group(3), 'html.parser').get_text(strip=True)
-                                parts = raw_val.split('@')
-                                base_code = parts[0]
-                                est_list = parts[1] if len(parts) > 1 else ''
-                                flag = parts[2] if len(parts) > 2 else ''
-                                value_map[base_code] = {
-                                    'raw_value': raw_val,
-                                    'est_list': est_list,
-                                    'flag': flag,
-                                    'text': text
-                                }
-                        for c in complexes:
-                            meta = value_map.get(c['value'], {})
-                            enriched.append({
-                                'value': c['value'],
-                                'text': c['text'],
-                                'raw_value': meta.get('raw_value', c['value']),
-                                'est_list': meta.get('est_list', ''),
-                                'flag': meta.get('flag', '')
-                            })
-                        complexes = enriched
+                        if isinstance(complex_list, str) and OPTION_TAG_RE.search(complex_list):
+                            # one pass: value, '@'-split metadata (est_list, flag) and text
+                            complexes = list(iter_options(complex_list))
+                        else:
+                            complexes = [
+                                {**c, 'raw_value': c['value'], 'est_list': '', 'flag': ''}
+                                for c in self._parse_options(complex_list)
+                            ]
                         new_token = (json_response.get('app_token') or 
                                    json_response.get('token') or 
                                    json_response.get('csrf_token', ''))
@@ -461,7 +723,9 @@ class ECourtScraper:
             logger.warning(f"get_court_complexes error: {e}")
             return [], ''
     
-    @lru_cache(maxsize=10)
+    @cached_options('case_types')
+    @coalesced()
+    @traced()
     def get_case_types(self, state_code: str, dist_code: str, court_complex_code: str, 
                       est_code: str = "", search_type: str = "c_no") -> Tuple[List[Dict[str, str]], str]:
         """Get case types for given parameters for court order search with caching"""
@@ -516,6 +780,12 @@ class ECourtScraper:
             logger.warning(f"get_case_types error: {e}")
             return [], ''
     
+    def fetch_captcha_image(self) -> requests.Response:
+        """GET a CAPTCHA image in the current client's session (initialized first, so the
+        code is issued to the same session the submit will use)."""
+        self._initialize_session()
+        return self.session.get(self.get_captcha_image_url(), timeout=self.timeout)
+
     def get_captcha_image_url(self) -> str:
         """(Legacy) Direct CAPTCHA image URL.
 
@@ -526,13 +796,32 @@ class ECourtScraper:
         random_param = ''.join(random.choices('0123456789abcdef', k=32))
         return f"{self.base_url}ecourtindia_v6/vendor/securimage/securimage_show.php?{random_param}"
     
+    @traced()
     def submit_case_status(self, state_code: str, dist_code: str, court_complex_code: str,
                            case_type: str, case_no: str, rgyear: str, captcha_code: str,
                            est_code: str = "null") -> Tuple[Dict, str]:
         """Submit case for status (casestatus/submitCaseNo) and return structured case data."""
-        if not self._initialize_session():
-            return {'success': False, 'message': 'Failed to initialize session'}, ''
+        result = ({'success': False, 'message': 'No result'}, self.app_token)
+        for event, data in self.iter_case_status(state_code, dist_code, court_complex_code, case_type,
+                                                 case_no, rgyear, captcha_code, est_code):
+            if event == 'result':
+                result = data
+        return result
 
+    def iter_case_status(self, state_code: str, dist_code: str, court_complex_code: str,
+                         case_type: str, case_no: str, rgyear: str, captcha_code: str,
+                         est_code: str = "null") -> Iterator[Tuple[str, object]]:
+        """submit_case_status as a stream of ``(event, data)`` pairs, for progressive display.
+
+        ``listing`` (case found, parties, court) comes as soon as the submitCaseNo
+        listing is parsed, before the politeness sleep and viewHistory. Once
+        viewHistory is parsed: ``details`` (summary fields, parties, acts,
+        processes), ``history`` and ``orders``. The last event is always
+        ``result``: the ``(result, app_token)`` pair submit_case_status returns.
+        """
+        if not self._initialize_session():
+            yield 'result', ({'success': False, 'message': 'Failed to initialize session'}, '')
+            return
         url = f"{self.base_url}ecourtindia_v6/?p=casestatus/submitCaseNo"
         payload = {
             'case_type': case_type,
@@ -549,14 +838,13 @@ class ECourtScraper:
         }
 
         try:
-            start = time.time()
             resp = self.session.post(
                 url, data=payload, timeout=self.timeout,
                 headers={'X-Requested-With': 'XMLHttpRequest'}
             )
-            dur = time.time() - start
             if resp.status_code != 200:
-                return ({'success': False, 'message': f'HTTP {resp.status_code}'}, self.app_token)
+                yield 'result', ({'success': False, 'message': f'HTTP {resp.status_code}'}, self.app_token)
+                return
 
             raw_text = resp.text
             
@@ -593,28 +881,31 @@ class ECourtScraper:
                 pass
 
             if not case_html:
-                return ({
+                yield 'result', ({
                     'success': False,
                     'message': 'Empty case listing',
                     'captcha_html': captcha_html,
                     'raw_snippet': raw_text[:500]
                 }, self.app_token)
+                return
 
             
             listing_struct = self._parse_case_listing(case_html)
 
             # Detect record not found placeholder
             try:
-                nf_soup = BeautifulSoup(case_html, 'html.parser')
-                text_all = nf_soup.get_text(' ').lower()
+                with span('not_found_check'):
+                    nf_soup = BeautifulSoup(case_html, 'html.parser')
+                    text_all = nf_soup.get_text(' ').lower()
                 if nf_soup.find(id='nodata') or 'record not found' in text_all:
-                    return ({
+                    yield 'result', ({
                         'success': False,
                         'message': 'Record not found',
                         'case_status_data': None,
                         'raw_html': case_html,
                         'captcha_html': captcha_html
                     }, self.app_token)
+                    return
             except Exception:
                 pass
 
@@ -639,8 +930,14 @@ class ECourtScraper:
                 'view_history': listing_struct.get('view_history', {}) or {}
             }
 
-            
+            yield 'listing', {
+                'success': True,
+                'message': 'Case found',
+                'case_status_data': {k: v for k, v in listing_struct.items() if k not in ('view_history', 'raw_html')},
+            }
+
             vh = listing_struct.get('view_history', {}) or {}
+            combined_result['view_history'] = vh
             case_no_vh = vh.get('case_no')
             cino_vh = vh.get('cino')
             court_code_vh = vh.get('court_code')
@@ -648,7 +945,8 @@ class ECourtScraper:
             if case_no_vh and cino_vh and court_code_vh:
                 try:
                     
-                    time.sleep(random.uniform(0.4, 0.9))
+                    with span('politeness_sleep'):
+                        time.sleep(random.uniform(0.4, 0.9))
                     details_resp, new_token2 = self.get_case_details(
                         court_code=court_code_vh,
                         state_code=state_code,
@@ -689,6 +987,9 @@ class ECourtScraper:
                             'interim_orders': case_details.get('interim_orders')
                         }
                         combined_result['case_status_data'] = summary
+                        yield 'details', {k: v for k, v in summary.items() if k not in ('case_history', 'interim_orders')}
+                        yield 'history', {'case_history': summary['case_history'] or []}
+                        yield 'orders', {'interim_orders': summary['interim_orders'] or []}
                     else:
                         combined_result['case_details_error'] = details_resp.get('message') if details_resp else 'Unknown details retrieval failure'
                 except Exception as e_det:
@@ -696,10 +997,12 @@ class ECourtScraper:
             else:
                 combined_result['case_details_error'] = 'viewHistory parameters not found in listing'
 
-            return (combined_result, self.app_token)
+            yield 'result', (combined_result, self.app_token)
         except Exception as e:
-            return ({'success': False, 'message': f'Exception: {e}'}, self.app_token)
+            yield 'result', ({'success': False, 'message': f'Exception: {e}'}, self.app_token)
 
+    @traced()
+    @timed_parser
     def _parse_case_listing(self, html: str) -> Dict:
         """Parse the submitCaseNo listing HTML into a structured dict.
         Extract case_type, case_number, petitioner, respondent, court_name & viewHistory params.
@@ -758,6 +1061,8 @@ class ECourtScraper:
         return data
         
     
+    @coalesced()
+    @traced()
     def get_case_details(self, court_code: str, state_code: str, dist_code: str, 
                         court_complex_code: str, case_no: str, cino: str,
                         search_flag: str = "CScaseNumber", search_by: str = "CScaseNumber") -> Tuple[Dict, str]:
@@ -785,14 +1090,12 @@ class ECourtScraper:
     
 
         try:
-            start_time = time.time()
             response = self.session.post(
                 url,
                 data=data,
                 timeout=self.timeout,
                 headers={'X-Requested-With': 'XMLHttpRequest'}
             )
-            response_time = time.time() - start_time
 
             if response.status_code == 200:
                 raw_text = response.text
@@ -836,316 +1139,11 @@ class ECourtScraper:
                 'message': 'Error getting case details'
             }, ''
 
+    @traced()
+    @timed_parser
     def _parse_case_details_html(self, html_content: str) -> Dict:
-        """Parse the detailed case information from viewHistory HTML response"""
-        try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            case_details = {
-                'case_number': '',
-                'case_type': '',
-                'filing_number': '',
-                'filing_date': '',
-                'registration_number': '',
-                'registration_date': '',
-                'cnr_number': '',
-                'court_name': '',
-                'judge': '',
-                'stage': '',
-                'next_date': '',
-                'first_hearing_date': '',
-                'petitioners': [],
-                'respondents': [],
-                'acts': [],
-                'processes': [],
-                'case_history': [],
-                'interim_orders': []
-            }
-
-            def normalize_label(s: str) -> str:
-                return re.sub(r'\s+', ' ', s.strip().lower().replace('\xa0', ' '))
-
-            def looks_like_date(val: str) -> bool:
-                return bool(re.fullmatch(r'\d{2}[-/]\d{2}[-/]\d{4}', val.strip())) or bool(re.fullmatch(r'\d{1,2}(st|nd|rd|th)\s+[A-Za-z]+\s+\d{4}', val.strip()))
-
-            
-            all_tables = soup.find_all('table')
-            for table in all_tables:
-                
-                headers = [normalize_label(th.get_text()) for th in table.find_all('th')]
-                if any(h for h in headers if 'process id' in h or 'order number' in h or 'business on date' in h):
-                    continue
-
-                rows = table.find_all('tr')
-                for row in rows:
-                    cells = row.find_all(['td', 'th'])
-                    if not cells:
-                        continue
-                    
-                    if len(cells) >= 4:
-                        
-                        for i in range(0, len(cells)-1, 2):
-                            label_raw = normalize_label(cells[i].get_text())
-                            value_raw = cells[i+1].get_text(strip=True)
-                            if not label_raw or not value_raw:
-                                continue
-                            
-                            if 'case type' in label_raw and not case_details['case_type']:
-                                case_details['case_type'] = value_raw
-                            elif 'filing number' in label_raw and not case_details['filing_number']:
-                                case_details['filing_number'] = value_raw
-                            elif 'filing date' in label_raw and not case_details['filing_date']:
-                                case_details['filing_date'] = value_raw
-                            elif 'registration number' in label_raw and not case_details['registration_number']:
-                                case_details['registration_number'] = value_raw
-                            elif 'registration date' in label_raw and not case_details['registration_date']:
-                                case_details['registration_date'] = value_raw
-                            elif 'cnr number' in label_raw and not case_details['cnr_number']:
-                                
-                                case_details['cnr_number'] = value_raw.split('(')[0].strip()
-                            elif ('court number and judge' in label_raw or 'court number' in label_raw) and not case_details['judge']:
-                                
-                                case_details['judge'] = value_raw
-                            elif ('next hearing date' in label_raw or 'next date' in label_raw) and not case_details['next_date']:
-                                case_details['next_date'] = value_raw
-                            elif 'first hearing' in label_raw and not case_details['first_hearing_date']:
-                                case_details['first_hearing_date'] = value_raw
-                            elif ('stage' in label_raw or 'case stage' in label_raw or 'status' in label_raw) and not case_details['stage']:
-                                case_details['stage'] = value_raw
-                    else:
-                        
-                        if len(cells) >= 2:
-                            label_raw = normalize_label(cells[0].get_text())
-                            value_raw = cells[1].get_text(strip=True)
-                            if not label_raw or not value_raw:
-                                continue
-                            if 'case type' in label_raw and not case_details['case_type']:
-                                case_details['case_type'] = value_raw
-                            elif 'filing number' in label_raw and not case_details['filing_number']:
-                                case_details['filing_number'] = value_raw
-                            elif 'filing date' in label_raw and not case_details['filing_date']:
-                                case_details['filing_date'] = value_raw
-                            elif 'registration number' in label_raw and not case_details['registration_number']:
-                                case_details['registration_number'] = value_raw
-                            elif 'registration date' in label_raw and not case_details['registration_date']:
-                                case_details['registration_date'] = value_raw
-                            elif 'cnr number' in label_raw and not case_details['cnr_number']:
-                                case_details['cnr_number'] = value_raw.split('(')[0].strip()
-                            elif ('court number and judge' in label_raw or 'court number' in label_raw) and not case_details['judge']:
-                                if not looks_like_date(value_raw):
-                                    case_details['judge'] = value_raw
-                            elif ('next hearing date' in label_raw or 'next date' in label_raw) and not case_details['next_date']:
-                                case_details['next_date'] = value_raw
-                            elif 'first hearing' in label_raw and not case_details['first_hearing_date']:
-                                case_details['first_hearing_date'] = value_raw
-                            elif ('stage' in label_raw or 'case stage' in label_raw or 'status' in label_raw) and not case_details['stage']:
-                                case_details['stage'] = value_raw
-
-            
-            heading = soup.find(id='chHeading') or soup.find('h2')
-            if heading:
-                heading_text = heading.get_text(" ", strip=True)
-                if heading_text:
-                    case_details['court_name'] = heading_text
-
-            
-            def extract_party(table, target_list):
-                if not table:
-                    return
-                cells = table.find_all('td')
-                for cell in cells:
-                    raw = cell.decode_contents().replace('<br/>', '\n').replace('<br />', '\n')
-                    text = BeautifulSoup(raw, 'html.parser').get_text('\n', strip=True)
-                    if not text:
-                        continue
-                    
-                    lines = [l.strip() for l in re.split(r'\n+', text) if l.strip()]
-                    buffer = ' '.join(lines)
-                    
-                    adv_split = re.split(r'advocate[-:]?', buffer, flags=re.I)
-                    if len(adv_split) >= 2:
-                        name = adv_split[0]
-                        advocate = adv_split[1]
-                        target_list.append({
-                            'name': re.sub(r'^\d+\)\s*', '', name).strip(' -:'),
-                            'advocate': advocate.strip(' -:')
-                        })
-                    else:
-                        target_list.append({
-                            'name': re.sub(r'^\d+\)\s*', '', buffer).strip(' -:'),
-                            'advocate': ''
-                        })
-
-            petitioner_table = soup.find('table', class_=re.compile(r'Petitioner_Advocate_table', re.I))
-            respondent_table = soup.find('table', class_=re.compile(r'Respondent_Advocate_table', re.I))
-            extract_party(petitioner_table, case_details['petitioners'])
-            extract_party(respondent_table, case_details['respondents'])
-
-            
-            for table in all_tables:
-                headers = [normalize_label(th.get_text()) for th in table.find_all('th')]
-                if headers and any('under act' in h or h == 'under act(s)' for h in headers):
-                    rows = table.find_all('tr')[1:]
-                    for row in rows:
-                        cells = row.find_all('td')
-                        if len(cells) >= 2:
-                            act_name = cells[0].get_text(strip=True)
-                            sections = cells[1].get_text(strip=True)
-                            if act_name and sections:
-                                case_details['acts'].append({'act_name': act_name, 'sections': sections})
-
-            
-            process_table = None
-            for t in all_tables:
-                if t.get('id') == 'process' or re.search(r'process', t.get_text(), re.I):
-                    ths = [normalize_label(th.get_text()) for th in t.find_all('th')]
-                    if any('process id' in th for th in ths):
-                        process_table = t
-                        break
-            if process_table:
-                
-                rows = process_table.find_all('tr')
-                if rows:
-                    
-                    data_tds = []
-                    for r in rows[1:]:
-                        tds = r.find_all('td')
-                        if tds:
-                            data_tds.extend(tds)
-                    
-                    if not data_tds:
-                        data_tds = process_table.find_all('td')
-                    chunks = [data_tds[i:i+3] for i in range(0, len(data_tds), 3)]
-                    for chunk in chunks:
-                        if len(chunk) >= 2:
-                            process_id = chunk[0].get_text(strip=True)
-                            process_title = chunk[1].get_text(strip=True)
-                            process_date = chunk[2].get_text(strip=True) if len(chunk) > 2 else ''
-                            if process_id or process_title:
-                                case_details['processes'].append({
-                                    'process_id': process_id,
-                                    'process_title': process_title,
-                                    'process_date': process_date
-                                })
-
-            
-            history_table = None
-            for t in all_tables:
-                if t.get('class') and any('history_table' in c for c in t.get('class', [])):
-                    history_table = t
-                    break
-                ths = [normalize_label(th.get_text()) for th in t.find_all('th')]
-                if ths and ('business on date' in ' '.join(ths) or 'hearing date' in ' '.join(ths)):
-                    history_table = t
-                    break
-            if history_table:
-                rows = history_table.find_all('tr')[1:]
-                for r in rows:
-                    cells = r.find_all('td')
-                    if len(cells) >= 3:
-                        judge = cells[0].get_text(strip=True)
-                        business_date = cells[1].get_text(strip=True)
-                        hearing_date = cells[2].get_text(strip=True)
-                        purpose = cells[3].get_text(strip=True) if len(cells) > 3 else ''
-                        case_details['case_history'].append({
-                            'judge': judge,
-                            'business_date': business_date,
-                            'hearing_date': hearing_date,
-                            'purpose_of_hearing': purpose
-                        })
-
-            
-            orders_table = None
-            for t in all_tables:
-                
-                ths = [normalize_label(th.get_text()) for th in t.find_all('th')]
-                if ths and any('order number' in h for h in ths):
-                    orders_table = t
-                    break
-                
-                if not ths:
-                    first_tr = t.find('tr')
-                    if first_tr:
-                        header_cells = [normalize_label(c.get_text()) for c in first_tr.find_all('td')]
-                        if header_cells and 'order number' in ' '.join(header_cells):
-                            orders_table = t
-                            break
-            if orders_table:
-                rows = orders_table.find_all('tr')
-                if rows:
-                    
-                    start_index = 1 if 'order number' in normalize_label(rows[0].get_text()) else 0
-                    for r in rows[start_index:]:
-                        cells = r.find_all('td')
-                        if len(cells) >= 2: 
-                            order_number = cells[0].get_text(strip=True)
-                            order_date = cells[1].get_text(strip=True) if len(cells) > 1 else ''
-                            
-                            details_cell = cells[2] if len(cells) > 2 else (cells[1] if len(cells) == 2 else None)
-                            order_details_text = ''
-                            pdf_url = ''
-                            if details_cell:
-                                
-                                anchor = details_cell.find('a', onclick=True)
-                                if anchor:
-                                    order_details_text = anchor.get_text(" ", strip=True)
-                                    onclick_val = anchor.get('onclick', '')
-                                    m_pdf = re.search(r"displayPdf\('([^']+)'", onclick_val)
-                                    if m_pdf:
-                                        pdf_url = m_pdf.group(1)
-                                if not order_details_text:
-                                    order_details_text = details_cell.get_text(" ", strip=True)
-                            
-                            if any([order_number, order_date, order_details_text]):
-                                # pdf_url currently holds the full raw argument passed to displayPdf('...')
-                                # Preserve it under a clearer key while keeping backward compatibility.
-                                case_details['interim_orders'].append({
-                                    'order_number': order_number.lstrip('\u00a0').strip(' .'),
-                                    'order_date': order_date.replace('\u00a0', ' ').strip(),
-                                    'order_details': order_details_text.replace('\u00a0', ' ').strip(),
-                                    'pdf_url': pdf_url,  # legacy key used by frontend
-                                    'display_pdf_arg': pdf_url  # new explicit key
-                                })
-
-            
-            text_block = soup.get_text(' ', strip=True)
-            if not case_details['cnr_number']:
-                m = re.search(r'\b([A-Z]{4}\d{10}\d{2}\d{4})\b', text_block)
-                if m:
-                    case_details['cnr_number'] = m.group(1)
-            if not case_details['filing_number']:
-                m = re.search(r'filing number\s*:?\s*([0-9/]+)', text_block, re.I)
-                if m:
-                    case_details['filing_number'] = m.group(1)
-            if not case_details['registration_number']:
-                m = re.search(r'registration number\s*:?\s*([0-9/]+)', text_block, re.I)
-                if m:
-                    case_details['registration_number'] = m.group(1)
-
-            return case_details
-            
-        except Exception:
-            return {
-                'case_number': '',
-                'case_type': '',
-                'filing_number': '',
-                'filing_date': '',
-                'registration_number': '',
-                'registration_date': '',
-                'cnr_number': '',
-                'court_name': '',
-                'judge': '',
-                'stage': '',
-                'next_date': '',
-                'first_hearing_date': '',
-                'petitioners': [],
-                'respondents': [],
-                'acts': [],
-                'processes': [],
-                'case_history': [],
-                'interim_orders': [],
-                'error': 'Parsing failed'
-            }
+        """Parse viewHistory HTML; large pages are parsed in the process pool (parsing.py)"""
+        return parsing.run(parse_case_details_html, html_content)
     
     def scrape_case_info(self, state_code: str, district_code: str, court_complex_code: str,
                         case_type: str, case_number: str, registration_year: str, 
@@ -1171,7 +1169,10 @@ class ECourtScraper:
         
         return result
 
-    def fetch_order_pdf(self, pdf_request: str) -> Tuple[Optional[bytes], str, str]:
+    @coalesced()
+    @traced()
+    def fetch_order_pdf(self, pdf_request: str, state_code: str = '', dist_code: str = '',
+                        cino: str = '') -> Tuple[Optional[bytes], str, str]:
         """Fetch an interim order PDF using the raw argument extracted from displayPdf().
 
         The incoming string typically looks like:
@@ -1184,6 +1185,12 @@ class ECourtScraper:
           4. The response is JSON with an 'order' field that points to a reports/<session>.pdf path
           5. Perform a GET to that path (relative to base_url) to obtain the actual PDF bytes.
 
+        Ways of getting the PDF (direct filename GET, display_pdf GET, display_pdf POST)
+        are tried winner-first per court (see ``_pdf_scope`` and ``pdf_strategy``). The
+        case's ``cino`` or ``state_code``/``dist_code`` scope the learning, since the
+        displayPdf() argument rarely carries them. The GETs are only raced once a learned
+        winner has failed; a first fetch tries the direct filename GET alone, then the POST.
+
         Returns: (pdf_bytes_or_None, download_filename, new_app_token_or_existing)
         """
         if not pdf_request:
@@ -1201,7 +1208,9 @@ class ECourtScraper:
                 pdf_url = f"{self.base_url}{rel}"
                 pdf_resp = self.session.get(pdf_url, timeout=self.timeout, headers={'Referer': self.base_url})
                 if pdf_resp.status_code == 200 and pdf_resp.content.startswith(b'%PDF'):
+                    PDF_STEPS.inc(step='direct_path', outcome='success')
                     return pdf_resp.content, rel.split('/')[-1], self.app_token
+                PDF_STEPS.inc(step='direct_path', outcome='failure')
                 logger.warning(f"fetch_order_pdf direct path failed status={pdf_resp.status_code}")
                 return None, '', self.app_token
 
@@ -1215,185 +1224,580 @@ class ECourtScraper:
             base_endpoint = f"{self.base_url}ecourtindia_v6/?p={path_part}"
             full_url_initial = base_endpoint + (f"&{query_rest}" if query_rest else '')
 
-            # NEW: try direct filename param (e.g. filename=/orders/2025/....pdf) before invoking display_pdf
-            if query_rest:
-                m_fname = re.search(r"filename=([^&]+)", query_rest)
-                if m_fname:
-                    raw_fname = m_fname.group(1)
-                    # URL decode minimal (%2F etc.)
-                    try:
-                        from urllib.parse import unquote
-                        raw_fname = unquote(raw_fname)
-                    except Exception:
-                        pass
-                    if re.match(r"^/?(orders|reports)/.+\.pdf$", raw_fname.lower()):
-                        direct_rel = raw_fname.lstrip('/')
-                        direct_url = f"{self.base_url}{direct_rel}"
-                        logger.debug(f"fetch_order_pdf direct filename attempt {direct_url}")
-                        resp_direct = self.session.get(direct_url, timeout=self.timeout, headers={'Referer': self.base_url})
-                        if resp_direct.status_code == 200 and resp_direct.content.startswith(b'%PDF'):
-                            return resp_direct.content, direct_rel.split('/')[-1], self.app_token
-                        else:
-                            logger.debug(f"fetch_order_pdf direct filename attempt failed status={resp_direct.status_code}")
-
-            def attempt_post(url: str) -> Tuple[Optional[Dict], str]:
-                # Parse query params so we can redundantly send them as form fields (some backends require this duplication)
-                query_params: Dict[str, str] = {}
-                if '?' in url:
-                    # Extract the part after '?p=...' we've already assembled; safer to rebuild from original query_rest
-                    if query_rest:
-                        for kv in query_rest.split('&'):
-                            if '=' in kv:
-                                k, v = kv.split('=', 1)
-                                if k and v:
-                                    from urllib.parse import unquote
-                                    query_params[k] = unquote(v)
-                post_data_local = {**query_params,
-                                   'ajax_req': 'true',
-                                   'app_token': self.app_token or ''}
-                logger.debug(f"fetch_order_pdf POST {url} form_keys={list(post_data_local.keys())}")
-                headers = {
-                    'X-Requested-With': 'XMLHttpRequest',
-                    'Referer': f"{self.base_url}ecourtindia_v6/?p=casestatus/index",
-                    'Origin': self.base_url.rstrip('/'),
-                    'Accept': 'application/json, text/javascript, */*; q=0.01',
-                }
-                resp_local = self.session.post(url, data=post_data_local, timeout=self.timeout, headers=headers)
-                if resp_local.status_code != 200:
-                    logger.warning(f"fetch_order_pdf upstream status {resp_local.status_code}")
-                    return None, ''
+            # Try whichever strategy last worked for this court first; race the other GETs
+            # only when that fails, so a fetch costs one upstream GET in the common case.
+            scope = self._pdf_scope(query_rest, state_code, dist_code, cino)
+            learned = pdf_strategy.winner(scope)
+            PDF_STEPS.inc(step='learned', outcome='hit' if learned else 'miss')
+            get_attempts = []
+            direct_rel = self._order_filename(query_rest)
+            if direct_rel:
+                get_attempts.append((pdf_strategy.DIRECT_FILENAME, f"{self.base_url}{direct_rel}", {'Referer': self.base_url}))
+            get_attempts.append((pdf_strategy.GET_FALLBACK, full_url_initial,
+                                 {'Referer': f"{self.base_url}ecourtindia_v6/?p=casestatus/index"}))
+
+            gets_raced = False
+            if learned in pdf_strategy.GET_STRATEGIES:
+                found = self._race_order_pdf(scope, [a for a in get_attempts if a[0] == learned])
+                if found:
+                    return found[0], found[1], self.app_token
+                pdf_strategy.forget(scope, learned)
+                get_attempts = [a for a in get_attempts if a[0] != learned]
+                found = self._race_order_pdf(scope, get_attempts)
+                if found:
+                    return found[0], found[1], self.app_token
+                gets_raced = True
+            elif learned == pdf_strategy.DISPLAY_PDF:
+                # learned fast path: bare POST, no viewHistory preflight or cookie refresh
+                order_json, _ = self._post_display_pdf(full_url_initial, query_rest)
+                order_path = (order_json or {}).get('order') or ''
+                if order_path.lower().endswith('.pdf'):
+                    PDF_STEPS.inc(step='display_pdf_post', outcome='success')
+                    found = self._order_pdf_at(order_path)
+                    if found:
+                        return found[0], found[1], self.app_token
+                else:
+                    PDF_STEPS.inc(step='display_pdf_post', outcome='no_order' if order_json else 'failure')
+                pdf_strategy.forget(scope, learned)
+                found = self._race_order_pdf(scope, get_attempts)
+                if found:
+                    return found[0], found[1], self.app_token
+                gets_raced = True
+            elif learned is None and direct_rel:
+                # first fetch in this scope: the direct filename GET alone, then the POST flow
+                found = self._race_order_pdf(scope, get_attempts[:1])
+                if found:
+                    return found[0], found[1], self.app_token
+                get_attempts = get_attempts[1:]
+
+            order_json, attempts, bare = self._display_pdf_with_retries(full_url_initial, query_rest)
+            order_path = (order_json or {}).get('order')
+            if order_path and order_path.lower().endswith('.pdf'):
+                found = self._order_pdf_at(order_path)
+                if found:
+                    pdf_strategy.record(scope, pdf_strategy.DISPLAY_PDF if bare else pdf_strategy.DISPLAY_PDF_FULL)
+                    return found[0], found[1], self.app_token
+                return None, '', self.app_token
+
+            if learned == pdf_strategy.DISPLAY_PDF_FULL:
+                pdf_strategy.forget(scope, learned)
+            # Final fallback: the GET variant (some deployments return raw PDF or JSON), unless it
+            # was already raced above against an unchanged session
+            if not gets_raced or not bare:
+                found = self._race_order_pdf(scope, [a for a in get_attempts if a[0] == pdf_strategy.GET_FALLBACK])
+                if found:
+                    return found[0], found[1], self.app_token
+            if order_json:
+                logger.warning(f"fetch_order_pdf: invalid order path in json after {attempts} attempt(s): {order_json}")
+            return None, '', self.app_token
+        except Exception as e:
+            logger.warning(f"fetch_order_pdf error: {e}")
+            return None, '', self.app_token
+
+    @staticmethod
+    def _pdf_scope(query_rest: str, state_code: str = '', dist_code: str = '',
+                   cino: str = '') -> Tuple[str, str, str]:
+        """(state, district, court_code) a display_pdf request belongs to, for strategy learning.
+
+        State and district come from the case's CNR prefix (e.g. ``MH`` + ``AU`` of
+        ``MHAU01...``) when given, else from the caller's codes, else from the displayPdf()
+        argument; never from the session's last case context, which belongs to whichever
+        user submitted last.
+        """
+        def param(*names: str) -> str:
+            for name in names:
+                m = re.search(rf"(?:^|&){name}=([^&]*)", query_rest or '')
+                if m:
+                    return unquote(m.group(1))
+            return ''
+        court = param('court_code', 'cCode')
+        cino = (cino or '').strip().upper()
+        if len(cino) >= 4:
+            return cino[:2], cino[2:4], court
+        return (state_code or param('state_code', 'state_cd'),
+                dist_code or param('dist_code', 'district_code'), court)
+
+    @staticmethod
+    def _order_filename(query_rest: str) -> str:
+        """The orders/ or reports/ path in a display_pdf ``filename=`` parameter, if any."""
+        m_fname = re.search(r"filename=([^&]+)", query_rest or '')
+        if not m_fname:
+            return ''
+        raw_fname = unquote(m_fname.group(1))
+        if re.match(r"^/?(orders|reports)/.+\.pdf$", raw_fname.lower()):
+            return raw_fname.lstrip('/')
+        return ''
+
+    def _race_order_pdf(self, scope: Tuple[str, str, str], attempts: List[Tuple[str, str, dict]]) -> Optional[Tuple[bytes, str]]:
+        """Race GET strategies; on a PDF (directly or via a JSON order path) record the winner."""
+        result = pdf_strategy.race(self.session.get, attempts, self.timeout)
+        if result is None:
+            return None
+        if result.response is None:
+            found = self._order_pdf_at(result.order_path)
+        else:
+            path = urlsplit(result.url).path
+            found = result.content(), path.split('/')[-1] if path.lower().endswith('.pdf') else 'order.pdf'
+        if found:
+            pdf_strategy.record(scope, result.strategy)
+        return found
+
+    def _order_pdf_at(self, order_path: str) -> Optional[Tuple[bytes, str]]:
+        """GET the PDF display_pdf pointed at; the URL layout that last worked first, the other on failure."""
+        order_path_clean = order_path.lstrip('/')
+        headers = {'Referer': self.base_url}
+        candidates = [(False, f"{self.base_url}{order_path_clean}")]
+        # Some deployments may require ecourtindia_v6 prefix before reports path
+        if not order_path_clean.startswith('ecourtindia_v6/'):
+            candidates.append((True, f"{self.base_url}ecourtindia_v6/{order_path_clean}"))
+            if self._order_path_prefixed:
+                candidates.reverse()
+        for prefixed, url in candidates:
+            result = pdf_strategy.race(self.session.get, [('candidate_url', url, headers)], self.timeout)
+            if result is not None and result.response is not None:
+                self._order_path_prefixed = prefixed
+                return result.content(), order_path.split('/')[-1]
+        logger.warning(f"fetch_order_pdf: downstream not PDF; tried: {'; '.join(c[1] for c in candidates)}")
+        return None
+
+    def _post_display_pdf(self, url: str, query_rest: str) -> Tuple[Optional[Dict], str]:
+        # Send the query params redundantly as form fields (some backends require this duplication)
+        query_params: Dict[str, str] = {}
+        for kv in (query_rest or '').split('&'):
+            if '=' in kv:
+                k, v = kv.split('=', 1)
+                if k and v:
+                    query_params[k] = unquote(v)
+        post_data_local = {**query_params,
+                           'ajax_req': 'true',
+                           'app_token': self.app_token or ''}
+        logger.debug(f"fetch_order_pdf POST {url} form_keys={list(post_data_local.keys())}")
+        headers = {
+            'X-Requested-With': 'XMLHttpRequest',
+            'Referer': f"{self.base_url}ecourtindia_v6/?p=casestatus/index",
+            'Origin': self.base_url.rstrip('/'),
+            'Accept': 'application/json, text/javascript, */*; q=0.01',
+        }
+        resp_local = self.session.post(url, data=post_data_local, timeout=self.timeout, headers=headers)
+        if resp_local.status_code != 200:
+            logger.warning(f"fetch_order_pdf upstream status {resp_local.status_code}")
+            return None, ''
+        try:
+            js = resp_local.json()
+        except Exception:
+            logger.warning("fetch_order_pdf: response not JSON parseable")
+            return None, ''
+        new_tok = js.get('app_token') or ''
+        if new_tok:
+            self.app_token = new_tok
+        return js, new_tok
+
+    def _display_pdf_with_retries(self, url_to_use: str, query_rest: str) -> Tuple[Optional[Dict], int, bool]:
+        """The display_pdf POST with viewHistory preflight, context replay and session refresh.
+
+        Returns (order_json, attempts, bare), bare meaning the first POST succeeded
+        without a preflight, replay or refresh.
+        """
+        # Try up to 2 attempts (initial + one retry on session timeout)
+        attempts = 0
+        order_json: Optional[Dict] = None
+        bare = True
+
+        # PRE-FLIGHT: If we have stored view_history context, invoke viewHistory to rebuild the detailed session context
+        vh_ctx = None
+        try:
+            if self._last_case_context and isinstance(self._last_case_context, dict):
+                vh_ctx = self._last_case_context.get('view_history') or None
+            if vh_ctx and {'case_no','cino','court_code'} <= set(vh_ctx.keys()):
+                logger.debug("fetch_order_pdf preflight: invoking viewHistory")
+                PDF_STEPS.inc(step='preflight_view_history', outcome='attempt')
+                bare = False
                 try:
-                    js = resp_local.json()
-                except Exception:
-                    logger.warning("fetch_order_pdf: response not JSON parseable")
-                    return None, ''
-                new_tok = js.get('app_token') or ''
-                if new_tok:
-                    self.app_token = new_tok
-                return js, new_tok
-
-            # Try up to 2 attempts (initial + one retry on session timeout)
-            attempts = 0
-            order_json: Optional[Dict] = None
-            url_to_use = full_url_initial
-
-            # PRE-FLIGHT: If we have stored view_history context, invoke viewHistory to rebuild the detailed session context
-            vh_ctx = None
+                    self.get_case_details(
+                        court_code=vh_ctx['court_code'],
+                        state_code=self._last_case_context['state_code'],
+                        dist_code=self._last_case_context['dist_code'],
+                        court_complex_code=self._last_case_context['court_complex_code'],
+                        case_no=vh_ctx['case_no'],
+                        cino=vh_ctx['cino'],
+                        search_flag='CScaseNumber',
+                        search_by='CScaseNumber'
+                    )
+                except Exception as e_vh:
+                    logger.debug(f"fetch_order_pdf preflight viewHistory error: {e_vh}")
+        except Exception:
+            pass
+        while attempts < 2:
+            # Preflight each attempt with a light touch to keep cookies fresh (GET the case status index)
             try:
-                if self._last_case_context and isinstance(self._last_case_context, dict):
-                    vh_ctx = self._last_case_context.get('view_history') or None
-                if vh_ctx and {'case_no','cino','court_code'} <= set(vh_ctx.keys()):
-                    logger.debug("fetch_order_pdf preflight: invoking viewHistory")
-                    try:
-                        self.get_case_details(
-                            court_code=vh_ctx['court_code'],
-                            state_code=self._last_case_context['state_code'],
-                            dist_code=self._last_case_context['dist_code'],
-                            court_complex_code=self._last_case_context['court_complex_code'],
-                            case_no=vh_ctx['case_no'],
-                            cino=vh_ctx['cino'],
-                            search_flag='CScaseNumber',
-                            search_by='CScaseNumber'
-                        )
-                    except Exception as e_vh:
-                        logger.debug(f"fetch_order_pdf preflight viewHistory error: {e_vh}")
+                self.session.get(f"{self.base_url}ecourtindia_v6/?p=casestatus/index", timeout=8)
             except Exception:
                 pass
-            while attempts < 2:
-                # Preflight each attempt with a light touch to keep cookies fresh (GET the case status index)
-                try:
-                    self.session.get(f"{self.base_url}ecourtindia_v6/?p=casestatus/index", timeout=8)
-                except Exception:
-                    pass
-                order_json, _ = attempt_post(url_to_use)
-                attempts += 1
-                if not order_json:
-                    break
-                order_path = order_json.get('order')
-                if order_path and order_path.lower().endswith('.pdf'):
-                    break  # success path acquired
-                err_msg = (order_json.get('errormsg') or '').lower()
-                # If invalid request or timeout, attempt to replay last case context before retry
-                if attempts < 2 and (('invalid request' in err_msg) or ('session timeout' in err_msg)) and self._last_case_context:
-                    logger.info("fetch_order_pdf: attempting context replay before retry")
-                    ctx = self._last_case_context
-                    try:
-                        # We cannot redo captcha, but server may allow reusing existing context if cookies persist
-                        replay_payload = {
-                            'case_type': ctx['case_type'],
-                            'search_case_no': ctx['case_no'],
-                            'rgyear': ctx['rgyear'],
-                            'case_captcha_code': '',  # empty on replay
-                            'state_code': ctx['state_code'],
-                            'dist_code': ctx['dist_code'],
-                            'court_complex_code': ctx['court_complex_code'],
-                            'est_code': ctx.get('est_code', 'null'),
-                            'case_no': ctx['case_no'],
-                            'ajax_req': 'true',
-                            'app_token': self.app_token or ''
-                        }
-                        replay_url = f"{self.base_url}ecourtindia_v6/?p=casestatus/submitCaseNo"
-                        r_resp = self.session.post(replay_url, data=replay_payload, timeout=self.timeout, headers={'X-Requested-With': 'XMLHttpRequest'})
-                        if r_resp.status_code == 200:
-                            try:
-                                rj = r_resp.json()
-                                nt = rj.get('app_token')
-                                if nt:
-                                    self.app_token = nt
-                            except Exception:
-                                pass
-                    except Exception as e_replay:
-                        logger.debug(f"fetch_order_pdf replay error: {e_replay}")
-                if 'session timeout' in err_msg and attempts < 2:
-                    logger.info("fetch_order_pdf: session timeout detected, attempting _refresh_session and retrying once")
-                    if self._refresh_session():
-                        continue
-                # If not a session timeout or already retried, stop loop
-                break
-
+            order_json, _ = self._post_display_pdf(url_to_use, query_rest)
+            attempts += 1
             if not order_json:
-                return None, '', self.app_token
+                PDF_STEPS.inc(step='display_pdf_post', outcome='failure')
+                break
             order_path = order_json.get('order')
-            if not order_path or not order_path.lower().endswith('.pdf'):
-                # Final fallback: try GET variant (some deployments use GET returning raw PDF or JSON)
+            if order_path and order_path.lower().endswith('.pdf'):
+                PDF_STEPS.inc(step='display_pdf_post', outcome='success')
+                break  # success path acquired
+            PDF_STEPS.inc(step='display_pdf_post', outcome='no_order')
+            bare = False
+            err_msg = (order_json.get('errormsg') or '').lower()
+            # If invalid request or timeout, attempt to replay last case context before retry
+            if attempts < 2 and (('invalid request' in err_msg) or ('session timeout' in err_msg)) and self._last_case_context:
+                logger.info("fetch_order_pdf: attempting context replay before retry")
+                PDF_STEPS.inc(step='context_replay', outcome='attempt')
+                ctx = self._last_case_context
                 try:
-                    headers_get = {'Referer': f"{self.base_url}ecourtindia_v6/?p=casestatus/index"}
-                    logger.debug("fetch_order_pdf attempting GET fallback for display_pdf")
-                    get_resp = self.session.get(full_url_initial, timeout=self.timeout, headers=headers_get)
-                    if get_resp.status_code == 200:
-                        # Try interpret as JSON
+                    # We cannot redo captcha, but server may allow reusing existing context if cookies persist
+                    replay_payload = {
+                        'case_type': ctx['case_type'],
+                        'search_case_no': ctx['case_no'],
+                        'rgyear': ctx['rgyear'],
+                        'case_captcha_code': '',  # empty on replay
+                        'state_code': ctx['state_code'],
+                        'dist_code': ctx['dist_code'],
+                        'court_complex_code': ctx['court_complex_code'],
+                        'est_code': ctx.get('est_code', 'null'),
+                        'case_no': ctx['case_no'],
+                        'ajax_req': 'true',
+                        'app_token': self.app_token or ''
+                    }
+                    replay_url = f"{self.base_url}ecourtindia_v6/?p=casestatus/submitCaseNo"
+                    r_resp = self.session.post(replay_url, data=replay_payload, timeout=self.timeout, headers={'X-Requested-With': 'XMLHttpRequest'})
+                    if r_resp.status_code == 200:
                         try:
-                            js2 = get_resp.json()
-                            alt_path = js2.get('order')
-                            if alt_path and alt_path.lower().endswith('.pdf'):
-                                order_path = alt_path
+                            rj = r_resp.json()
+                            nt = rj.get('app_token')
+                            if nt:
+                                self.app_token = nt
                         except Exception:
-                            # Maybe it's a PDF outright
-                            if get_resp.content.startswith(b'%PDF'):
-                                fname_guess = 'order.pdf'
-                                return get_resp.content, fname_guess, self.app_token
-                except Exception as eg:
-                    logger.debug(f"fetch_order_pdf GET fallback error: {eg}")
-                if not order_path or not order_path.lower().endswith('.pdf'):
-                    logger.warning(f"fetch_order_pdf: invalid order path in json after {attempts} attempt(s): {order_json}")
-                    return None, '', self.app_token
-
-            order_path_clean = order_path.lstrip('/')
-            candidates = [
-                f"{self.base_url}{order_path_clean}",
-                # Some deployments may require ecourtindia_v6 prefix before reports path
-                f"{self.base_url}ecourtindia_v6/{order_path_clean}" if not order_path_clean.startswith('ecourtindia_v6/') else None
-            ]
-            tried_errors = []
-            for cand in [c for c in candidates if c]:
-                pdf_resp = self.session.get(cand, timeout=self.timeout, headers={'Referer': self.base_url})
-                if pdf_resp.status_code == 200 and (pdf_resp.headers.get('Content-Type','').lower().startswith('application/pdf') or pdf_resp.content.startswith(b'%PDF')):
-                    filename = order_path.split('/')[-1]
-                    return pdf_resp.content, filename, self.app_token
-                tried_errors.append(f"{cand} -> {pdf_resp.status_code}")
-            logger.warning(f"fetch_order_pdf: downstream not PDF; tried: {'; '.join(tried_errors)}")
-            return None, '', self.app_token
-            # (Unreachable due to returns above)
-        except Exception as e:
-            logger.warning(f"fetch_order_pdf error: {e}")
-            return None, '', self.app_token
\ No newline at end of file
+                            pass
+                except Exception as e_replay:
+                    logger.debug(f"fetch_order_pdf replay error: {e_replay}")
+            if 'session timeout' in err_msg and attempts < 2:
+                logger.info("fetch_order_pdf: session timeout detected, attempting _refresh_session and retrying once")
+                if self._refresh_session():
+                    PDF_STEPS.inc(step='session_refresh', outcome='success')
+                    continue
+                PDF_STEPS.inc(step='session_refresh', outcome='failure')
+            # If not a session timeout or already retried, stop loop
+            break
+        return order_json, attempts, bare
+
+
+def parse_case_details_html(html_content: str) -> Dict:
+    """Parse the detailed case information from viewHistory HTML response.
+
+    Module-level (no scraper state) so it can run in the parse process pool.
+    """
+    try:
+        soup = BeautifulSoup(html_content, 'html.parser')
+        
+        case_details = {
+            'case_number': '',
+            'case_type': '',
+            'filing_number': '',
+            'filing_date': '',
+            'registration_number': '',
+            'registration_date': '',
+            'cnr_number': '',
+            'court_name': '',
+            'judge': '',
+            'stage': '',
+            'next_date': '',
+            'first_hearing_date': '',
+            'petitioners': [],
+            'respondents': [],
+            'acts': [],
+            'processes': [],
+            'case_history': [],
+            'interim_orders': []
+        }
+
+        def normalize_label(s: str) -> str:
+            return re.sub(r'\s+', ' ', s.strip().lower().replace('\xa0', ' '))
+
+        def looks_like_date(val: str) -> bool:
+            return bool(re.fullmatch(r'\d{2}[-/]\d{2}[-/]\d{4}', val.strip())) or bool(re.fullmatch(r'\d{1,2}(st|nd|rd|th)\s+[A-Za-z]+\s+\d{4}', val.strip()))
+
+        
+        all_tables = soup.find_all('table')
+        for table in all_tables:
+            
+            headers = [normalize_label(th.get_text()) for th in table.find_all('th')]
+            if any(h for h in headers if 'process id' in h or 'order number' in h or 'business on date' in h):
+                continue
+
+            rows = table.find_all('tr')
+            for row in rows:
+                cells = row.find_all(['td', 'th'])
+                if not cells:
+                    continue
+                
+                if len(cells) >= 4:
+                    
+                    for i in range(0, len(cells)-1, 2):
+                        label_raw = normalize_label(cells[i].get_text())
+                        value_raw = cells[i+1].get_text(strip=True)
+                        if not label_raw or not value_raw:
+                            continue
+                        
+                        if 'case type' in label_raw and not case_details['case_type']:
+                            case_details['case_type'] = value_raw
+                        elif 'filing number' in label_raw and not case_details['filing_number']:
+                            case_details['filing_number'] = value_raw
+                        elif 'filing date' in label_raw and not case_details['filing_date']:
+                            case_details['filing_date'] = value_raw
+                        elif 'registration number' in label_raw and not case_details['registration_number']:
+                            case_details['registration_number'] = value_raw
+                        elif 'registration date' in label_raw and not case_details['registration_date']:
+                            case_details['registration_date'] = value_raw
+                        elif 'cnr number' in label_raw and not case_details['cnr_number']:
+                            
+                            case_details['cnr_number'] = value_raw.split('(')[0].strip()
+                        elif ('court number and judge' in label_raw or 'court number' in label_raw) and not case_details['judge']:
+                            
+                            case_details['judge'] = value_raw
+                        elif ('next hearing date' in label_raw or 'next date' in label_raw) and not case_details['next_date']:
+                            case_details['next_date'] = value_raw
+                        elif 'first hearing' in label_raw and not case_details['first_hearing_date']:
+                            case_details['first_hearing_date'] = value_raw
+                        elif ('stage' in label_raw or 'case stage' in label_raw or 'status' in label_raw) and not case_details['stage']:
+                            case_details['stage'] = value_raw
+                else:
+                    
+                    if len(cells) >= 2:
+                        label_raw = normalize_label(cells[0].get_text())
+                        value_raw = cells[1].get_text(strip=True)
+                        if not label_raw or not value_raw:
+                            continue
+                        if 'case type' in label_raw and not case_details['case_type']:
+                            case_details['case_type'] = value_raw
+                        elif 'filing number' in label_raw and not case_details['filing_number']:
+                            case_details['filing_number'] = value_raw
+                        elif 'filing date' in label_raw and not case_details['filing_date']:
+                            case_details['filing_date'] = value_raw
+                        elif 'registration number' in label_raw and not case_details['registration_number']:
+                            case_details['registration_number'] = value_raw
+                        elif 'registration date' in label_raw and not case_details['registration_date']:
+                            case_details['registration_date'] = value_raw
+                        elif 'cnr number' in label_raw and not case_details['cnr_number']:
+                            case_details['cnr_number'] = value_raw.split('(')[0].strip()
+                        elif ('court number and judge' in label_raw or 'court number' in label_raw) and not case_details['judge']:
+                            if not looks_like_date(value_raw):
+                                case_details['judge'] = value_raw
+                        elif ('next hearing date' in label_raw or 'next date' in label_raw) and not case_details['next_date']:
+                            case_details['next_date'] = value_raw
+                        elif 'first hearing' in label_raw and not case_details['first_hearing_date']:
+                            case_details['first_hearing_date'] = value_raw
+                        elif ('stage' in label_raw or 'case stage' in label_raw or 'status' in label_raw) and not case_details['stage']:
+                            case_details['stage'] = value_raw
+
+        
+        heading = soup.find(id='chHeading') or soup.find('h2')
+        if heading:
+            heading_text = heading.get_text(" ", strip=True)
+            if heading_text:
+                case_details['court_name'] = heading_text
+
+        
+        def extract_party(table, target_list):
+            if not table:
+                return
+            cells = table.find_all('td')
+            for cell in cells:
+                raw = cell.decode_contents().replace('<br/>', '\n').replace('<br />', '\n')
+                text = BeautifulSoup(raw, 'html.parser').get_text('\n', strip=True)
+                if not text:
+                    continue
+                
+                lines = [l.strip() for l in re.split(r'\n+', text) if l.strip()]
+                buffer = ' '.join(lines)
+                
+                adv_split = re.split(r'advocate[-:]?', buffer, flags=re.I)
+                if len(adv_split) >= 2:
+                    name = adv_split[0]
+                    advocate = adv_split[1]
+                    target_list.append({
+                        'name': re.sub(r'^\d+\)\s*', '', name).strip(' -:'),
+                        'advocate': advocate.strip(' -:')
+                    })
+                else:
+                    target_list.append({
+                        'name': re.sub(r'^\d+\)\s*', '', buffer).strip(' -:'),
+                        'advocate': ''
+                    })
+
+        petitioner_table = soup.find('table', class_=re.compile(r'Petitioner_Advocate_table', re.I))
+        respondent_table = soup.find('table', class_=re.compile(r'Respondent_Advocate_table', re.I))
+        extract_party(petitioner_table, case_details['petitioners'])
+        extract_party(respondent_table, case_details['respondents'])
+
+        
+        for table in all_tables:
+            headers = [normalize_label(th.get_text()) for th in table.find_all('th')]
+            if headers and any('under act' in h or h == 'under act(s)' for h in headers):
+                rows = table.find_all('tr')[1:]
+                for row in rows:
+                    cells = row.find_all('td')
+                    if len(cells) >= 2:
+                        act_name = cells[0].get_text(strip=True)
+                        sections = cells[1].get_text(strip=True)
+                        if act_name and sections:
+                            case_details['acts'].append({'act_name': act_name, 'sections': sections})
+
+        
+        process_table = None
+        for t in all_tables:
+            if t.get('id') == 'process' or re.search(r'process', t.get_text(), re.I):
+                ths = [normalize_label(th.get_text()) for th in t.find_all('th')]
+                if any('process id' in th for th in ths):
+                    process_table = t
+                    break
+        if process_table:
+            
+            rows = process_table.find_all('tr')
+            if rows:
+                
+                data_tds = []
+                for r in rows[1:]:
+                    tds = r.find_all('td')
+                    if tds:
+                        data_tds.extend(tds)
+                
+                if not data_tds:
+                    data_tds = process_table.find_all('td')
+                chunks = [data_tds[i:i+3] for i in range(0, len(data_tds), 3)]
+                for chunk in chunks:
+                    if len(chunk) >= 2:
+                        process_id = chunk[0].get_text(strip=True)
+                        process_title = chunk[1].get_text(strip=True)
+                        process_date = chunk[2].get_text(strip=True) if len(chunk) > 2 else ''
+                        if process_id or process_title:
+                            case_details['processes'].append({
+                                'process_id': process_id,
+                                'process_title': process_title,
+                                'process_date': process_date
+                            })
+
+        
+        history_table = None
+        for t in all_tables:
+            if t.get('class') and any('history_table' in c for c in t.get('class', [])):
+                history_table = t
+                break
+            ths = [normalize_label(th.get_text()) for th in t.find_all('th')]
+            if ths and ('business on date' in ' '.join(ths) or 'hearing date' in ' '.join(ths)):
+                history_table = t
+                break
+        if history_table:
+            rows = history_table.find_all('tr')[1:]
+            for r in rows:
+                cells = r.find_all('td')
+                if len(cells) >= 3:
+                    judge = cells[0].get_text(strip=True)
+                    business_date = cells[1].get_text(strip=True)
+                    hearing_date = cells[2].get_text(strip=True)
+                    purpose = cells[3].get_text(strip=True) if len(cells) > 3 else ''
+                    case_details['case_history'].append({
+                        'judge': judge,
+                        'business_date': business_date,
+                        'hearing_date': hearing_date,
+                        'purpose_of_hearing': purpose
+                    })
+
+        
+        orders_table = None
+        for t in all_tables:
+            
+            ths = [normalize_label(th.get_text()) for th in t.find_all('th')]
+            if ths and any('order number' in h for h in ths):
+                orders_table = t
+                break
+            
+            if not ths:
+                first_tr = t.find('tr')
+                if first_tr:
+                    header_cells = [normalize_label(c.get_text()) for c in first_tr.find_all('td')]
+                    if header_cells and 'order number' in ' '.join(header_cells):
+                        orders_table = t
+                        break
+        if orders_table:
+            rows = orders_table.find_all('tr')
+            if rows:
+                
+                start_index = 1 if 'order number' in normalize_label(rows[0].get_text()) else 0
+                for r in rows[start_index:]:
+                    cells = r.find_all('td')
+                    if len(cells) >= 2: 
+                        order_number = cells[0].get_text(strip=True)
+                        order_date = cells[1].get_text(strip=True) if len(cells) > 1 else ''
+                        
+                        details_cell = cells[2] if len(cells) > 2 else (cells[1] if len(cells) == 2 else None)
+                        order_details_text = ''
+                        pdf_url = ''
+                        if details_cell:
+                            
+                            anchor = details_cell.find('a', onclick=True)
+                            if anchor:
+                                order_details_text = anchor.get_text(" ", strip=True)
+                                onclick_val = anchor.get('onclick', '')
+                                m_pdf = re.search(r"displayPdf\('([^']+)'", onclick_val)
+                                if m_pdf:
+                                    pdf_url = m_pdf.group(1)
+                            if not order_details_text:
+                                order_details_text = details_cell.get_text(" ", strip=True)
+                        
+                        if any([order_number, order_date, order_details_text]):
+                            # pdf_url currently holds the full raw argument passed to displayPdf('...')
+                            # Preserve it under a clearer key while keeping backward compatibility.
+                            case_details['interim_orders'].append({
+                                'order_number': order_number.lstrip('\u00a0').strip(' .'),
+                                'order_date': order_date.replace('\u00a0', ' ').strip(),
+                                'order_details': order_details_text.replace('\u00a0', ' ').strip(),
+                                'pdf_url': pdf_url,  # legacy key used by frontend
+                                'display_pdf_arg': pdf_url  # new explicit key
+                            })
+
+        
+        text_block = soup.get_text(' ', strip=True)
+        if not case_details['cnr_number']:
+            m = re.search(r'\b([A-Z]{4}\d{10}\d{2}\d{4})\b', text_block)
+            if m:
+                case_details['cnr_number'] = m.group(1)
+        if not case_details['filing_number']:
+            m = re.search(r'filing number\s*:?\s*([0-9/]+)', text_block, re.I)
+            if m:
+                case_details['filing_number'] = m.group(1)
+        if not case_details['registration_number']:
+            m = re.search(r'registration number\s*:?\s*([0-9/]+)', text_block, re.I)
+            if m:
+                case_details['registration_number'] = m.group(1)
+
+        return case_details
+        
+    except Exception:
+        return {
+            'case_number': '',
+            'case_type': '',
+            'filing_number': '',
+            'filing_date': '',
+            'registration_number': '',
+            'registration_date': '',
+            'cnr_number': '',
+            'court_name': '',
+            'judge': '',
+            'stage': '',
+            'next_date': '',
+            'first_hearing_date': '',
+            'petitioners': [],
+            'respondents': [],
+            'acts': [],
+            'processes': [],
+            'case_history': [],
+            'interim_orders': [],
+            'error': 'Parsing failed'
+        }
@@ -0,0 +1,112 @@
+"""SQLite FTS5 full-text index over parsed case details.
+
+One document per CNR, fed from ``_parse_case_details_html`` output: parties,
+advocates, acts, judge, court, stage and order titles. ``case_search_docs``
+gives every CNR a stable rowid so re-indexing is a rowid delete + insert
+rather than a scan. Ranking is bm25 with party/advocate columns weighted up.
+"""
+import logging
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from models import CaseSearchDoc
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ('case_number', 'case_type', 'petitioners', 'respondents', 'advocates', 'acts',
+           'judge', 'court_name', 'stage', 'orders')
+# bm25 weights, same order as COLUMNS (cnr/next_date are UNINDEXED and come first)
+WEIGHTS = (0.0, 0.0, 4.0, 1.0, 6.0, 6.0, 5.0, 3.0, 2.0, 1.5, 0.5, 1.0)
+
+# friendly ?field= names -> FTS column filter
+FIELD_GROUPS = {
+    'party': ('petitioners', 'respondents'),
+    'petitioner': ('petitioners',),
+    'respondent': ('respondents',),
+    'advocate': ('advocates',),
+    'act': ('acts',),
+    'judge': ('judge',),
+    'court': ('court_name',),
+    'stage': ('stage',),
+    'order': ('orders',),
+    'case': ('case_number', 'case_type'),
+}
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def ensure_index(engine):
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS case_search USING fts5("
+            "cnr UNINDEXED, next_date UNINDEXED, " + ', '.join(COLUMNS) +
+            ", tokenize='unicode61 remove_diacritics 2')"
+        ))
+
+
+def _document(details: Dict) -> Dict[str, str]:
+    parties_p = details.get('petitioners') or []
+    parties_r = details.get('respondents') or []
+    return {
+        'case_number': ' '.join(filter(None, [details.get('case_number'), details.get('registration_number'),
+                                              details.get('filing_number'), details.get('cnr_number')])),
+        'case_type': details.get('case_type') or '',
+        'petitioners': '\n'.join(p.get('name', '') for p in parties_p),
+        'respondents': '\n'.join(p.get('name', '') for p in parties_r),
+        'advocates': '\n'.join(p.get('advocate', '') for p in parties_p + parties_r if p.get('advocate')),
+        'acts': '\n'.join(f"{a.get('act_name', '')} {a.get('sections', '')}" for a in details.get('acts') or []),
+        'judge': details.get('judge') or '',
+        'court_name': details.get('court_name') or '',
+        'stage': details.get('stage') or '',
+        'orders': '\n'.join(f"{o.get('order_date', '')} {o.get('order_details', '')}" for o in details.get('interim_orders') or []),
+    }
+
+
+def index_case(db: Session, cnr: str, details: Dict):
+    """Insert or replace the search document for ``cnr``. Caller commits."""
+    doc = db.query(CaseSearchDoc).filter(CaseSearchDoc.cnr == cnr).first()
+    if doc is None:
+        doc = CaseSearchDoc(cnr=cnr)
+        db.add(doc)
+        db.flush()
+    else:
+        db.execute(text("DELETE FROM case_search WHERE rowid = :id"), {'id': doc.id})
+        doc.indexed_at = datetime.utcnow()
+    fields = _document(details)
+    db.execute(
+        text("INSERT INTO case_search(rowid, cnr, next_date, " + ', '.join(COLUMNS) + ") "
+             "VALUES (:rowid, :cnr, :next_date, " + ', '.join(f':{c}' for c in COLUMNS) + ")"),
+        {'rowid': doc.id, 'cnr': cnr, 'next_date': details.get('next_date') or '', **fields}
+    )
+
+
+def build_match(q: str, field: Optional[str] = None) -> Optional[str]:
+    """Turn free text into a safe FTS5 query: every word must match (prefix match)."""
+    tokens = _TOKEN_RE.findall(q or '')
+    if not tokens:
+        return None
+    expr = ' '.join(f'"{t}"*' for t in tokens[:16])
+    cols = FIELD_GROUPS.get((field or '').lower())
+    if cols:
+        return '{' + ' '.join(cols) + '} : (' + expr + ')'
+    return expr
+
+
+def search(db: Session, q: str, field: Optional[str] = None, limit: int = 20, offset: int = 0) -> Tuple[int, List[Dict]]:
+    match = build_match(q, field)
+    if not match:
+        return 0, []
+    total = db.execute(text("SELECT count(*) FROM case_search WHERE case_search MATCH :m"), {'m': match}).scalar() or 0
+    weights = ', '.join(str(w) for w in WEIGHTS)
+    rows = db.execute(text(
+        "SELECT cnr, case_number, court_name, stage, next_date, judge, "
+        f"bm25(case_search, {weights}) AS score, "
+        "snippet(case_search, -1, '<b>', '</b>', '…', 12) AS snippet "
+        "FROM case_search WHERE case_search MATCH :m "
+        "ORDER BY score LIMIT :limit OFFSET :offset"
+    ), {'m': match, 'limit': limit, 'offset': offset}).mappings().all()
+    return total, [dict(r) for r in rows]
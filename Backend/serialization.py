@@ -0,0 +1,35 @@
+"""JSON encoding shared by API responses and the query log.
+
+orjson is used when installed (several times faster than the stdlib on large
+case payloads); otherwise we fall back to ``json`` so the app still runs.
+"""
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize ``content`` to UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with :func:`dumps`.
+
+    Accepts already-encoded bytes as ``content`` so a payload serialized once
+    (e.g. for the query log) can be sent without encoding it a second time.
+    Returning this from a route also bypasses ``response_model`` validation.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray)):
+            return bytes(content)
+        return dumps(content)
@@ -0,0 +1,66 @@
+"""Production launcher: one uvicorn worker per core with shared scraper state.
+
+    python serve.py                      # workers = CPU count
+    WEB_CONCURRENCY=4 PORT=8000 python serve.py
+
+Workers share the upstream eCourts session (cookies, app_token, case context)
+and name caches through the SQLite ``shared_state`` table, so CAPTCHA and
+submit requests may land on different workers.
+
+Concurrency and rate budgets (UPSTREAM_CONCURRENCY, ORDER_ZIP_*, the watchlist,
+warmer and order-text rates, the parse and order-text pools) are enforced per
+process, so they are read here as server-wide totals and each worker is given
+its share (at least 1 for integer budgets; 0 keeps meaning "off").
+"""
+import os
+from typing import Dict
+
+import uvicorn
+
+
+def worker_budgets(workers: int) -> Dict[str, str]:
+    """Per-worker environment for the per-process budgets, given their server-wide totals."""
+    import lanes, order_text, order_zip, parsing, warmer, watchlist
+    totals = {
+        'UPSTREAM_CONCURRENCY': lanes.CONCURRENCY,
+        'UPSTREAM_BACKGROUND_MIN': lanes.BACKGROUND_MIN,
+        'UPSTREAM_BACKGROUND_MAX': lanes.BACKGROUND_MAX,
+        'ORDER_ZIP_CONCURRENCY': order_zip.CONCURRENCY,
+        'ORDER_ZIP_RATE_PER_MINUTE': order_zip.RATE_PER_MINUTE,
+        'WATCHLIST_RATE_PER_MINUTE': watchlist.RATE_PER_MINUTE,
+        'WARM_RATE_PER_MINUTE': warmer.RATE_PER_MINUTE,
+        'PARSE_POOL_SIZE': parsing.POOL_SIZE,
+        'ORDER_TEXT_WORKERS': order_text.WORKERS,
+        'ORDER_TEXT_RATE_PER_MINUTE': order_text.RATE_PER_MINUTE,
+    }
+    env = {}
+    for name, total in totals.items():
+        if total <= 0:
+            env[name] = str(total)
+        elif isinstance(total, int):
+            env[name] = str(max(1, total // workers))
+        else:
+            env[name] = repr(total / workers)
+    return env
+
+
+def main():
+    workers = int(os.getenv('WEB_CONCURRENCY') or os.cpu_count() or 1)
+    if workers > 1:
+        os.environ['SCRAPER_SHARED_STATE'] = '1'
+        os.environ.update(worker_budgets(workers))
+    # create the schema once here instead of racing in every worker
+    import models  # noqa: F401  (registers tables on Base)
+    from database import create_tables
+    create_tables()
+    uvicorn.run(
+        "main:app",
+        host=os.getenv('HOST', '0.0.0.0'),
+        port=int(os.getenv('PORT', '8000')),
+        workers=workers,
+        log_level=os.getenv('LOG_LEVEL', 'info'),
+    )
+
+
+if __name__ == "__main__":
+    main()
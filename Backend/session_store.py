@@ -0,0 +1,271 @@
+"""Shared scraper state for multi-worker deployments.
+
+Each uvicorn worker owns its own ``ECourtScraper``; with SCRAPER_SHARED_STATE=1
+(set by serve.py when running more than one worker) each API client's upstream
+session (cookies, app_token, last case context; one row per client id) and the
+name caches are mirrored through the ``shared_state`` table so any worker can
+continue a client's CAPTCHA -> submit flow. Each request costs one indexed version lookup; blobs are only
+re-read when another worker has published a newer version, and only written
+when the local state changed since the version this worker last saw
+(compare-and-set on ``version``, so a concurrent publish is never overwritten).
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+
+from database import SessionLocal
+from models import SharedState
+
+logger = logging.getLogger(__name__)
+
+
+def enabled() -> bool:
+    return os.getenv('SCRAPER_SHARED_STATE', '') == '1'
+
+
+def read(key: str, newer_than: int = -1) -> Tuple[int, Optional[Any]]:
+    """Return (version, data); data is None when the stored version is not newer."""
+    db = SessionLocal()
+    try:
+        version = db.query(SharedState.version).filter(SharedState.key == key).scalar()
+        if version is None or version <= newer_than:
+            return (version if version is not None else -1), None
+        row = db.get(SharedState, key)
+        return row.version, json.loads(row.data) if row.data else None
+    finally:
+        db.close()
+
+
+def write(key: str, data: Any) -> int:
+    """Publish ``data`` under ``key`` and return the new version."""
+    payload = json.dumps(data, separators=(',', ':'), default=str)
+    db = SessionLocal()
+    try:
+        res = db.execute(
+            update(SharedState)
+            .where(SharedState.key == key)
+            .values(version=SharedState.version + 1, data=payload, updated_at=datetime.utcnow())
+        )
+        if res.rowcount == 0:
+            db.add(SharedState(key=key, version=1, data=payload))
+        db.commit()
+        return db.query(SharedState.version).filter(SharedState.key == key).scalar()
+    finally:
+        db.close()
+
+
+def write_if(key: str, data: Any, expected: int) -> Optional[int]:
+    """Publish ``data`` only if ``key`` is still at version ``expected`` (-1: no row yet).
+
+    Returns the new version, or None when another worker published in between.
+    """
+    payload = json.dumps(data, separators=(',', ':'), default=str)
+    db = SessionLocal()
+    try:
+        if expected < 0:
+            db.add(SharedState(key=key, version=1, data=payload))
+            try:
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                return None
+            return 1
+        res = db.execute(
+            update(SharedState)
+            .where(SharedState.key == key, SharedState.version == expected)
+            .values(version=expected + 1, data=payload, updated_at=datetime.utcnow())
+        )
+        db.commit()
+        return expected + 1 if res.rowcount else None
+    finally:
+        db.close()
+
+
+class SharedMirror:
+    """Keeps one local object in step with a shared_state row.
+
+    ``pull`` adopts a newer published version, ``push`` publishes local changes
+    (detected by comparing the serialized state with the last synced copy) on top
+    of the version last pulled. If another worker published first the push is
+    dropped and the next ``pull`` adopts the winner. Both do blocking SQLite I/O:
+    call them from the threadpool, not the event loop.
+    """
+
+    def __init__(self, key: str, export_fn, load_fn):
+        self.key = key
+        self.export_fn = export_fn
+        self.load_fn = load_fn
+        self.version = -1
+        self._synced = ''
+        self._lock = threading.Lock()
+
+    def pull(self):
+        try:
+            version, data = read(self.key, newer_than=self.version)
+            if data is None:
+                return
+            with self._lock:
+                self.load_fn(data)
+                self.version = version
+                self._synced = json.dumps(data, sort_keys=True, default=str)
+        except Exception as e:
+            logger.warning(f"shared state pull failed for {self.key}: {e}")
+
+    def reset(self):
+        """Forget the synced version, so the next ``pull`` adopts the published state."""
+        with self._lock:
+            self.version = -1
+            self._synced = ''
+
+    def push(self):
+        try:
+            with self._lock:
+                data = self.export_fn()
+                snapshot = json.dumps(data, sort_keys=True, default=str)
+                if snapshot == self._synced:
+                    return
+                version = write_if(self.key, data, self.version)
+                if version is None:
+                    logger.debug(f"shared state {self.key}: newer version published elsewhere; not overwriting")
+                    return
+                self.version = version
+                self._synced = snapshot
+        except Exception as e:
+            logger.warning(f"shared state push failed for {self.key}: {e}")
+
+
+class MirrorSet:
+    """One :class:`SharedMirror` per name under a key prefix (e.g. one per API client).
+
+    ``export_fn(name)`` / ``load_fn(data, name)`` read and adopt one name's state.
+    Mirrors are kept for the most recently used ``maxsize`` names; rows not
+    published for ``max_age`` seconds are deleted, at most every ``prune_every``.
+    """
+
+    def __init__(self, prefix: str, export_fn, load_fn, maxsize: int = 1024,
+                 max_age: float = 7200, prune_every: float = 600):
+        self.prefix = prefix
+        self.export_fn = export_fn
+        self.load_fn = load_fn
+        self.maxsize = maxsize
+        self.max_age = max_age
+        self.prune_every = prune_every
+        self._mirrors: 'OrderedDict[str, SharedMirror]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._pruned_at = time.monotonic()
+
+    def key(self, name: str) -> str:
+        return f"{self.prefix}:{name}" if name else self.prefix
+
+    def get(self, name: str, reset: bool = False) -> SharedMirror:
+        """The mirror for ``name``; ``reset`` forgets what was synced (the local state is new)."""
+        with self._lock:
+            mirror = self._mirrors.get(name)
+            if mirror is None:
+                mirror = self._mirrors[name] = SharedMirror(
+                    self.key(name), lambda: self.export_fn(name), lambda data: self.load_fn(data, name))
+            elif reset:
+                mirror.reset()
+            self._mirrors.move_to_end(name)
+            while len(self._mirrors) > self.maxsize:
+                self._mirrors.popitem(last=False)
+        return mirror
+
+    def prune(self):
+        """Delete rows of names not published for ``max_age`` seconds (throttled)."""
+        now = time.monotonic()
+        if now - self._pruned_at < self.prune_every:
+            return
+        self._pruned_at = now
+        cutoff = datetime.utcnow() - timedelta(seconds=self.max_age)
+        db = SessionLocal()
+        try:
+            db.execute(delete(SharedState).where(SharedState.key.like(f"{self.prefix}:%"),
+                                                 SharedState.updated_at < cutoff))
+            db.commit()
+        except Exception as e:
+            logger.warning(f"shared state prune failed for {self.prefix}: {e}")
+        finally:
+            db.close()
+
+
+class WorkerMetrics:
+    """Publishes this worker's ``snapshot_fn()`` as ``metrics:<pid>`` every ``interval`` seconds.
+
+    ``gather()`` returns the snapshots of every worker that published within
+    three intervals (this one's is refreshed first), so /metrics can merge them
+    whichever worker serves the scrape. Rows of dead workers are deleted.
+    """
+
+    PREFIX = 'metrics'
+
+    def __init__(self, snapshot_fn, interval: float = float(os.getenv('METRICS_PUBLISH_SECONDS', '15'))):
+        self.snapshot_fn = snapshot_fn
+        self.interval = interval
+        self.key = f"{self.PREFIX}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='metrics-publisher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        db = SessionLocal()
+        try:
+            db.execute(delete(SharedState).where(SharedState.key == self.key))
+            db.commit()
+        except Exception as e:
+            logger.warning(f"metrics row cleanup failed: {e}")
+        finally:
+            db.close()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.publish()
+            except Exception as e:
+                logger.warning(f"metrics publish failed: {e}")
+
+    def publish(self):
+        write(self.key, self.snapshot_fn())
+
+    def gather(self) -> List[Any]:
+        self.publish()
+        cutoff = datetime.utcnow() - timedelta(seconds=3 * self.interval)
+        db = SessionLocal()
+        try:
+            db.execute(delete(SharedState).where(SharedState.key.like(f"{self.PREFIX}:%"),
+                                                 SharedState.updated_at < cutoff))
+            db.commit()
+            rows = db.query(SharedState.data).filter(SharedState.key.like(f"{self.PREFIX}:%")).all()
+            return [json.loads(data) for (data,) in rows if data]
+        finally:
+            db.close()
+
+
+def export_name_caches(state_names: Dict, district_names: Dict) -> Dict:
+    return {
+        'states': state_names,
+        'districts': [[s, d, name] for (s, d), name in district_names.items()],
+    }
+
+
+def load_name_caches(data: Dict, state_names: Dict, district_names: Dict):
+    state_names.update(data.get('states') or {})
+    for s, d, name in data.get('districts') or []:
+        district_names[(s, d)] = name
@@ -0,0 +1,107 @@
+"""Coalescing of identical concurrent scraper calls ("single-flight").
+
+While a call for a key is in flight, further callers with the same key wait
+for it and receive the same result, or the same exception, instead of
+sending their own upstream request. Nothing is remembered once the call
+finishes; caching stays the job of ``cache.py``.
+
+An interactive caller that joins a call led from the background lane promotes
+that call to the interactive lane (see ``lanes.promote``) rather than waiting
+behind other background work.
+"""
+import inspect
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import lanes
+import metrics
+
+COALESCED = metrics.counter(
+    'ecourts_singleflight_calls_total',
+    'Scraper calls by method and role (leader = went upstream, follower = shared a leader\'s result).')
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'lane', 'promoted')
+
+    def __init__(self, lane: str):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.lane = lane
+        self.promoted = threading.Event()
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        """Run ``fn`` unless a call for ``key`` is already running; then wait for and share its outcome."""
+        lane = lanes.current_lane.get()
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call(lane)
+        if not leader:
+            if call.lane == lanes.BACKGROUND and lane == lanes.INTERACTIVE:
+                lanes.promote(call.promoted)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            if lane == lanes.BACKGROUND:
+                with lanes.promotable(call.promoted):
+                    call.result = fn(*args, **kwargs)
+            else:
+                call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+
+def coalesced(key_fn: Optional[Callable] = None):
+    """Coalesce concurrent calls of a scraper method through ``self.flights``.
+
+    The key is the method name plus ``key_fn(*args, **kwargs)`` if given, else
+    all bound arguments with defaults applied.
+    """
+    def decorator(fn):
+        sig = inspect.signature(fn)
+        name = fn.__name__
+
+        def make_key(args, kwargs) -> tuple:
+            if key_fn is not None:
+                return (name, key_fn(*args, **kwargs))
+            bound = sig.bind(None, *args, **kwargs)
+            bound.apply_defaults()
+            return (name,) + tuple(bound.arguments.values())[1:]
+
+        @wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            flights: SingleFlight = self.flights
+            key = make_key(args, kwargs)
+            role = ['follower']
+
+            def lead():
+                role[0] = 'leader'
+                return fn(self, *args, **kwargs)
+
+            try:
+                return flights.do(key, lead)
+            finally:
+                COALESCED.inc(method=name, role=role[0])
+        return wrapper
+    return decorator
@@ -0,0 +1,107 @@
+"""Normalized case snapshots and incremental diffs.
+
+Only the latest snapshot per CNR is kept; each fetch that changes anything
+appends a small delta (new hearings/orders/processes, changed scalar fields
+such as next_date or stage, replaced party/act lists) to ``case_changes``.
+Fetches with no changes just bump ``fetched_at``.
+"""
+import hashlib
+import json
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from models import CaseSnapshot, CaseChange
+
+SCALAR_FIELDS = (
+    'case_number', 'case_type', 'filing_number', 'filing_date', 'registration_number',
+    'registration_date', 'cnr_number', 'court_name', 'judge', 'stage', 'next_date',
+    'first_hearing_date',
+)
+# Append-only tables: diffs report the rows that are new.
+APPEND_LISTS = ('case_history', 'interim_orders', 'processes')
+# Small lists that are reported as a whole when they change.
+REPLACE_LISTS = ('petitioners', 'respondents', 'acts')
+
+
+def _clean(v):
+    if isinstance(v, str):
+        return ' '.join(v.replace('\xa0', ' ').split())
+    if isinstance(v, dict):
+        return {k: _clean(x) for k, x in sorted(v.items())}
+    if isinstance(v, list):
+        return [_clean(x) for x in v]
+    return v
+
+
+def normalize_case(details: Dict) -> Dict:
+    """Stable subset of parsed case details (whitespace-normalized, sorted keys)."""
+    snap = {f: _clean(details.get(f) or '') for f in SCALAR_FIELDS}
+    for f in APPEND_LISTS + REPLACE_LISTS:
+        snap[f] = _clean(list(details.get(f) or []))
+    return snap
+
+
+def fingerprint(snap: Dict) -> str:
+    return hashlib.sha1(json.dumps(snap, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def _row_key(row) -> str:
+    return json.dumps(row, sort_keys=True, separators=(',', ':'))
+
+
+def diff_snapshots(old: Dict, new: Dict) -> Dict:
+    """Delta from ``old`` to ``new``; empty dict when nothing changed."""
+    delta: Dict = {}
+    fields = {f: {'old': old.get(f, ''), 'new': new.get(f, '')}
+              for f in SCALAR_FIELDS if old.get(f, '') != new.get(f, '')}
+    if fields:
+        delta['fields'] = fields
+    for f in APPEND_LISTS:
+        seen = {_row_key(r) for r in old.get(f) or []}
+        added = [r for r in new.get(f) or [] if _row_key(r) not in seen]
+        if added:
+            delta[f'{f}_added'] = added
+    for f in REPLACE_LISTS:
+        if (old.get(f) or []) != (new.get(f) or []):
+            delta[f] = new.get(f) or []
+    return delta
+
+
+def record_snapshot(db: Session, cnr: str, details: Dict) -> Optional[CaseChange]:
+    """Store ``details`` as the latest snapshot of ``cnr`` and append its delta.
+
+    Returns the new CaseChange, or None when nothing changed. Caller commits.
+    """
+    snap = normalize_case(details)
+    fp = fingerprint(snap)
+    now = datetime.utcnow()
+    row = db.get(CaseSnapshot, cnr)
+    if row is None:
+        db.add(CaseSnapshot(cnr=cnr, fingerprint=fp, snapshot=json.dumps(snap), fetched_at=now, changed_at=now))
+        change = CaseChange(cnr=cnr, detected_at=now, kind='initial', delta=json.dumps(snap))
+        db.add(change)
+        return change
+    row.fetched_at = now
+    if row.fingerprint == fp:
+        return None
+    delta = diff_snapshots(json.loads(row.snapshot), snap)
+    row.fingerprint = fp
+    row.snapshot = json.dumps(snap)
+    row.changed_at = now
+    if not delta:
+        return None
+    change = CaseChange(cnr=cnr, detected_at=now, kind='update', delta=json.dumps(delta))
+    db.add(change)
+    return change
+
+
+def changes_since(db: Session, since: Optional[datetime], cnrs: Optional[List[str]] = None,
+                  limit: int = 500) -> List[CaseChange]:
+    q = db.query(CaseChange)
+    if since is not None:
+        q = q.filter(CaseChange.detected_at > since)
+    if cnrs:
+        q = q.filter(CaseChange.cnr.in_(cnrs))
+    return q.order_by(CaseChange.detected_at, CaseChange.id).limit(limit).all()
@@ -0,0 +1,119 @@
+"""Startup steps run off the serving path, with progress for /api/ready.
+
+``Readiness`` holds named steps. ``run_now`` executes a step inline (local,
+network-free work the routes cannot do without, such as the schema); the
+rest run in order on a background thread once ``start`` is called, so the
+app accepts traffic immediately. A step marked ``retry`` is re-run with
+exponential backoff until it succeeds (e.g. warming the upstream session
+while eCourts is slow or down) on a thread of its own, so it does not hold
+up the steps after it. The app is ready once every ``required`` step is done.
+
+Environment:
+  STARTUP_RETRY_MAX_SECONDS  longest backoff between attempts of a retried step (default 60)
+"""
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+RETRY_MAX_SECONDS = float(os.getenv('STARTUP_RETRY_MAX_SECONDS', '60'))
+
+
+class Step:
+    def __init__(self, name: str, fn: Callable[[], object], required: bool, retry: bool):
+        self.name = name
+        self.fn = fn
+        self.required = required
+        self.retry = retry
+        self.status = 'pending'  # pending | running | done | failed
+        self.attempts = 0
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.seconds: Optional[float] = None
+
+    def run(self) -> bool:
+        self.status = 'running'
+        self.attempts += 1
+        self.started_at = self.started_at or time.monotonic()
+        try:
+            ok = self.fn()
+        except Exception as e:
+            ok, self.error = False, f"{type(e).__name__}: {e}"
+        else:
+            # steps signal failure by returning False (e.g. warm_session); None counts as success
+            self.error = None if ok is not False else 'step reported failure'
+        self.status = 'done' if ok is not False else 'failed'
+        self.seconds = round(time.monotonic() - self.started_at, 3)
+        return self.status == 'done'
+
+    def snapshot(self) -> dict:
+        return {'status': self.status, 'required': self.required, 'attempts': self.attempts,
+                'seconds': self.seconds, 'error': self.error}
+
+
+class Readiness:
+    def __init__(self):
+        self.steps: Dict[str, Step] = {}
+        self._background: List[Step] = []
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self.started_at = datetime.utcnow()
+        self._t0 = time.monotonic()
+
+    def run_now(self, name: str, fn: Callable[[], object], required: bool = True) -> bool:
+        step = self.steps[name] = Step(name, fn, required, retry=False)
+        ok = step.run()
+        if not ok:
+            logger.warning(f"startup step {name} failed: {step.error}")
+        return ok
+
+    def add(self, name: str, fn: Callable[[], object], required: bool = True, retry: bool = False):
+        step = self.steps[name] = Step(name, fn, required, retry)
+        self._background = [s for s in self._background if s.name != name] + [step]
+
+    def start(self):
+        if any(t.is_alive() for t in self._threads):
+            return
+        self._stop.clear()
+        retried = [s for s in self._background if s.retry]
+        once = [s for s in self._background if not s.retry]
+        self._threads = [threading.Thread(target=self._run, args=([s],), name=f'startup-{s.name}', daemon=True)
+                         for s in retried]
+        self._threads.append(threading.Thread(target=self._run, args=(once,), name='startup', daemon=True))
+        for t in self._threads:
+            t.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, steps: List[Step]):
+        for step in steps:
+            delay = 1.0
+            while not self._stop.is_set() and not step.run():
+                logger.warning(f"startup step {step.name} failed (attempt {step.attempts}): {step.error}")
+                if not step.retry:
+                    break
+                self._stop.wait(delay)
+                delay = min(delay * 2, RETRY_MAX_SECONDS)
+            if self._stop.is_set():
+                return
+            if step.status == 'done':
+                logger.info(f"startup step {step.name} done in {step.seconds}s")
+
+    @property
+    def ready(self) -> bool:
+        return all(s.status == 'done' for s in self.steps.values() if s.required)
+
+    def snapshot(self) -> dict:
+        done = sum(1 for s in self.steps.values() if s.status == 'done')
+        return {
+            'ready': self.ready,
+            'progress': f"{done}/{len(self.steps)}",
+            'started_at': self.started_at.isoformat(),
+            'uptime_seconds': round(time.monotonic() - self._t0, 3),
+            'steps': {name: s.snapshot() for name, s in self.steps.items()},
+        }
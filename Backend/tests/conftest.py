@@ -0,0 +1,66 @@
+"""Shared fixtures: a throwaway database and the local fake eCourts upstream."""
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import pytest
+import requests
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+# Read at import by database.py / scraper.py / main.py: keep tests off the real
+# database, the real eCourts site and the background loops.
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='ecourts-tests-'), 'test.db'))
+os.environ.setdefault('ECOURTS_BASE_URL', 'http://127.0.0.1:9/')
+for flag in ('WATCHLIST_ENABLED', 'WARM_ENABLED', 'ORDER_TEXT_ENABLED', 'JOBS_ENABLED'):
+    os.environ.setdefault(flag, '0')
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def db():
+    """A session on the test database, with the schema created."""
+    import models  # noqa: F401  (registers tables on Base)
+    from database import SessionLocal, create_tables
+    create_tables()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def fake_upstream():
+    """Start benchmarks/fake_ecourts.py with the given flags; returns its base URL."""
+    procs = []
+
+    def start(*args: str) -> str:
+        port = _free_port()
+        procs.append(subprocess.Popen(
+            [sys.executable, os.path.join(BACKEND, 'benchmarks', 'fake_ecourts.py'), '--port', str(port), *args],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+        url = f"http://127.0.0.1:{port}/"
+        for _ in range(100):
+            try:
+                requests.get(url + '_stats', timeout=1)
+                break
+            except requests.RequestException:
+                time.sleep(0.1)
+        return url
+
+    try:
+        yield start
+    finally:
+        for proc in procs:
+            proc.terminate()
+            proc.wait()
@@ -0,0 +1,30 @@
+"""Each API client keeps its own upstream session, so CAPTCHAs do not cross users."""
+import requests
+from fastapi.testclient import TestClient
+
+CASE = dict(state_code='3', dist_code='1', court_complex_code='1010001', case_type='1',
+            case_no='133', rgyear='2020')
+
+
+def test_concurrent_captchas_stay_with_their_client(fake_upstream):
+    import main
+
+    url = fake_upstream('--check-captcha')
+    main.scraper.base_url = url
+
+    def shown_code(client_id: str) -> str:
+        sid = main.scraper._upstream(client_id).session.cookies.get('PHPSESSID')
+        return requests.get(f"{url}_captcha/{sid}", timeout=5).json()['code']
+
+    with TestClient(main.app) as alice:
+        bob = TestClient(main.app)
+        assert alice.get('/api/captcha-image').status_code == 200
+        assert bob.get('/api/captcha-image').status_code == 200
+        alice_id, bob_id = alice.cookies.get('ecourts_client'), bob.cookies.get('ecourts_client')
+        assert alice_id and bob_id and alice_id != bob_id
+
+        # bob's CAPTCHA was fetched last; alice's answer must still match her own session
+        alice_code, bob_code = shown_code(alice_id), shown_code(bob_id)
+        for client, code in ((alice, alice_code), (bob, bob_code)):
+            body = client.post('/api/submit-case', json={**CASE, 'captcha_code': code}).json()
+            assert body['success'], body
@@ -0,0 +1,106 @@
+"""JobQueue claim, dedup, retry backoff and lease-expiry recovery against SQLite."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from jobqueue import JobQueue, PermanentError
+from models import Job
+
+
+@pytest.fixture
+def queue(db):
+    db.query(Job).delete()
+    db.commit()
+    q = JobQueue()
+    q.register('echo', lambda payload: payload, concurrency=1, max_attempts=2, backoff_seconds=30)
+    return q
+
+
+def _job(db, job_id):
+    db.expire_all()
+    return db.get(Job, job_id)
+
+
+def test_claim_takes_due_jobs_by_priority_within_concurrency(db, queue):
+    jt = queue.types['echo']
+    low, _ = queue.enqueue(db, 'echo', {'n': 1})
+    high, _ = queue.enqueue(db, 'echo', {'n': 2}, priority=5)
+    later, _ = queue.enqueue(db, 'echo', {'n': 3}, priority=9, delay_seconds=3600)
+
+    assert queue.claim(jt) == high.id
+    job = _job(db, high.id)
+    assert job.status == 'running' and job.attempts == 1 and job.lease_owner == queue.owner
+    # concurrency 1: nothing else is claimed while that job runs
+    assert queue.claim(jt) is None
+
+    queue._finish(jt, high.id, result={'ok': True})
+    assert _job(db, high.id).status == 'succeeded'
+    assert queue.claim(jt) == low.id
+    assert _job(db, later.id).status == 'queued'
+
+
+def test_enqueue_dedups_active_jobs_by_key(db, queue):
+    first, created = queue.enqueue(db, 'echo', {'n': 1}, dedup_key='case-1')
+    again, created_again = queue.enqueue(db, 'echo', {'n': 2}, dedup_key='case-1')
+    assert created and not created_again and again.id == first.id
+
+    queue.cancel(db, first.id)
+    fresh, created_fresh = queue.enqueue(db, 'echo', {'n': 3}, dedup_key='case-1')
+    assert created_fresh and fresh.id != first.id
+
+
+def test_failures_back_off_then_fail_after_max_attempts(db, queue):
+    jt = queue.types['echo']
+    job, _ = queue.enqueue(db, 'echo')
+
+    assert queue.claim(jt) == job.id
+    before = datetime.utcnow()
+    queue._finish(jt, job.id, error='RuntimeError: boom')
+    retried = _job(db, job.id)
+    assert retried.status == 'queued' and retried.last_error == 'RuntimeError: boom'
+    # first retry waits backoff_seconds, with up to 20% jitter
+    assert before + timedelta(seconds=23) < retried.run_at < before + timedelta(seconds=37)
+    assert queue.claim(jt) is None  # not due yet
+
+    retried.run_at = datetime.utcnow()
+    db.commit()
+    assert queue.claim(jt) == job.id
+    queue._finish(jt, job.id, error='RuntimeError: boom again')
+    failed = _job(db, job.id)
+    assert failed.status == 'failed' and failed.attempts == 2
+
+
+def test_permanent_errors_fail_at_once(db, queue):
+    def reject(payload):
+        raise PermanentError('bad payload')
+    jt = queue.register('reject', reject, max_attempts=5)
+    job, _ = queue.enqueue(db, 'reject')
+    assert queue.claim(jt) == job.id
+    queue._running[job.id] = jt.name
+    queue._execute(jt, job.id)
+    failed = _job(db, job.id)
+    assert failed.status == 'failed' and failed.attempts == 1 and failed.last_error == 'bad payload'
+
+
+def test_expired_leases_are_requeued_or_failed(db, queue):
+    jt = queue.types['echo']
+    job, _ = queue.enqueue(db, 'echo')
+    assert queue.claim(jt) == job.id
+
+    # the owning process died: its lease runs out without a heartbeat
+    _job(db, job.id).lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+    assert queue.recover_expired() == 1
+    recovered = _job(db, job.id)
+    assert recovered.status == 'queued' and recovered.lease_owner is None
+
+    # the second (last) attempt expires too: no attempts left, so it fails
+    assert queue.claim(jt) == job.id
+    _job(db, job.id).lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+    assert queue.recover_expired() == 1
+    assert _job(db, job.id).status == 'failed'
+
+    # a worker finishing after losing its lease does not overwrite the outcome
+    queue._finish(jt, job.id, result={'late': True})
+    assert _job(db, job.id).status == 'failed'
@@ -0,0 +1,91 @@
+"""PriorityGate admission: interactive first, background within its min/max."""
+import threading
+import time
+
+import lanes
+from lanes import BACKGROUND, INTERACTIVE, PriorityGate
+
+
+def _waiter(gate, lane, admitted):
+    def run():
+        granted = gate.acquire(lane, timeout=5)
+        admitted.append(lane)
+        return granted
+    t = threading.Thread(target=run, daemon=True)
+    t.start()
+    return t
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_waiting_interactive_is_admitted_before_background():
+    gate = PriorityGate(slots=1, background_min=0, background_max=1)
+    assert gate.acquire(INTERACTIVE) == INTERACTIVE
+    admitted = []
+    _waiter(gate, BACKGROUND, admitted)
+    assert _wait_for(lambda: gate.stats()['waiting'][BACKGROUND] == 1)
+    _waiter(gate, INTERACTIVE, admitted)
+    assert _wait_for(lambda: gate.stats()['waiting'][INTERACTIVE] == 1)
+
+    gate.release(INTERACTIVE)
+    assert _wait_for(lambda: admitted == [INTERACTIVE])
+    gate.release(INTERACTIVE)
+    assert _wait_for(lambda: admitted == [INTERACTIVE, BACKGROUND])
+
+
+def test_background_never_exceeds_its_max():
+    gate = PriorityGate(slots=4, background_min=1, background_max=2)
+    assert gate.acquire(BACKGROUND, timeout=1) == BACKGROUND
+    assert gate.acquire(BACKGROUND, timeout=1) == BACKGROUND
+    assert gate.acquire(BACKGROUND, timeout=0.1) is None
+    # the remaining slots stay free for interactive requests
+    assert gate.acquire(INTERACTIVE, timeout=0.1) == INTERACTIVE
+    assert gate.acquire(INTERACTIVE, timeout=0.1) == INTERACTIVE
+    assert gate.acquire(INTERACTIVE, timeout=0.1) is None
+
+
+def test_background_keeps_its_min_while_interactive_waits():
+    gate = PriorityGate(slots=2, background_min=1, background_max=1)
+    assert gate.acquire(INTERACTIVE) == INTERACTIVE
+    admitted = []
+    _waiter(gate, BACKGROUND, admitted)
+    assert _wait_for(lambda: admitted == [BACKGROUND])
+    assert gate.stats()['running'] == {INTERACTIVE: 1, BACKGROUND: 1}
+
+    # with background waiting and below its min, interactive may not take the reserved slot
+    gate.release(BACKGROUND)
+    assert gate.acquire(BACKGROUND, timeout=1) == BACKGROUND
+    gate.release(BACKGROUND)
+    gate.release(INTERACTIVE)
+    assert gate.stats()['running'] == {INTERACTIVE: 0, BACKGROUND: 0}
+
+
+def test_slot_times_out_and_releases_the_granted_lane():
+    gate = PriorityGate(slots=1)
+    with gate.slot(INTERACTIVE):
+        try:
+            with gate.slot(INTERACTIVE, timeout=0.05):
+                raise AssertionError('second slot granted')
+        except TimeoutError:
+            pass
+    assert gate.stats()['running'] == {INTERACTIVE: 0, BACKGROUND: 0}
+
+
+def test_promoted_background_wait_is_admitted_as_interactive():
+    gate = PriorityGate(slots=2, background_min=0, background_max=1)
+    assert gate.acquire(BACKGROUND) == BACKGROUND
+    promoted = threading.Event()
+    granted = []
+    t = threading.Thread(target=lambda: granted.append(gate.acquire(BACKGROUND, timeout=5, promotions=(promoted,))))
+    t.start()
+    assert _wait_for(lambda: gate.stats()['waiting'][BACKGROUND] == 1)
+    promoted.set()
+    gate.wake()
+    t.join(2)
+    assert granted == [INTERACTIVE]
+    assert gate.stats()['running'] == {INTERACTIVE: 1, BACKGROUND: 1}
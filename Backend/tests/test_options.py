@@ -0,0 +1,70 @@
+"""iter_options matches the BeautifulSoup parse it replaced."""
+import random
+import re
+from typing import Dict, List
+
+from bs4 import BeautifulSoup
+
+from scraper import ECourtScraper, iter_options
+
+NAMES = ['Civil Court', 'Sessions &amp; District Court', 'Family Court <b>(New)</b>', 'JMFC &#8211; II',
+         'Small Causes&nbsp;Court', "Magistrate's Court", 'Court &quot;A&quot;']
+
+
+def legacy_parse_options(option_data: str) -> List[Dict[str, str]]:
+    options = []
+    for option in BeautifulSoup(option_data, 'html.parser').find_all('option'):
+        value = option.get('value', '').strip()
+        text = option.get_text().strip()
+        if value and value != '0' and not text.lower().startswith('select'):
+            options.append({'value': value.split('@')[0], 'text': text})
+    return options
+
+
+def legacy_complexes(complex_list: str) -> List[Dict[str, str]]:
+    meta = {}
+    for m in re.finditer(r"<option[^>]*value=([\"']?)([^ >\"']+?)\1[^>]*>(.*?)</option>", complex_list, re.I):
+        parts = m.group(2).strip().split('@')
+        meta[parts[0]] = {'raw_value': m.group(2).strip(), 'est_list': parts[1] if len(parts) > 1 else '',
+                          'flag': parts[2] if len(parts) > 2 else ''}
+    return [{**c, **meta.get(c['value'], {'raw_value': c['value'], 'est_list': '', 'flag': ''})}
+            for c in legacy_parse_options(complex_list)]
+
+
+def complex_html(n: int, rnd: random.Random) -> str:
+    rows = ['<option value="">Select Court Complex</option>', "<option value='0'>--Select--</option>"]
+    for i in range(1, n + 1):
+        ests = ','.join(str(rnd.randint(1, 40)) for _ in range(rnd.randint(1, 4)))
+        quote = rnd.choice(['"', "'"])
+        rows.append(f'<option value={quote}{1000000 + i}@{ests}@{rnd.choice("YN")}{quote}>'
+                    f'  {rnd.choice(NAMES)} {i}  </option>')
+    return '\n'.join(rows)
+
+
+def test_simple_options_match_legacy_parse():
+    rnd = random.Random(7)
+    html = '<option value="">Select District</option>' + ''.join(
+        f'<option value="{i}">{rnd.choice(NAMES)} {i}</option>' for i in range(1, 200))
+    assert list(iter_options(html, with_meta=False)) == legacy_parse_options(html)
+    assert ECourtScraper()._parse_options(html) == legacy_parse_options(html)
+
+
+def test_complex_options_match_legacy_parse_with_metadata():
+    html = complex_html(300, random.Random(11))
+    assert list(iter_options(html)) == legacy_complexes(html)
+
+
+def test_quoting_entities_and_placeholders():
+    html = ("<select><option value=0>--Select--</option><option value=''>Select</option>"
+            "<option value=12 selected>Unquoted &amp; plain</option><option value=\"13@4,5@Y\">  <i>Nested</i> "
+            "text </option></select>")
+    assert list(iter_options(html, with_meta=False)) == legacy_parse_options(html)
+    assert [o['raw_value'] for o in iter_options(html)] == ['12', '13@4,5@Y']
+
+
+def test_unclosed_option_ends_at_the_next_one():
+    # html.parser nests an unclosed option's successors into its text; browsers (and
+    # iter_options) end it at the next <option>
+    html = "<option value=1>One<option value=2>Two</select>"
+    assert list(iter_options(html, with_meta=False)) == [{'value': '1', 'text': 'One'},
+                                                         {'value': '2', 'text': 'Two'}]
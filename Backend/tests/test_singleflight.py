@@ -0,0 +1,64 @@
+"""Concurrent identical calls share one execution, its result and its exception."""
+import threading
+import time
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def _run_concurrently(n, target):
+    threads = [threading.Thread(target=target) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+
+
+def test_followers_share_the_leaders_result():
+    flights = SingleFlight()
+    calls, results = [], []
+    release = threading.Event()
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        return {'value': 42}
+
+    def caller():
+        results.append(flights.do('k', fn))
+
+    threading.Timer(0.2, release.set).start()
+    _run_concurrently(5, caller)
+    assert len(calls) == 1
+    assert len(results) == 5 and all(r is results[0] for r in results)
+    assert flights.in_flight() == 0
+
+
+def test_followers_share_the_leaders_exception():
+    flights = SingleFlight()
+    calls, errors = [], []
+
+    def fn():
+        calls.append(1)
+        time.sleep(0.2)
+        raise ValueError('upstream down')
+
+    def caller():
+        try:
+            flights.do('k', fn)
+        except ValueError as e:
+            errors.append(e)
+
+    _run_concurrently(4, caller)
+    assert len(calls) == 1
+    assert len(errors) == 4 and all(e is errors[0] for e in errors)
+
+
+def test_finished_calls_are_not_remembered():
+    flights = SingleFlight()
+    assert flights.do('k', lambda: 1) == 1
+    assert flights.do('k', lambda: 2) == 2
+    with pytest.raises(KeyError):
+        flights.do('k', lambda: {}['missing'])
+    assert flights.do('k', lambda: 3) == 3
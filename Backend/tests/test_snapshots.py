@@ -0,0 +1,63 @@
+"""Snapshot deltas: added hearings/orders, changed fields, replaced lists."""
+import json
+
+from snapshots import diff_snapshots, normalize_case, record_snapshot
+
+HEARING_1 = {'judge': 'Civil Judge', 'business_on_date': '01-02-2024', 'hearing_date': '15-02-2024',
+             'purpose': 'Appearance'}
+HEARING_2 = {'judge': 'Civil Judge', 'business_on_date': '15-02-2024', 'hearing_date': '01-03-2024',
+             'purpose': 'Evidence'}
+ORDER_1 = {'order_number': '1', 'order_date': '15-02-2024', 'order_details': 'Interim order'}
+ORDER_2 = {'order_number': '2', 'order_date': '01-03-2024', 'order_details': 'Final order'}
+
+
+def _case(**overrides):
+    case = {'cnr_number': 'KAGD010000012020', 'stage': 'Appearance', 'next_date': '15-02-2024',
+            'petitioners': ['A. Kumar'], 'respondents': ['B. Rao'],
+            'case_history': [HEARING_1], 'interim_orders': [ORDER_1]}
+    case.update(overrides)
+    return normalize_case(case)
+
+
+def test_unchanged_case_has_empty_delta():
+    assert diff_snapshots(_case(), _case(stage='  Appearance\xa0')) == {}
+
+
+def test_added_hearings_and_orders_are_reported_alone():
+    delta = diff_snapshots(_case(), _case(case_history=[HEARING_1, HEARING_2],
+                                          interim_orders=[ORDER_1, ORDER_2]))
+    assert delta == {'case_history_added': [HEARING_2], 'interim_orders_added': [ORDER_2]}
+
+
+def test_changed_hearing_or_order_counts_as_added():
+    moved = {**HEARING_1, 'hearing_date': '20-02-2024'}
+    corrected = {**ORDER_1, 'order_details': 'Interim order (corrected)'}
+    delta = diff_snapshots(_case(), _case(case_history=[moved], interim_orders=[corrected]))
+    assert delta == {'case_history_added': [moved], 'interim_orders_added': [corrected]}
+
+
+def test_removed_rows_are_not_reported_but_replaced_lists_are():
+    # append-only tables: rows that disappear upstream are not deltas
+    assert diff_snapshots(_case(), _case(case_history=[], interim_orders=[])) == {}
+    delta = diff_snapshots(_case(), _case(respondents=[]))
+    assert delta == {'respondents': []}
+
+
+def test_changed_scalar_fields_keep_old_and_new():
+    delta = diff_snapshots(_case(), _case(stage='Evidence', next_date='01-03-2024'))
+    assert delta == {'fields': {'stage': {'old': 'Appearance', 'new': 'Evidence'},
+                                'next_date': {'old': '15-02-2024', 'new': '01-03-2024'}}}
+
+
+def test_record_snapshot_appends_initial_then_deltas(db):
+    cnr = 'TEST-SNAPSHOT-1'
+    base = {'cnr_number': cnr, 'stage': 'Appearance', 'case_history': [HEARING_1]}
+    first = record_snapshot(db, cnr, base)
+    db.commit()
+    assert first.kind == 'initial'
+    assert record_snapshot(db, cnr, base) is None
+
+    change = record_snapshot(db, cnr, {**base, 'case_history': [HEARING_1, HEARING_2]})
+    db.commit()
+    assert change.kind == 'update'
+    assert json.loads(change.delta) == {'case_history_added': [HEARING_2]}
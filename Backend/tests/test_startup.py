@@ -0,0 +1,21 @@
+"""A retried startup step (upstream down) does not hold up the steps after it."""
+import time
+
+from startup import Readiness
+
+
+def test_retried_step_runs_beside_the_others():
+    readiness = Readiness()
+    readiness.add('upstream_session', lambda: False, retry=True)
+    readiness.add('parse_pool', lambda: None, required=False)
+    readiness.start()
+    try:
+        deadline = time.monotonic() + 2
+        while readiness.steps['parse_pool'].status != 'done' and time.monotonic() < deadline:
+            time.sleep(0.01)
+        snap = readiness.snapshot()
+        assert snap['steps']['parse_pool']['status'] == 'done'
+        assert snap['steps']['upstream_session']['status'] in ('failed', 'running')
+        assert not snap['ready']
+    finally:
+        readiness.stop()
@@ -0,0 +1,25 @@
+"""Record/replay of an order PDF fetch through the cassette transport."""
+PDF_REQUEST = ("home/display_pdf&normal_v=1&case_val=O.S./0000133/2020&cCode=1&appFlag="
+               "&filename=/orders/2020/200100001332020_1.pdf&court_code=1")
+
+
+def test_replayed_pdf_fetch(fake_upstream, tmp_path, monkeypatch):
+    import pdf_strategy
+    import transport
+    from scraper import ECourtScraper
+
+    cassette = str(tmp_path / 'pdf.jsonl')
+    monkeypatch.setenv('ECOURTS_BASE_URL', fake_upstream('--reports-only'))
+    monkeypatch.setenv('ECOURTS_CASSETTE', cassette)
+
+    monkeypatch.setenv('ECOURTS_TRANSPORT', 'record')
+    recorded, _, _ = ECourtScraper().fetch_order_pdf(PDF_REQUEST)
+    assert recorded and recorded.startswith(b'%PDF')
+    transport.get_store(cassette).flush()
+
+    # a fresh store and no learned strategy, so the replay takes the recorded route
+    transport._stores.pop(cassette, None)
+    pdf_strategy.winners.clear()
+    monkeypatch.setenv('ECOURTS_TRANSPORT', 'replay')
+    replayed, _, _ = ECourtScraper().fetch_order_pdf(PDF_REQUEST)
+    assert replayed == recorded
@@ -0,0 +1,206 @@
+"""Lightweight request tracing: spans, Server-Timing and optional OTLP export.
+
+A trace is started per HTTP request (see the middleware in main.py) and held in
+a ContextVar, so scraper code can open spans without passing anything around.
+Outside a request (startup warm-up, background threads) spans are no-ops.
+
+Export is opt-in via environment variables:
+  TRACE_EXPORT_FILE           append OTLP/JSON lines to this file
+  TRACE_EXPORT_OTLP_ENDPOINT  POST OTLP/JSON to <endpoint>/v1/traces
+"""
+import json
+import logging
+import os
+import queue
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = os.getenv('TRACE_SERVICE_NAME', 'ecourts-scraper')
+EXPORT_FILE = os.getenv('TRACE_EXPORT_FILE', '')
+EXPORT_ENDPOINT = os.getenv('TRACE_EXPORT_OTLP_ENDPOINT', '').rstrip('/')
+
+
+class Span:
+    __slots__ = ('name', 'span_id', 'parent_id', 'start_ns', 'end_ns', 'attributes')
+
+    def __init__(self, name: str, parent_id: Optional[str], attributes: Dict):
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = attributes
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns or time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+
+class Trace:
+    def __init__(self, name: str):
+        self.trace_id = secrets.token_hex(16)
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+        self.root = self._add(name, None, {})
+
+    def _add(self, name: str, parent_id: Optional[str], attributes: Dict) -> Span:
+        s = Span(name, parent_id, attributes)
+        with self._lock:
+            self.spans.append(s)
+        return s
+
+    def finish(self):
+        self.root.end_ns = time.time_ns()
+
+    def finished_spans(self) -> List[Span]:
+        with self._lock:
+            return [s for s in self.spans if s.end_ns]
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar('current_trace', default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar('current_span', default=None)
+
+
+def start_trace(name: str) -> Trace:
+    trace = Trace(name)
+    _current_trace.set(trace)
+    _current_span.set(trace.root)
+    return trace
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Time a block as a child of the current span (no-op outside a trace)."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    parent = _current_span.get()
+    s = trace._add(name, parent.span_id if parent else None, attributes)
+    token = _current_span.set(s)
+    try:
+        yield s
+    except Exception as e:
+        s.attributes['error'] = type(e).__name__
+        raise
+    finally:
+        s.end_ns = time.time_ns()
+        _current_span.reset(token)
+
+
+def traced(name: Optional[str] = None):
+    """Decorator form of :func:`span`; defaults to the function name."""
+    def decorator(fn):
+        span_name = name or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+_TOKEN_RE = re.compile(r'[^A-Za-z0-9!#$%&\'*+.^_`|~-]')
+
+
+def server_timing_header(trace: Trace, limit: int = 40) -> str:
+    """Render finished spans as a Server-Timing value (repeated names are summed)."""
+    totals: Dict[str, float] = {}
+    order: List[str] = []
+    for s in trace.finished_spans():
+        if s is trace.root:
+            continue
+        if s.name not in totals:
+            order.append(s.name)
+            totals[s.name] = 0.0
+        totals[s.name] += s.duration_ms
+    parts = []
+    for n in order[:limit]:
+        token = _TOKEN_RE.sub('_', n)
+        parts.append(f'{token};dur={totals[n]:.1f};desc="{n}"')
+    parts.append(f'total;dur={trace.root.duration_ms:.1f}')
+    return ', '.join(parts)
+
+
+# --- OTLP/JSON export --------------------------------------------------------
+
+def _attr(key: str, value) -> Dict:
+    if isinstance(value, bool):
+        return {'key': key, 'value': {'boolValue': value}}
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    if isinstance(value, float):
+        return {'key': key, 'value': {'doubleValue': value}}
+    return {'key': key, 'value': {'stringValue': str(value)}}
+
+
+def to_otlp(trace: Trace) -> Dict:
+    spans = []
+    for s in trace.finished_spans():
+        item = {
+            'traceId': trace.trace_id,
+            'spanId': s.span_id,
+            'name': s.name,
+            'kind': 2 if s is trace.root else 1,
+            'startTimeUnixNano': str(s.start_ns),
+            'endTimeUnixNano': str(s.end_ns),
+            'attributes': [_attr(k, v) for k, v in s.attributes.items()],
+        }
+        if s.parent_id:
+            item['parentSpanId'] = s.parent_id
+        if 'error' in s.attributes:
+            item['status'] = {'code': 2}
+        spans.append(item)
+    return {'resourceSpans': [{
+        'resource': {'attributes': [_attr('service.name', SERVICE_NAME)]},
+        'scopeSpans': [{'scope': {'name': 'ecourts.tracing'}, 'spans': spans}],
+    }]}
+
+
+_export_queue: 'queue.Queue[Dict]' = queue.Queue(maxsize=1000)
+_exporter_started = False
+_exporter_lock = threading.Lock()
+
+
+def _export_worker():
+    import requests  # local: only needed when a collector is configured
+    while True:
+        payload = _export_queue.get()
+        try:
+            if EXPORT_FILE:
+                with open(EXPORT_FILE, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(payload, separators=(',', ':')) + '\n')
+            if EXPORT_ENDPOINT:
+                requests.post(f"{EXPORT_ENDPOINT}/v1/traces", json=payload, timeout=5)
+        except Exception as e:
+            logger.debug(f"trace export failed: {e}")
+
+
+def export(trace: Trace):
+    """Queue a finished trace for export; never blocks the request path."""
+    global _exporter_started
+    if not (EXPORT_FILE or EXPORT_ENDPOINT):
+        return
+    if not _exporter_started:
+        with _exporter_lock:
+            if not _exporter_started:
+                threading.Thread(target=_export_worker, name='trace-exporter', daemon=True).start()
+                _exporter_started = True
+    try:
+        _export_queue.put_nowait(to_otlp(trace))
+    except queue.Full:
+        logger.debug("trace export queue full; dropping trace")
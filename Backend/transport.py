@@ -0,0 +1,308 @@
+"""Record/replay transport for ECourtScraper sessions.
+
+``CassetteAdapter`` is a drop-in ``HTTPAdapter``. In *record* mode it passes
+requests through and appends a (sampled) copy of each request/response pair to
+a JSONL cassette; in *replay* mode it answers from the cassette without touching
+the network. Requests are matched on method, normalized URL and normalized form
+data, with volatile values (app_token, CAPTCHA cache-busters) masked so replays
+are deterministic.
+
+Recording happens as the body is consumed, so streamed responses stay
+streamed (and one closed early is not recorded). Writes go through a bounded
+queue (full: the interaction is dropped) to a cassette rotated at a size cap;
+replay indexes the cassette and its rotated segments by file offset and reads
+entries on demand.
+
+Configured from the environment (see ``adapter_from_env``):
+  ECOURTS_TRANSPORT          live (default) | record | replay
+  ECOURTS_CASSETTE           path of the .jsonl cassette (default cassettes/ecourts.jsonl)
+  ECOURTS_RECORD_SAMPLE      fraction of requests recorded in record mode (default 1.0)
+  ECOURTS_REPLAY_LATENCY     1 to sleep the recorded upstream latency on replay
+  ECOURTS_CASSETTE_MAX_BYTES rotate the cassette past this size, 0 = never (default 64 MiB)
+  ECOURTS_CASSETTE_KEEP      rotated segments kept as <cassette>.1 .. .N (default 3)
+  ECOURTS_CASSETTE_QUEUE     interactions waiting for the writer before drops (default 1000)
+"""
+import base64
+import hashlib
+import io
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit, urlencode
+
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.models import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+MAX_BYTES = int(os.getenv('ECOURTS_CASSETTE_MAX_BYTES', str(64 * 1024 * 1024)))
+KEEP = int(os.getenv('ECOURTS_CASSETTE_KEEP', '3'))
+QUEUE_SIZE = int(os.getenv('ECOURTS_CASSETTE_QUEUE', '1000'))
+
+VOLATILE_FIELDS = {'app_token'}
+REDACTED_HEADERS = {'cookie', 'set-cookie', 'authorization'}
+
+
+class CassetteMiss(RequestsConnectionError):
+    """Replay found no recorded interaction for a request."""
+
+
+def _decode_body(body) -> str:
+    if body is None:
+        return ''
+    if isinstance(body, bytes):
+        return body.decode('utf-8', 'replace')
+    return str(body)
+
+
+def normalize_request(method: str, url: str, body) -> Tuple[str, str, Dict[str, str]]:
+    """Return (method, url, form) with volatile parts masked."""
+    parts = urlsplit(url)
+    if 'securimage' in parts.path:
+        query = ''  # random cache-buster
+    else:
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    norm_url = f"{parts.scheme}://{parts.netloc}{parts.path}" + (f"?{query}" if query else '')
+    form = {}
+    for k, v in parse_qsl(_decode_body(body), keep_blank_values=True):
+        form[k] = '<volatile>' if k in VOLATILE_FIELDS else v
+    return method.upper(), norm_url, dict(sorted(form.items()))
+
+
+def interaction_key(method: str, url: str, form: Dict[str, str]) -> str:
+    raw = json.dumps([method, url, form], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+class CassetteStore:
+    """Append-only JSONL cassette, rotated at ``max_bytes``; writes happen on a background thread."""
+
+    def __init__(self, path: str, max_bytes: int = MAX_BYTES, keep: int = KEEP, queue_size: int = QUEUE_SIZE):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.keep = keep
+        self._queue: 'queue.Queue[Dict]' = queue.Queue(maxsize=queue_size)
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # key -> [(file, offset)] of its recorded interactions, oldest first
+        self._index: Optional[Dict[str, List[Tuple[str, int]]]] = None
+        self._cursor: Dict[str, int] = defaultdict(int)
+        self.dropped = 0
+
+    # --- recording ---------------------------------------------------------
+    def append(self, entry: Dict):
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                    self._writer = threading.Thread(target=self._write_loop, name='cassette-writer', daemon=True)
+                    self._writer.start()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1:
+                logger.warning("cassette writer behind; dropping interactions")
+
+    def segments(self) -> List[str]:
+        """Existing cassette files, oldest first (``path.N`` .. ``path.1``, ``path``)."""
+        rotated = [f"{self.path}.{i}" for i in range(self.keep, 0, -1)]
+        return [p for p in rotated + [self.path] if os.path.exists(p)]
+
+    def _rotate(self):
+        for i in range(self.keep, 0, -1):
+            src = f"{self.path}.{i - 1}" if i > 1 else self.path
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i}")
+        if self.keep <= 0 and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _write_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            while not self._queue.empty() and len(batch) < 200:
+                batch.append(self._queue.get_nowait())
+            try:
+                data = ''.join(json.dumps(entry, separators=(',', ':')) + '\n' for entry in batch)
+                if (self.max_bytes > 0 and os.path.exists(self.path)
+                        and os.path.getsize(self.path) + len(data) > self.max_bytes):
+                    self._rotate()
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(data)
+            except Exception as e:
+                logger.warning(f"cassette write failed: {e}")
+
+    def flush(self, timeout: float = 5.0):
+        deadline = time.time() + timeout
+        while not self._queue.empty() and time.time() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.02)
+
+    # --- replay ------------------------------------------------------------
+    def _load(self) -> Dict[str, List[Tuple[str, int]]]:
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    index: Dict[str, List[Tuple[str, int]]] = defaultdict(list)
+                    for path in self.segments():
+                        with open(path, 'rb') as f:
+                            offset = 0
+                            for line in f:
+                                # the key is the first field written; avoid decoding whole bodies
+                                m = _KEY_RE.match(line)
+                                key = m.group(1).decode('ascii') if m else (
+                                    json.loads(line).get('key') if line.strip() else None)
+                                if key:
+                                    index[key].append((path, offset))
+                                offset += len(line)
+                    self._index = index
+        return self._index
+
+    def next_for(self, key: str) -> Optional[Dict]:
+        """Recorded interactions for a key are served in order; the last one repeats."""
+        entries = self._load().get(key)
+        if not entries:
+            return None
+        with self._lock:
+            i = self._cursor[key]
+            self._cursor[key] = i + 1
+        path, offset = entries[min(i, len(entries) - 1)]
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+
+_KEY_RE = re.compile(rb'\{"key":"([0-9a-f]+)"')
+
+_stores: Dict[str, CassetteStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path: str) -> CassetteStore:
+    """One store per cassette path, shared by sessions recreated on refresh."""
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = CassetteStore(path)
+        return _stores[path]
+
+
+class _RecordingBody:
+    """Wraps a urllib3 response body, handing the decoded bytes to ``on_complete`` at EOF."""
+
+    def __init__(self, raw, on_complete):
+        self._raw = raw
+        self._on_complete = on_complete
+        self._chunks: List[bytes] = []
+        self._done = False
+
+    def _finish(self):
+        if not self._done:
+            self._done = True
+            self._on_complete(b''.join(self._chunks))
+            self._chunks = []
+
+    def stream(self, amt: int = 2 ** 16, decode_content: Optional[bool] = None):
+        for chunk in self._raw.stream(amt, decode_content=decode_content):
+            self._chunks.append(chunk)
+            yield chunk
+        self._finish()
+
+    def read(self, amt: Optional[int] = None, *args, **kwargs) -> bytes:
+        data = self._raw.read(amt, *args, **kwargs)
+        if data:
+            self._chunks.append(data)
+        if amt is None or not data:
+            self._finish()
+        return data
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class CassetteAdapter(HTTPAdapter):
+    def __init__(self, mode: str, store: CassetteStore, sample_rate: float = 1.0,
+                 replay_latency: bool = False, **kwargs):
+        if mode == 'replay':
+            kwargs.pop('max_retries', None)
+        super().__init__(**kwargs)
+        self.mode = mode
+        self.store = store
+        self.sample_rate = sample_rate
+        self.replay_latency = replay_latency
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        method, url, form = normalize_request(request.method, request.url, request.body)
+        key = interaction_key(method, url, form)
+        if self.mode == 'replay':
+            return self._replay(request, key)
+        start = time.perf_counter()
+        resp = super().send(request, **kwargs)
+        if self.mode == 'record' and (self.sample_rate >= 1.0 or random.random() < self.sample_rate):
+            def record(content: bytes):
+                self.store.append({
+                    'key': key,
+                    'recorded_at': time.time(),
+                    'elapsed_ms': round((time.perf_counter() - start) * 1000, 1),
+                    'request': {
+                        'method': method, 'url': url, 'form': form,
+                        'headers': {k: v for k, v in request.headers.items() if k.lower() not in REDACTED_HEADERS},
+                    },
+                    'response': {
+                        'status': resp.status_code,
+                        'headers': {k: v for k, v in resp.headers.items() if k.lower() not in REDACTED_HEADERS},
+                        'body_b64': base64.b64encode(content).decode('ascii'),
+                    },
+                })
+            # recorded once the body has been read to the end, so streamed bodies (PDF
+            # fetches use stream=True) are not buffered and early-closed ones are skipped
+            resp.raw = _RecordingBody(resp.raw, record)
+        return resp
+
+    def _replay(self, request: PreparedRequest, key: str) -> Response:
+        entry = self.store.next_for(key)
+        if entry is None:
+            raise CassetteMiss(f"no recorded interaction for {request.method} {request.url}", request=request)
+        if self.replay_latency:
+            time.sleep(entry.get('elapsed_ms', 0) / 1000)
+        rec = entry['response']
+        resp = Response()
+        resp.status_code = rec['status']
+        headers = CaseInsensitiveDict(rec.get('headers') or {})
+        # body is stored decoded; drop encodings so requests does not try to inflate it again
+        headers.pop('Content-Encoding', None)
+        headers.pop('Transfer-Encoding', None)
+        resp.headers = headers
+        # served as a stream like a live body: iter_content after a partial read continues
+        # where it left off (a pre-filled _content would be yielded from the start again)
+        resp.raw = io.BytesIO(base64.b64decode(rec['body_b64']))
+        resp.encoding = None
+        resp.url = request.url
+        resp.request = request
+        resp.reason = 'REPLAYED'
+        resp.connection = self
+        return resp
+
+
+def adapter_from_env(**adapter_kwargs) -> Optional[HTTPAdapter]:
+    """CassetteAdapter for ECOURTS_TRANSPORT=record|replay, else None (plain live adapter)."""
+    mode = os.getenv('ECOURTS_TRANSPORT', 'live').strip().lower()
+    if mode not in ('record', 'replay'):
+        return None
+    path = os.getenv('ECOURTS_CASSETTE', os.path.join('cassettes', 'ecourts.jsonl'))
+    try:
+        sample = float(os.getenv('ECOURTS_RECORD_SAMPLE', '1.0'))
+    except ValueError:
+        sample = 1.0
+    return CassetteAdapter(
+        mode, get_store(path), sample_rate=sample,
+        replay_latency=os.getenv('ECOURTS_REPLAY_LATENCY', '') == '1',
+        **adapter_kwargs)
@@ -0,0 +1,162 @@
+"""Popularity-driven warming of the scraper's dropdown caches.
+
+``query_logs`` records the state and district *names* people searched. At
+startup and then every WARM_INTERVAL_MINUTES the warmer takes the top-N
+(state, district) pairs of the last WARM_LOOKBACK_DAYS, maps the names back to
+codes via the (cached) states/districts lists, and prefetches districts, court
+complexes and case types for them. Entries that are still fresh for longer
+than one warm interval are skipped; upstream calls are spaced to stay within
+WARM_RATE_PER_MINUTE.
+
+Environment:
+  WARM_ENABLED            0 disables the warmer thread (default 1)
+  WARM_TOP_N              number of (state, district) pairs to warm (default 20)
+  WARM_LOOKBACK_DAYS      query log window (default 30)
+  WARM_INTERVAL_MINUTES   minutes between warm passes (default 60)
+  WARM_RATE_PER_MINUTE    max upstream calls per minute (default 30)
+  WARM_MAX_COMPLEXES      complexes per district whose case types are warmed (default 10)
+"""
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import func
+
+from database import SessionLocal
+from models import QueryLog
+import metrics
+import lanes
+
+logger = logging.getLogger(__name__)
+
+TOP_N = int(os.getenv('WARM_TOP_N', '20'))
+LOOKBACK_DAYS = int(os.getenv('WARM_LOOKBACK_DAYS', '30'))
+INTERVAL_MINUTES = float(os.getenv('WARM_INTERVAL_MINUTES', '60'))
+RATE_PER_MINUTE = float(os.getenv('WARM_RATE_PER_MINUTE', '30'))
+MAX_COMPLEXES = int(os.getenv('WARM_MAX_COMPLEXES', '10'))
+
+CACHE_WARM = metrics.counter(
+    'ecourts_cache_warm_total',
+    'Dropdown cache entries considered by the popularity warmer by level and result.')
+
+
+def top_locations(db, n: int = TOP_N, lookback_days: int = LOOKBACK_DAYS) -> List[Tuple[str, str, int]]:
+    """Most searched (state name, district name) pairs, most popular first."""
+    since = datetime.utcnow() - timedelta(days=lookback_days)
+    rows = (
+        db.query(QueryLog.state, QueryLog.district, func.count(QueryLog.id).label('n'))
+        .filter(QueryLog.timestamp >= since, QueryLog.state.isnot(None), QueryLog.state != '')
+        .group_by(QueryLog.state, QueryLog.district)
+        .order_by(func.count(QueryLog.id).desc())
+        .limit(n)
+        .all()
+    )
+    return [(r.state, r.district or '', r.n) for r in rows]
+
+
+def _match(options: List[dict], name_or_code: str) -> Optional[str]:
+    """Option value for a logged name; logs fall back to the raw code when a name was unknown."""
+    wanted = (name_or_code or '').strip().lower()
+    for o in options:
+        if o.get('text', '').strip().lower() == wanted:
+            return o['value']
+    for o in options:
+        if o.get('value') == name_or_code:
+            return o['value']
+    return None
+
+
+class PopularityWarmer:
+    def __init__(self, get_scraper: Callable, top_n: int = TOP_N, rate_per_minute: float = RATE_PER_MINUTE,
+                 interval_minutes: float = INTERVAL_MINUTES, max_complexes: int = MAX_COMPLEXES):
+        self.get_scraper = get_scraper
+        self.top_n = top_n
+        self.min_gap = 60.0 / max(rate_per_minute, 0.01)
+        self.interval = interval_minutes * 60
+        self.max_complexes = max_complexes
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_call = 0.0
+        self.last_run: Optional[dict] = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='cache-warmer', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                with lanes.background():
+                    self.run_once()
+            except Exception as e:
+                logger.warning(f"cache warmer error: {e}")
+            self._stop.wait(self.interval * random.uniform(0.9, 1.1))
+
+    def _throttle(self):
+        wait = self._last_call + self.min_gap - time.monotonic()
+        if wait > 0:
+            self._stop.wait(wait)
+        self._last_call = time.monotonic()
+
+    def _warm(self, scraper, level: str, method, *args) -> List[dict]:
+        """Return the options for ``method(*args)``, fetching upstream only when stale."""
+        cache = scraper.caches[method.cache_name]
+        key = method.cache_key(*args)
+        # fresh enough to survive until the next pass (or for half its TTL when the TTL is shorter)
+        if cache.remaining(key) > min(self.interval, cache.ttl / 2):
+            CACHE_WARM.inc(level=level, result='fresh')
+            return cache.peek(key) or []
+        if self._stop.is_set():
+            return []
+        cache.invalidate(key)
+        self._throttle()
+        options, _ = method(*args)
+        CACHE_WARM.inc(level=level, result='warmed' if options else 'empty')
+        return options
+
+    def plan(self) -> List[Tuple[str, str]]:
+        db = SessionLocal()
+        try:
+            return [(state, district) for state, district, _ in top_locations(db, self.top_n)]
+        finally:
+            db.close()
+
+    def run_once(self) -> dict:
+        """One warm pass over the most popular locations. Returns a small summary."""
+        started = time.monotonic()
+        scraper = self.get_scraper()
+        states, _ = scraper.get_states()
+        warmed = set()
+        for state_name, district_name in self.plan():
+            if self._stop.is_set():
+                break
+            state_code = _match(states, state_name)
+            if not state_code:
+                continue
+            districts = self._warm(scraper, 'districts', scraper.get_districts, state_code)
+            dist_code = _match(districts, district_name)
+            if not dist_code or (state_code, dist_code) in warmed:
+                continue
+            warmed.add((state_code, dist_code))
+            complexes = self._warm(scraper, 'complexes', scraper.get_court_complexes, state_code, dist_code)
+            for c in complexes[:self.max_complexes]:
+                if self._stop.is_set():
+                    break
+                self._warm(scraper, 'case_types', scraper.get_case_types, state_code, dist_code, c['value'])
+        self.last_run = {
+            'finished_at': datetime.utcnow().isoformat(),
+            'locations': len(warmed),
+            'seconds': round(time.monotonic() - started, 2),
+        }
+        logger.info(f"cache warm pass: {self.last_run}")
+        return self.last_run
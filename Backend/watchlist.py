@@ -0,0 +1,156 @@
+"""Watchlist of tracked cases refreshed in the background via viewHistory.
+
+``get_case_details`` needs only the CNR (cino), court code and location codes
+(no CAPTCHA), so tracked cases can be refreshed without a full submit. The
+scheduler thread picks due cases hot-first (next hearing soonest), spaces
+refreshes to stay under a per-minute budget, and adds jitter to every next
+refresh time so cases added together do not refresh together.
+
+Environment:
+  WATCHLIST_ENABLED           0 disables the scheduler thread (default 1)
+  WATCHLIST_INTERVAL_MINUTES  default refresh interval (default 360)
+  WATCHLIST_RATE_PER_MINUTE   max refreshes per minute (default 6)
+"""
+import logging
+import os
+import random
+import threading
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import update, nulls_last, case as sql_case
+
+from database import SessionLocal
+from dates import parse_case_date
+from models import WatchedCase
+import lanes
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_MINUTES = int(os.getenv('WATCHLIST_INTERVAL_MINUTES', '360'))
+RATE_PER_MINUTE = float(os.getenv('WATCHLIST_RATE_PER_MINUTE', '6'))
+HOT_DAYS = 3
+SOON_DAYS = 14
+JITTER = 0.2
+RETRY_MINUTES = (5, 15, 60, 180)
+
+# (case) -> details dict as returned by ECourtScraper.get_case_details
+RefreshFn = Callable[[WatchedCase], Dict]
+
+
+def effective_interval(case: WatchedCase, today: Optional[date] = None) -> timedelta:
+    """Hot cases refresh more often, dormant ones (no/far next date) less often."""
+    base = case.interval_minutes or DEFAULT_INTERVAL_MINUTES
+    today = today or date.today()
+    nd = case.next_date_iso
+    if nd is None or nd < today:
+        minutes = base * 4
+    elif (nd - today).days <= HOT_DAYS:
+        minutes = max(15, base // 4)
+    elif (nd - today).days <= SOON_DAYS:
+        minutes = base
+    else:
+        minutes = base * 2
+    return timedelta(minutes=minutes)
+
+
+def jittered(delta: timedelta) -> timedelta:
+    return delta * random.uniform(1 - JITTER, 1 + JITTER)
+
+
+def initial_refresh_at(case: WatchedCase) -> datetime:
+    """Spread first refreshes across one interval instead of all at once."""
+    return datetime.utcnow() + effective_interval(case) * random.random()
+
+
+def apply_details(case: WatchedCase, details: Dict):
+    """Update tracked fields from a get_case_details result and schedule the next run."""
+    now = datetime.utcnow()
+    case.last_refreshed_at = now
+    if details.get('success') and details.get('case_details'):
+        cd = details['case_details']
+        case.next_date = cd.get('next_date') or ''
+        case.next_date_iso = parse_case_date(case.next_date)
+        case.stage = cd.get('stage') or ''
+        case.last_status = 'Success'
+        case.last_error = None
+        case.failures = 0
+        case.next_refresh_at = now + jittered(effective_interval(case))
+    else:
+        case.last_status = 'Failed'
+        case.last_error = (details.get('message') or 'Unknown error')[:500]
+        case.failures = (case.failures or 0) + 1
+        backoff = RETRY_MINUTES[min(case.failures, len(RETRY_MINUTES)) - 1]
+        case.next_refresh_at = now + jittered(timedelta(minutes=backoff))
+
+
+class WatchlistScheduler:
+    def __init__(self, refresh_fn: RefreshFn, rate_per_minute: float = RATE_PER_MINUTE, tick_seconds: float = 5.0):
+        self.refresh_fn = refresh_fn
+        self.min_gap = 60.0 / max(rate_per_minute, 0.01)
+        self.tick_seconds = tick_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='watchlist-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        # small random start delay so several workers/instances don't align
+        if self._stop.wait(random.uniform(0, self.tick_seconds)):
+            return
+        while not self._stop.is_set():
+            try:
+                with lanes.background():
+                    did_work = self.run_once()
+            except Exception as e:
+                logger.warning(f"watchlist scheduler error: {e}")
+                did_work = False
+            self._stop.wait(self.min_gap if did_work else self.tick_seconds)
+
+    def run_once(self) -> bool:
+        """Refresh the most urgent due case, if any. Returns True when one ran."""
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            # upcoming hearings first, soonest first; past or unknown next dates are dormant
+            # (see effective_interval) and go after them, longest-waiting first
+            upcoming_date = sql_case((WatchedCase.next_date_iso >= date.today(), WatchedCase.next_date_iso), else_=None)
+            case = (
+                db.query(WatchedCase)
+                .filter(WatchedCase.next_refresh_at <= now)
+                .order_by(nulls_last(upcoming_date.asc()), WatchedCase.next_refresh_at.asc())
+                .first()
+            )
+            if case is None:
+                return False
+            # Claim it: push next_refresh_at out so other workers skip it while we refresh.
+            claimed = db.execute(
+                update(WatchedCase)
+                .where(WatchedCase.id == case.id, WatchedCase.next_refresh_at == case.next_refresh_at)
+                .values(next_refresh_at=now + timedelta(minutes=10))
+            ).rowcount
+            db.commit()
+            if not claimed:
+                return False
+            db.refresh(case)
+            self.refresh_case(db, case)
+            return True
+        finally:
+            db.close()
+
+    def refresh_case(self, db, case: WatchedCase) -> WatchedCase:
+        try:
+            details = self.refresh_fn(case) or {}
+        except Exception as e:
+            details = {'success': False, 'message': f'Exception: {e}'}
+        apply_details(case, details)
+        db.commit()
+        return case
@@ -0,0 +1,93 @@
+// Persistent client cache for the dropdown catalog (states, districts,
+// court complexes, case types). Entries live in localStorage and are tagged
+// with the server's catalog version (/api/catalog-version); when the server
+// reports a new version (e.g. after /api/clear-cache) everything is dropped.
+
+const PREFIX = "ecourts.catalog:";
+const VERSION_KEY = "ecourts.catalog.version";
+const MAX_AGE_MS = 7 * 24 * 60 * 60 * 1000;
+
+type Entry<T> = { v: string; at: number; data: T };
+
+const storage = (): Storage | null => {
+  try {
+    return typeof window !== "undefined" ? window.localStorage : null;
+  } catch {
+    return null;
+  }
+};
+
+export const catalogKeys = {
+  states: () => "states",
+  districts: (state: string) => `districts:${state}`,
+  complexes: (state: string, dist: string) => `complexes:${state}:${dist}`,
+  caseTypes: (state: string, dist: string, complex: string) =>
+    `case_types:${state}:${dist}:${complex}`,
+};
+
+export function knownVersion(): string | null {
+  return storage()?.getItem(VERSION_KEY) ?? null;
+}
+
+export function readCatalog<T>(key: string): T | null {
+  const s = storage();
+  const version = knownVersion();
+  if (!s || !version) return null;
+  try {
+    const raw = s.getItem(PREFIX + key);
+    if (!raw) return null;
+    const entry = JSON.parse(raw) as Entry<T>;
+    if (entry.v !== version || Date.now() - entry.at > MAX_AGE_MS) {
+      s.removeItem(PREFIX + key);
+      return null;
+    }
+    return entry.data;
+  } catch {
+    return null;
+  }
+}
+
+export function writeCatalog<T>(key: string, data: T) {
+  const s = storage();
+  const version = knownVersion();
+  if (!s || !version) return;
+  const entry: Entry<T> = { v: version, at: Date.now(), data };
+  try {
+    s.setItem(PREFIX + key, JSON.stringify(entry));
+  } catch {
+    // quota exceeded: drop the catalog and carry on uncached
+    clearCatalog();
+  }
+}
+
+export function clearCatalog() {
+  const s = storage();
+  if (!s) return;
+  for (let i = s.length - 1; i >= 0; i--) {
+    const k = s.key(i);
+    if (k && k.startsWith(PREFIX)) s.removeItem(k);
+  }
+}
+
+// Fetches the server catalog version and adopts it. Returns true when cached
+// entries were invalidated (version changed). Network errors keep the cache.
+export async function syncCatalogVersion(
+  url: string,
+  signal?: AbortSignal,
+): Promise<boolean> {
+  const s = storage();
+  if (!s) return false;
+  const r = await fetch(url, { signal });
+  if (!r.ok) return false;
+  const d = await r.json();
+  const version = String(d.version ?? "");
+  if (!version) return false;
+  const previous = knownVersion();
+  if (previous === version) return false;
+  clearCatalog();
+  s.setItem(VERSION_KEY, version);
+  return previous !== null;
+}
+
+export const isAbort = (e: unknown) =>
+  e instanceof DOMException && e.name === "AbortError";
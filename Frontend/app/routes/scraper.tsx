@@ -2,6 +2,14 @@ import type { Route } from "./+types/scraper";
 import { useState, useEffect, useRef, useCallback } from "react";
 import { Link } from "react-router";
 import { iconPaths, utils } from "~/ui";
+import {
+  catalogKeys,
+  isAbort,
+  knownVersion,
+  readCatalog,
+  syncCatalogVersion,
+  writeCatalog,
+} from "~/catalog";
 // Inline style tokens (previously from theme.ts)
 const pageCls =
   "min-h-screen flex flex-col bg-gradient-to-b from-[#f8fbff] via-[#f5f8ff] to-[#eef3fa] dark:from-[#050b16] dark:via-[#060c18] dark:to-[#0a1628]";
@@ -46,6 +54,120 @@ interface Option {
   text: string;
 }
 
+// Dropdown cascade levels, parent first.
+const LEVELS = ["states", "districts", "complexes", "caseTypes"] as const;
+type Level = (typeof LEVELS)[number];
+
+// Shapes of the submit-case payloads (Backend/schemas.py CaseStatusData and friends).
+interface Party {
+  name: string;
+  advocate: string;
+}
+
+interface Act {
+  act_name: string;
+  sections: string;
+}
+
+interface CaseProcess {
+  process_id: string;
+  process_title: string;
+  process_date: string;
+}
+
+interface Hearing {
+  judge: string;
+  business_date: string;
+  hearing_date: string;
+  purpose_of_hearing: string;
+}
+
+interface InterimOrder {
+  order_number: string;
+  order_date: string;
+  order_details: string;
+  pdf_url: string;
+  display_pdf_arg: string;
+}
+
+// Either the full details summary or, when viewHistory failed, the bare
+// listing fields (petitioner/respondent strings).
+interface CaseStatusData {
+  case_number?: string | null;
+  case_type?: string | null;
+  filing_number?: string | null;
+  filing_date?: string | null;
+  registration_number?: string | null;
+  registration_date?: string | null;
+  cnr_number?: string | null;
+  court_name?: string | null;
+  judge?: string | null;
+  stage?: string | null;
+  status?: string | null;
+  next_date?: string | null;
+  decision_date?: string | null;
+  nature_of_disposal?: string | null;
+  first_hearing_date?: string | null;
+  petitioners?: Party[] | null;
+  respondents?: Party[] | null;
+  acts?: Act[] | null;
+  processes?: CaseProcess[] | null;
+  case_history?: Hearing[] | null;
+  interim_orders?: InterimOrder[] | null;
+  petitioner?: string | null;
+  respondent?: string | null;
+  raw_html?: string | null;
+}
+
+interface SubmissionResult {
+  success: boolean;
+  message?: string;
+  case_status_data?: CaseStatusData | null;
+  raw_html?: string;
+  captcha_html?: string;
+  app_token?: string;
+  // set while the details/history/orders events are still to come
+  streaming?: boolean;
+}
+
+// Events sent by /api/submit-case/stream.
+type SubmitCaseEvent =
+  | { event: "listing"; data: SubmissionResult }
+  | { event: "details"; data: CaseStatusData }
+  | { event: "history"; data: Pick<CaseStatusData, "case_history"> }
+  | { event: "orders"; data: Pick<CaseStatusData, "interim_orders"> }
+  | { event: "result"; data: SubmissionResult }
+  | { event: "error"; data: { success: false; message?: string } };
+
+// Reads a text/event-stream response body, calling onEvent for each message
+// with its event name and JSON-decoded data.
+async function readEventStream<E extends { event: string; data: unknown }>(
+  body: ReadableStream<Uint8Array>,
+  onEvent: (message: E) => void,
+) {
+  const reader = body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let sep;
+    while ((sep = buffer.indexOf("\n\n")) >= 0) {
+      const block = buffer.slice(0, sep);
+      buffer = buffer.slice(sep + 2);
+      let event = "message";
+      const data: string[] = [];
+      for (const line of block.split("\n")) {
+        if (line.startsWith("event:")) event = line.slice(6).trim();
+        else if (line.startsWith("data:")) data.push(line.slice(5).trimStart());
+      }
+      if (data.length)
+        onEvent({ event, data: JSON.parse(data.join("\n")) } as E);
+    }
+  }
+}
+
 export default function Scraper() {
   const headingRef = useRef<HTMLHeadingElement | null>(null);
 
@@ -111,70 +233,9 @@ export default function Scraper() {
   const [captchaUrl, setCaptchaUrl] = useState("");
   const [isLoading, setIsLoading] = useState(false);
   const [error, setError] = useState("");
-  const [submissionResult, setSubmissionResult] = useState<any>(null);
+  const [submissionResult, setSubmissionResult] = useState<SubmissionResult | null>(null);
   const [isSubmitting, setIsSubmitting] = useState(false);
 
-  // Enhanced parsing for case listing with court complex info
-  function parseListing(html: string) {
-    try {
-      if (!html) return null;
-      const temp = document.createElement("div");
-      temp.innerHTML = html;
-
-      // Extract summary info
-      const summary = {
-        totalEstablishments:
-          temp.querySelector(".h2class")?.textContent?.match(/\d+/)?.[0] || "0",
-        totalCases:
-          temp
-            .querySelector(".h2class:last-of-type")
-            ?.textContent?.match(/\d+/)?.[0] || "0",
-        courtComplex:
-          temp.querySelector(".text-center a")?.textContent?.trim() ||
-          "Unknown Court",
-      };
-
-      const tbl = temp.querySelector("table#dispTable");
-      if (!tbl) return { summary, cases: [] };
-
-      const rows = Array.from(tbl.querySelectorAll("tbody tr"));
-      const cases: Array<{
-        sr: string;
-        caseId: string;
-        parties: string;
-        courtName?: string;
-      }> = [];
-
-      let currentCourt = "";
-
-      for (const r of rows) {
-        const cells = r.querySelectorAll("td");
-        // Court name row (colspan=3)
-        if (cells.length === 2 && cells[0].getAttribute("colspan") === "3") {
-          currentCourt = cells[0].textContent?.trim() || "";
-          continue;
-        }
-        // Case data row
-        if (cells.length === 4) {
-          const sr = cells[0].textContent?.trim() || "";
-          const caseId = cells[1].textContent?.trim() || "";
-          const parties =
-            cells[2].textContent
-              ?.replace(/\s*Vs?\s*/gi, " vs ")
-              ?.replace(/\s+/g, " ")
-              ?.trim() || "";
-          if (sr && caseId) {
-            cases.push({ sr, caseId, parties, courtName: currentCourt });
-          }
-        }
-      }
-      return { summary, cases };
-    } catch (error) {
-      console.error("Error parsing listing:", error);
-      return null;
-    }
-  }
-
   const steps = [
     { id: 1, title: "Select State & District", completed: currentStep > 1 },
     { id: 2, title: "Enter Case Details", completed: currentStep > 2 },
@@ -185,9 +246,26 @@ export default function Scraper() {
 
   const api = (p: string) => `http://localhost:8001${p}`;
 
+  // Bumped once the server catalog version is known (and again if it changes);
+  // the cascade effects depend on it so a catalog change reloads visible levels.
+  const [catalogGen, setCatalogGen] = useState(0);
   useEffect(() => {
-    loadStates();
+    const c = new AbortController();
+    const hadVersion = knownVersion() !== null;
+    if (hadVersion) setCatalogGen(1); // render from the local cache right away
+    syncCatalogVersion(api("/api/catalog-version"), c.signal)
+      .catch(() => false)
+      .then((changed) => {
+        if (changed || !hadVersion) setCatalogGen((g) => g + 1);
+      });
+    return () => {
+      c.abort();
+      abortFrom("states");
+    };
   }, []);
+  useEffect(() => {
+    if (catalogGen) loadStates();
+  }, [catalogGen]);
   // Focus heading when step changes for accessibility & visibility context
   // Only focus the heading when changing steps except when staying on step 2 while editing inputs
   useEffect(() => {
@@ -199,18 +277,20 @@ export default function Scraper() {
   useEffect(() => {
     if (formData.stateCode) loadDistricts();
     else {
+      abortFrom("districts");
       setDistricts([]);
       setCourtComplexes([]);
       setCaseTypes([]);
     }
-  }, [formData.stateCode]);
+  }, [formData.stateCode, catalogGen]);
   useEffect(() => {
     if (formData.stateCode && formData.districtCode) loadCourtComplexes();
     else {
+      abortFrom("complexes");
       setCourtComplexes([]);
       setCaseTypes([]);
     }
-  }, [formData.stateCode, formData.districtCode]);
+  }, [formData.stateCode, formData.districtCode, catalogGen]);
   useEffect(() => {
     if (
       formData.stateCode &&
@@ -218,73 +298,167 @@ export default function Scraper() {
       formData.courtComplexCode
     )
       loadCaseTypes();
-    else setCaseTypes([]);
-  }, [formData.stateCode, formData.districtCode, formData.courtComplexCode]);
+    else {
+      abortFrom("caseTypes");
+      setCaseTypes([]);
+    }
+  }, [
+    formData.stateCode,
+    formData.districtCode,
+    formData.courtComplexCode,
+    catalogGen,
+  ]);
+
+  // One AbortController per cascade level. Starting a request aborts the
+  // superseded one at that level and everything below it, so a slow response
+  // for an old selection can never overwrite a newer one.
+  const inflight = useRef<Partial<Record<Level, AbortController>>>({});
+  function abortFrom(level: Level) {
+    let aborted = false;
+    for (const l of LEVELS.slice(LEVELS.indexOf(level))) {
+      const c = inflight.current[l];
+      if (c && !c.signal.aborted) {
+        c.abort();
+        aborted = true;
+      }
+      delete inflight.current[l];
+    }
+    if (aborted) setIsLoading(false);
+  }
+  function startRequest(level: Level) {
+    abortFrom(level);
+    const c = new AbortController();
+    inflight.current[level] = c;
+    return c.signal;
+  }
 
-  async function withSpinner<T>(fn: () => Promise<T>, msg: string) {
+  async function withSpinner<T>(
+    fn: () => Promise<T>,
+    msg: string,
+    signal?: AbortSignal,
+  ) {
     setIsLoading(true);
     setError("");
     try {
       return await fn();
-    } catch {
-      setError(msg);
+    } catch (e) {
+      if (!isAbort(e)) setError(msg);
     } finally {
-      setIsLoading(false);
+      // a superseded request leaves the spinner to the one that replaced it
+      if (!signal?.aborted) setIsLoading(false);
+    }
+  }
+  // Serve a level from the local catalog cache, else fetch it (cancellable)
+  // and cache non-empty results under the current catalog version.
+  async function loadOptions(
+    level: Level,
+    key: string,
+    request: (signal: AbortSignal) => Promise<Option[]>,
+    set: (o: Option[]) => void,
+    msg: string,
+  ) {
+    const signal = startRequest(level);
+    const cached = readCatalog<Option[]>(key);
+    if (cached) {
+      set(cached);
+      return;
     }
+    await withSpinner(
+      async () => {
+        const data = await request(signal);
+        if (signal.aborted) return;
+        set(data);
+        if (data.length) writeCatalog(key, data);
+      },
+      msg,
+      signal,
+    );
   }
+  const postJson = (path: string, body: object, signal: AbortSignal) =>
+    fetch(api(path), {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify(body),
+      signal,
+    }).then((r) => r.json());
+
   async function loadStates() {
-    await withSpinner(async () => {
-      const r = await fetch(api("/api/get-states"));
-      const d = await r.json();
-      setStates(d.states || []);
-      if ((d.states || []).length === 0) {
-        console.warn("No states returned from API /api/get-states");
-      }
-    }, "Failed to load states");
+    await loadOptions(
+      "states",
+      catalogKeys.states(),
+      async (signal) => {
+        const d = await fetch(api("/api/get-states"), { signal }).then((r) =>
+          r.json(),
+        );
+        if ((d.states || []).length === 0) {
+          console.warn("No states returned from API /api/get-states");
+        }
+        return d.states || [];
+      },
+      setStates,
+      "Failed to load states",
+    );
   }
   async function loadDistricts() {
-    await withSpinner(async () => {
-      const r = await fetch(api("/api/get-districts"), {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ state_code: formData.stateCode }),
-      });
-      const d = await r.json();
-      setDistricts(d.districts || []);
-    }, "Failed to load districts");
+    await loadOptions(
+      "districts",
+      catalogKeys.districts(formData.stateCode),
+      async (signal) => {
+        const d = await postJson(
+          "/api/get-districts",
+          { state_code: formData.stateCode },
+          signal,
+        );
+        return d.districts || [];
+      },
+      setDistricts,
+      "Failed to load districts",
+    );
   }
   async function loadCourtComplexes() {
-    await withSpinner(async () => {
-      const r = await fetch(api("/api/get-court-complexes"), {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({
-          state_code: formData.stateCode,
-          dist_code: formData.districtCode,
-        }),
-      });
-      const d = await r.json();
-      setCourtComplexes(d.complexes || []);
-    }, "Failed to load court complexes");
+    await loadOptions(
+      "complexes",
+      catalogKeys.complexes(formData.stateCode, formData.districtCode),
+      async (signal) => {
+        const d = await postJson(
+          "/api/get-court-complexes",
+          { state_code: formData.stateCode, dist_code: formData.districtCode },
+          signal,
+        );
+        return d.complexes || [];
+      },
+      setCourtComplexes,
+      "Failed to load court complexes",
+    );
   }
   async function loadCaseTypes() {
-    await withSpinner(async () => {
-      const r = await fetch(api("/api/get-case-types"), {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({
-          state_code: formData.stateCode,
-          dist_code: formData.districtCode,
-          court_complex_code: formData.courtComplexCode,
-        }),
-      });
-      const d = await r.json();
-      setCaseTypes(d.case_types || []);
-    }, "Failed to load case types");
+    await loadOptions(
+      "caseTypes",
+      catalogKeys.caseTypes(
+        formData.stateCode,
+        formData.districtCode,
+        formData.courtComplexCode,
+      ),
+      async (signal) => {
+        const d = await postJson(
+          "/api/get-case-types",
+          {
+            state_code: formData.stateCode,
+            dist_code: formData.districtCode,
+            court_complex_code: formData.courtComplexCode,
+          },
+          signal,
+        );
+        return d.case_types || [];
+      },
+      setCaseTypes,
+      "Failed to load case types",
+    );
   }
   async function loadCaptcha() {
     try {
-      const r = await fetch(api("/api/captcha-url"));
+      // credentials: the backend ties this CAPTCHA to our upstream session via a cookie
+      const r = await fetch(api("/api/captcha-url"), { credentials: "include" });
       const d = await r.json();
 
       if (d.captcha_url) {
@@ -307,9 +481,12 @@ export default function Scraper() {
     setIsSubmitting(true);
     setError("");
     try {
-      // Step 1: Submit case to get case listing (including case_no and cino)
-      const r = await fetch(api("/api/submit-case"), {
+      // Streamed submit-case: the listing (case found, parties, court) arrives
+      // first and is shown right away; details, history and orders are merged in
+      // as the backend parses them, and `result` carries the final response.
+      const r = await fetch(api("/api/submit-case/stream"), {
         method: "POST",
+        credentials: "include",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({
           state_code: formData.stateCode,
@@ -321,76 +498,71 @@ export default function Scraper() {
           captcha_code: formData.captchaCode,
         }),
       });
-      const result = await r.json();
-
-      if (r.ok && result.success) {
-        // Parse the case listing to extract case_no and cino
-        const listing = parseListing(result.case_status_data?.raw_html || "");
-
-        if (listing && listing.cases && listing.cases.length > 0) {
-          // Extract information from the first case (or find matching case)
-          const caseInfo = listing.cases[0];
-
-          // Extract case_no and cino from the viewHistory onclick
-          const listingHtml = result.case_status_data?.raw_html || "";
-          const viewHistoryMatch = listingHtml.match(
-            /viewHistory\('([^']+)','([^']+)',([^,]+),/
-          );
-
-          if (viewHistoryMatch) {
-            const case_no = viewHistoryMatch[1]; // 200100001332025
-            const cino = viewHistoryMatch[2]; // HPCH010018042025
-            const court_code = viewHistoryMatch[3]; // 1
-
-            // Step 2: Get detailed case information using viewHistory
-            const detailsResponse = await fetch(api("/api/get-case-details"), {
-              method: "POST",
-              headers: { "Content-Type": "application/json" },
-              body: JSON.stringify({
-                court_code: court_code,
-                state_code: formData.stateCode,
-                dist_code: formData.districtCode,
-                court_complex_code: formData.courtComplexCode,
-                case_no: case_no,
-                cino: cino,
-                search_flag: "CScaseNumber",
-                search_by: "CScaseNumber",
-              }),
+      if (!r.ok || !r.body) {
+        const d = await r.json().catch(() => ({}));
+        setError(d.message || d.detail || "Submission failed");
+      } else {
+        let finished = false;
+        await readEventStream<SubmitCaseEvent>(r.body, (message) => {
+          if (message.event === "listing") {
+            const { data } = message;
+            const listing = data.case_status_data || {};
+            setSubmissionResult({
+              ...data,
+              streaming: true,
+              case_status_data: {
+                ...listing,
+                petitioners: listing.petitioner
+                  ? [{ name: listing.petitioner, advocate: "" }]
+                  : [],
+                respondents: listing.respondent
+                  ? [{ name: listing.respondent, advocate: "" }]
+                  : [],
+              },
             });
-
-            const detailsResult = await detailsResponse.json();
-
-            if (detailsResponse.ok && detailsResult.success) {
-              // Combine the results
-              setSubmissionResult({
-                ...result,
-                case_details: detailsResult.case_details,
-                case_details_raw: detailsResult.raw_html,
-              });
+            setCurrentStep(5);
+          } else if (
+            message.event === "details" ||
+            message.event === "history" ||
+            message.event === "orders"
+          ) {
+            const { data } = message;
+            setSubmissionResult((prev) =>
+              prev
+                ? {
+                    ...prev,
+                    case_status_data: { ...prev.case_status_data, ...data },
+                  }
+                : prev
+            );
+          } else if (message.event === "result") {
+            const { data } = message;
+            finished = true;
+            if (data.success) {
+              setSubmissionResult(data);
               setCurrentStep(5);
             } else {
-              // Fallback to showing just the listing if details fail
-              setSubmissionResult(result);
-              setCurrentStep(5);
-              console.warn(
-                "Failed to get detailed case info, showing listing only:",
-                detailsResult.message
+              // a failed lookup after the listing: stop the "loading" spinner
+              setSubmissionResult((prev) =>
+                prev ? { ...prev, streaming: false } : prev
               );
+              setError(data.message || "Submission failed");
             }
-          } else {
-            // Fallback to showing just the listing if we can't parse viewHistory
-            setSubmissionResult(result);
-            setCurrentStep(5);
-            console.warn(
-              "Could not extract case_no/cino from listing, showing listing only"
+          } else if (message.event === "error") {
+            finished = true;
+            setSubmissionResult((prev) =>
+              prev ? { ...prev, streaming: false } : prev
             );
+            setError(message.data.message || "Submission failed");
           }
-        } else {
-          setSubmissionResult(result);
-          setCurrentStep(5);
+        });
+        if (!finished) {
+          // the listing stays on screen; only the later sections are missing
+          setSubmissionResult((prev) =>
+            prev ? { ...prev, streaming: false } : prev
+          );
+          setError("Connection lost before the search finished");
         }
-      } else {
-        setError(result.message || "Submission failed");
       }
     } catch (error) {
       console.error("Error submitting case:", error);
@@ -901,6 +1073,22 @@ export default function Scraper() {
                   </div>
                 </div>
 
+                {submissionResult.streaming && (
+                  <div
+                    className={`${cardCls} p-3 bg-blue-50 border border-blue-200`}
+                  >
+                    <p
+                      className={`${captionCls} text-blue-700 text-center flex items-center justify-center gap-2`}
+                    >
+                      <IconComponent
+                        iconKey="spinner"
+                        className="w-4 h-4 animate-spin"
+                      />
+                      Loading case details, hearing history and orders...
+                    </p>
+                  </div>
+                )}
+
                 {submissionResult.case_status_data ? (
                   // Display detailed case information from viewHistory
                   <div className="space-y-6">
@@ -1134,7 +1322,7 @@ export default function Scraper() {
 
                           <div className="space-y-3">
                             {submissionResult.case_status_data.petitioners.map(
-                              (petitioner: any, index: number) => (
+                              (petitioner: Party, index: number) => (
                                 <div
                                   key={index}
                                   className="p-4 bg-green-50 dark:bg-green-900/20 rounded-lg"
@@ -1187,7 +1375,7 @@ export default function Scraper() {
 
                           <div className="space-y-3">
                             {submissionResult.case_status_data.respondents.map(
-                              (respondent: any, index: number) => (
+                              (respondent: Party, index: number) => (
                                 <div
                                   key={index}
                                   className="p-4 bg-red-50 dark:bg-red-900/20 rounded-lg"
@@ -1251,7 +1439,7 @@ export default function Scraper() {
                               </thead>
                               <tbody>
                                 {submissionResult.case_status_data.acts.map(
-                                  (act: any, index: number) => (
+                                  (act: Act, index: number) => (
                                     <tr
                                       key={index}
                                       className="border-b border-gray-100"
@@ -1309,7 +1497,7 @@ export default function Scraper() {
                               </thead>
                               <tbody>
                                 {submissionResult.case_status_data.processes.map(
-                                  (process: any, index: number) => (
+                                  (process: CaseProcess, index: number) => (
                                     <tr
                                       key={index}
                                       className="border-b border-gray-100"
@@ -1373,7 +1561,7 @@ export default function Scraper() {
                               </thead>
                               <tbody>
                                 {submissionResult.case_status_data.case_history.map(
-                                  (item: any, index: number) => (
+                                  (item: Hearing, index: number) => (
                                     <tr
                                       key={index}
                                       className="border-b border-gray-100"
@@ -1439,7 +1627,7 @@ export default function Scraper() {
                               </thead>
                               <tbody>
                                 {submissionResult.case_status_data.interim_orders.map(
-                                  (order: any, index: number) => (
+                                  (order: InterimOrder, index: number) => (
                                     <tr
                                       key={index}
                                       className="border-b border-gray-100"
@@ -1464,6 +1652,7 @@ export default function Scraper() {
                                                     api("/api/get-order-pdf"),
                                                     {
                                                       method: "POST",
+                                                      credentials: "include",
                                                       headers: {
                                                         "Content-Type":
                                                           "application/json",
@@ -1472,6 +1661,10 @@ export default function Scraper() {
                                                         pdf_request:
                                                           order.display_pdf_arg ||
                                                           order.pdf_url,
+                                                        state_code:
+                                                          formData.stateCode,
+                                                        dist_code:
+                                                          formData.districtCode,
                                                       }),
                                                     }
                                                   );
@@ -1526,7 +1719,8 @@ export default function Scraper() {
                   // Fallback: Display basic listing if detailed info is not available
                   submissionResult.case_status_data &&
                   (() => {
-                    const data = submissionResult.case_status_data;
+                    const data: CaseStatusData =
+                      submissionResult.case_status_data ?? {};
                     const meaningful = Object.entries(data).filter(
                       ([k, v]) => k !== "raw_html" && String(v).trim() !== ""
                     );
@@ -1770,7 +1964,7 @@ export default function Scraper() {
                           <div className="space-y-3">
                             {data.petitioners && data.petitioners.length > 0 ? (
                               data.petitioners.map(
-                                (petitioner: any, index: number) => (
+                                (petitioner: Party, index: number) => (
                                   <div
                                     key={index}
                                     className="flex items-center gap-3 p-3 bg-green-50 rounded-lg"
@@ -1815,7 +2009,7 @@ export default function Scraper() {
                           <div className="space-y-3">
                             {data.respondents && data.respondents.length > 0 ? (
                               data.respondents.map(
-                                (respondent: any, index: number) => (
+                                (respondent: Party, index: number) => (
                                   <div
                                     key={index}
                                     className="flex items-center gap-3 p-3 bg-red-50 rounded-lg"